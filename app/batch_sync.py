@@ -0,0 +1,309 @@
+from loguru import logger
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    BATCH_MAX_WORKERS,
+    OUTPUT_DIR,
+    PARSE_CACHE,
+    PARSE_CACHE_DIRNAME,
+    SYNC_ENGINE,
+    SYNC_PREFIXED_IDS_ONLY,
+    TGT_WRITE_MODE,
+)
+from app.data_io.parse_cache import ParseCache
+from app.data_io.table import headers_of
+from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_values
+from app.data_sync.mapping_plan import compile_mapping
+from app.data_sync.orphan_detection import sot_id_set
+from app.data_sync.row_filter import RowFilter, compile_row_filter
+from app.data_sync.sync_engine import sync_sot_to_tgt, sync_sot_to_tgt_vectorized
+from app.validation.dataset_validation import DatasetValidator
+from app.sync_metrics import COUNTERS, SyncMetrics
+from app.xlsx_sync import (
+    read_sheet,
+    record_change_counts,
+    write_output,
+    write_reports,
+)
+
+
+@dataclass
+class TgtJob:
+    """One target of a batch sync."""
+
+    tgt_path: str
+    tgt_sheet_name: str
+    unique_id_tgt: str
+    column_mapping: Dict[str, str]
+
+
+@dataclass
+class TargetResult:
+    """Outcome of one target: its output workbook and report, or the error."""
+
+    job: TgtJob
+    output_dir: str
+    output_file: Optional[str] = None
+    report_file: Optional[str] = None
+    metrics: Optional[SyncMetrics] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of run_sync_batch: per-target results plus the aggregate summary."""
+
+    targets: List[TargetResult]
+    metrics: SyncMetrics  # SOT read and the whole batch
+    summary: dict = field(default_factory=dict)
+    summary_file: Optional[str] = None
+
+
+def run_sync_batch(
+    sot_path: str,
+    sot_sheet_name: str,
+    unique_id_sot: str,
+    jobs: List[TgtJob],
+    output_dir: str = OUTPUT_DIR,
+    write_mode: str = TGT_WRITE_MODE,
+    engine: str = SYNC_ENGINE,
+    parse_cache: bool = PARSE_CACHE,
+    max_workers: Optional[int] = BATCH_MAX_WORKERS,
+    prefixed_ids_only: bool = SYNC_PREFIXED_IDS_ONLY,
+) -> BatchResult:
+    """
+    Sync one SOT into many targets.
+
+    The SOT is parsed and validated once (against the mapped columns of every
+    job) and its ID index is built once; each worker process receives both a
+    single time, then reads, syncs and writes its targets concurrently. Every
+    target gets its own subdirectory of output_dir with its output workbook
+    and diff/orphan report. A failing target is reported in the summary and
+    does not stop the others.
+
+    max_workers=1 runs the targets one after the other in this process.
+    prefixed_ids_only works as in run_sync().
+    Returns a BatchResult; the aggregate summary is also written to
+    output_dir/batch_summary_<timestamp>.json.
+    """
+    if write_mode not in ("openpyxl", "patch"):
+        raise ValueError(f"Unknown TGT write mode: {write_mode}")
+    if engine not in ("python", "vectorized"):
+        raise ValueError(f"Unknown sync engine: {engine}")
+    if not jobs:
+        raise ValueError("No target jobs given")
+
+    logger.info(f"=== XLSX Delta Sync Batch Starting ({len(jobs)} targets) ===")
+    row_filter = compile_row_filter()
+    metrics = SyncMetrics()
+    with metrics.capture():
+        # the parse cache is shared with run_sync and by all the targets
+        cache_dir = Path(output_dir) / PARSE_CACHE_DIRNAME if parse_cache else None
+        cache = ParseCache(cache_dir) if cache_dir else None
+        sot_columns = list(dict.fromkeys(c for job in jobs for c in job.column_mapping))
+        with metrics.stage("read_sot"):
+            # only the ID and the columns some job maps are parsed
+            sot_headers, sot_rows = read_sheet(
+                cache,
+                read_sot_xlsx,
+                sot_path,
+                sot_sheet_name,
+                validator=DatasetValidator("SOT", unique_id_sot, sot_columns),
+                columns=[unique_id_sot, *sot_columns],
+                where=(
+                    row_filter.id_filter(unique_id_sot) if prefixed_ids_only else None
+                ),
+            )
+            sot_ids = sot_id_set(sot_rows, unique_id_sot)
+        logger.info(
+            f"SOT loaded with {len(sot_rows)} records and {len(sot_headers)} columns"
+        )
+
+        with metrics.stage("targets"):
+            args = [
+                (job, job_dir, unique_id_sot, write_mode, engine, cache_dir, row_filter)
+                for job, job_dir in zip(jobs, _job_dirs(jobs, output_dir))
+            ]
+            if max_workers == 1:
+                _init_worker(sot_headers, sot_rows, sot_ids)
+                targets = [_sync_target(*a) for a in args]
+            else:
+                # the SOT is pickled once per worker, not once per target
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_worker,
+                    initargs=(sot_headers, sot_rows, sot_ids),
+                ) as pool:
+                    targets = list(pool.map(_sync_target, *zip(*args)))
+
+    result = BatchResult(targets=targets, metrics=metrics)
+    result.summary = _summary(sot_path, sot_sheet_name, len(sot_rows), result)
+    result.summary_file = _write_summary(result.summary, output_dir)
+    _log_summary(result)
+    logger.info("=== Sync Batch Complete ===")
+    return result
+
+
+def _job_dirs(jobs: List[TgtJob], output_dir: str) -> List[str]:
+    """One output subdirectory per job, named after the TGT file."""
+    dirs, seen = [], {}
+    for job in jobs:
+        name = Path(job.tgt_path).stem
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}_{seen[name]}"
+        dirs.append(str(Path(output_dir) / name))
+    return dirs
+
+
+# Per-process SOT, set once by the pool initializer
+_sot_headers: List[str] = []
+_sot_rows = None
+_sot_ids: Optional[set] = None
+
+
+def _init_worker(sot_headers: List[str], sot_rows, sot_ids: set) -> None:
+    global _sot_headers, _sot_rows, _sot_ids
+    _sot_headers, _sot_rows, _sot_ids = sot_headers, sot_rows, sot_ids
+
+
+def _sync_target(
+    job: TgtJob,
+    output_dir: str,
+    unique_id_sot: str,
+    write_mode: str,
+    engine: str,
+    cache_dir: Optional[Path],
+    row_filter: RowFilter,
+) -> TargetResult:
+    """Read, sync and write one target against the worker's SOT."""
+    result = TargetResult(job=job, output_dir=output_dir, metrics=SyncMetrics())
+    metrics = result.metrics
+    logger.info(f"--- Target {job.tgt_path} [{job.tgt_sheet_name}] ---")
+    try:
+        with metrics.capture():
+            cache = ParseCache(cache_dir) if cache_dir else None
+            with metrics.stage("read_tgt"):
+                tgt_headers, tgt_rows = read_sheet(
+                    cache,
+                    read_tgt_values,
+                    job.tgt_path,
+                    job.tgt_sheet_name,
+                    validator=DatasetValidator(
+                        "TGT", job.unique_id_tgt, list(job.column_mapping.values())
+                    ),
+                )
+
+            with metrics.stage("sync"):
+                sync = (
+                    sync_sot_to_tgt_vectorized
+                    if engine == "vectorized"
+                    else sync_sot_to_tgt
+                )
+                change_set = sync(
+                    _sot_rows,
+                    tgt_rows,
+                    unique_id_sot,
+                    job.unique_id_tgt,
+                    job.column_mapping,
+                    tgt_headers=tgt_headers,
+                    plan=compile_mapping(
+                        job.column_mapping,
+                        unique_id_sot,
+                        job.unique_id_tgt,
+                        _sot_headers,
+                        tgt_headers,
+                        sot_row_columns=headers_of(_sot_rows),
+                    ),
+                )
+            record_change_counts(metrics, change_set)
+
+            result.output_file = write_output(
+                change_set,
+                job.tgt_path,
+                job.tgt_sheet_name,
+                output_dir,
+                write_mode,
+                metrics,
+            )
+            result.report_file = write_reports(
+                change_set,
+                _sot_rows,
+                tgt_rows,
+                unique_id_sot,
+                job.unique_id_tgt,
+                job.column_mapping,
+                output_dir,
+                metrics,
+                log_path=str(
+                    Path(output_dir) / f"sync_diff_{datetime.now():%Y%m%d_%H%M}.log"
+                ),
+                sot_ids=_sot_ids,
+                row_filter=row_filter,
+            )
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        logger.error(f"Target {job.tgt_path} failed: {result.error}")
+    return result
+
+
+def _summary(sot_path: str, sot_sheet_name: str, sot_records: int, result) -> dict:
+    totals = dict.fromkeys(COUNTERS, 0)
+    targets = []
+    for target in result.targets:
+        if target.error is None:
+            for name, value in target.metrics.counters.items():
+                totals[name] += value
+        targets.append(
+            {
+                "tgt_path": target.job.tgt_path,
+                "tgt_sheet_name": target.job.tgt_sheet_name,
+                "output_file": target.output_file,
+                "report_file": target.report_file,
+                "error": target.error,
+                "metrics": target.metrics.to_dict() if target.metrics else None,
+            }
+        )
+    failed = sum(1 for t in result.targets if t.error is not None)
+    return {
+        "sot_path": sot_path,
+        "sot_sheet_name": sot_sheet_name,
+        "sot_records": sot_records,
+        "succeeded": len(result.targets) - failed,
+        "failed": failed,
+        "totals": totals,
+        "metrics": result.metrics.to_dict(),
+        "targets": targets,
+    }
+
+
+def _write_summary(summary: dict, output_dir: str) -> str:
+    path = Path(output_dir) / f"batch_summary_{datetime.now():%Y%m%d_%H%M%S}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    logger.info(f"Batch summary written to: {path}")
+    return str(path)
+
+
+def _log_summary(result: BatchResult) -> None:
+    result.metrics.log_summary()
+    for target in result.targets:
+        if target.error:
+            logger.warning(f"{target.job.tgt_path}: FAILED — {target.error}")
+        else:
+            counters = target.metrics.counters
+            logger.info(
+                f"{target.job.tgt_path}: {counters['cells_changed']} cells updated, "
+                f"{counters['rows_appended']} rows appended, "
+                f"{counters['orphans_found']} orphans "
+                f"({target.metrics.total_wall_s:.3f}s) -> {target.output_file}"
+            )
+    summary = result.summary
+    logger.info(
+        f"Batch: {summary['succeeded']} targets synced, {summary['failed']} failed"
+    )
@@ -0,0 +1,27 @@
+from hashlib import blake2b
+from typing import Iterable, List, Optional, Sequence
+
+FINGERPRINT_SIZE = 16  # bytes; a collision would hide a real change, so keep it wide
+
+
+def row_fingerprint(values: Iterable) -> bytes:
+    """
+    Hash of a record's normalised values (str, None → "", stripped), in order.
+    Two records with the same fingerprint compare equal column by column.
+    """
+    if not isinstance(values, (list, tuple)):
+        values = list(values)  # the fallback below iterates values a second time
+    try:
+        normalised = "\x00".join(map(str.strip, values))  # fast path: all str
+    except TypeError:
+        normalised = "\x00".join(str(v or "").strip() for v in values)
+    return blake2b(normalised.encode("utf-8"), digest_size=FINGERPRINT_SIZE).digest()
+
+
+def fingerprints_of(rows, columns: Sequence[str]) -> Optional[List[bytes]]:
+    """
+    Return the fingerprints computed at read time for these columns, or None
+    if the rows do not carry them (plain row dicts, or other columns).
+    """
+    fingerprints_for = getattr(rows, "fingerprints_for", None)
+    return fingerprints_for(columns) if fingerprints_for else None
@@ -0,0 +1,55 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.data_io.parse_cache import ParseCache
+
+# (reader, file_path, sheet_name, reader keyword arguments)
+SheetRead = Tuple[Callable, str, str, Dict[str, object]]
+
+
+def read_sheets_parallel(
+    reads: List[SheetRead], cache: Optional[ParseCache] = None
+) -> List[tuple]:
+    """
+    Run independent sheet reads (e.g. SOT and TGT) at the same time, one
+    worker process each, and return their results in order.
+
+    Readers return (headers, Table): plain string columns that pickle compactly,
+    so only parsed values cross the process boundary, never openpyxl objects.
+    Reads go through the parse cache if one is given; its hit/miss counters
+    are carried back. A reader's exception (e.g. a validation failure) is
+    raised here. With a single CPU available the reads run one after the other
+    in this process (workers would only add start-up and transfer costs).
+    """
+    workers = min(len(reads), available_cpus())
+    if workers < 2:
+        return [_read(cache, *read)[0] for read in reads]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_read, cache, *read) for read in reads]
+        outcomes = [future.result() for future in futures]
+
+    results = []
+    for result, hits, misses in outcomes:
+        if cache is not None:
+            cache.hits += hits
+            cache.misses += misses
+        results.append(result)
+    return results
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _read(cache, reader, file_path: str, sheet_name: str, kwargs) -> tuple:
+    """Worker side: one read, plus the cache hits/misses it caused."""
+    if cache is None:
+        return reader(file_path, sheet_name, **kwargs), 0, 0
+    hits, misses = cache.hits, cache.misses
+    result = cache.read(reader, file_path, sheet_name, **kwargs)
+    return result, cache.hits - hits, cache.misses - misses
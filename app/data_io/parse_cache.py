@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from loguru import logger
+
+from config import PARSE_CACHE_MAX_BYTES
+
+CACHE_VERSION = 1
+_HASH_CHUNK_SIZE = 1 << 20
+
+# (resolved path, size, mtime_ns) -> sha256, so one run hashes each input once
+_sha256_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_sha256(path: str) -> str:
+    """Content hash of a file (memoised per process on path, size and mtime)."""
+    stat = os.stat(path)
+    memo_key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    sha256 = _sha256_memo.get(memo_key)
+    if sha256 is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        sha256 = _sha256_memo[memo_key] = digest.hexdigest()
+    return sha256
+
+
+def _key_value(value) -> str:
+    """
+    Stable description of a reader argument for the cache key: its cache_key
+    if it has one, else its repr (tuples and lists element by element).
+    Callables must have a cache_key: their repr holds a memory address, or
+    state (e.g. a set) whose order changes with each process's hash seed.
+    """
+    cache_key = getattr(value, "cache_key", None)
+    if cache_key is not None:
+        return repr(cache_key)
+    if isinstance(value, (tuple, list)):
+        return repr([_key_value(v) for v in value])
+    if callable(value):
+        raise TypeError(f"Parse cache: reader argument has no cache_key: {value!r}")
+    return repr(value)
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed sheets: one pickle per (file content, sheet,
+    reader, reader arguments). A hit never opens the workbook.
+
+    Entries are evicted least recently used first (by file mtime, refreshed on
+    every hit) once the cache directory exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def read(
+        self,
+        reader: Callable,
+        file_path: str,
+        sheet_name: str,
+        validator=None,
+        **kwargs,
+    ):
+        """
+        Return reader(file_path, sheet_name, **kwargs), from the cache if possible.
+        validator is not part of the key: a miss validates while reading, a hit
+        validates the cached rows.
+        """
+        entry = (
+            self.cache_dir
+            / f"{self._key(reader, file_path, sheet_name, kwargs)}.pickle"
+        )
+        try:
+            with open(entry, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Parse cache entry unreadable, re-parsing: {e}")
+        else:
+            try:
+                os.utime(entry)  # mark as recently used
+            except FileNotFoundError:
+                pass  # evicted meanwhile by another process
+            self.hits += 1
+            logger.debug(f"Parse cache hit: {file_path} [{sheet_name}]")
+            if validator is not None:
+                validator.validate(result[1])
+            return result
+
+        self.misses += 1
+        logger.debug(f"Parse cache miss: {file_path} [{sheet_name}]")
+        if validator is not None:
+            kwargs = {**kwargs, "validator": validator}
+        result = reader(file_path, sheet_name, **kwargs)
+        self._store(entry, result)
+        return result
+
+    def log_stats(self) -> None:
+        logger.info(f"Parse cache: {self.hits} hits, {self.misses} misses")
+
+    def _key(self, reader: Callable, file_path: str, sheet_name: str, kwargs) -> str:
+        spec = [
+            CACHE_VERSION,
+            file_sha256(file_path),
+            sheet_name,
+            reader.__name__,
+            sorted((k, _key_value(v)) for k, v in kwargs.items()),
+        ]
+        return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()
+
+    def _store(self, entry: Path, result) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # per-process temp name: concurrent syncs may store the same entry
+        tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.pickle"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted meanwhile by another process
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Parse cache evicted: {path.name}")
@@ -0,0 +1,159 @@
+"""
+Shared strings tables of XLSX packages.
+
+read_shared_strings() loads the table as a list, like openpyxl.
+SpilledStrings is the alternative for tables too large to hold as Python
+objects: the strings are decoded once into a temporary file that is memory
+mapped, with an offset index, and a string is only decoded again when it is
+looked up. Readers pass SharedStringRef placeholders for cells that use the
+table, so a value that is never compared or written is never built.
+"""
+
+import mmap
+import os
+import tempfile
+import weakref
+from array import array
+from itertools import islice
+from typing import Iterator, List, Optional
+
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import iterparse
+
+_SI = f"{{{SHEET_MAIN_NS}}}si"
+_TEXT = f"{{{SHEET_MAIN_NS}}}t"
+_RUN = f"{{{SHEET_MAIN_NS}}}r"
+
+
+def read_shared_strings(src, count: Optional[int] = None) -> List[str]:
+    """
+    The shared strings table, as openpyxl reads it (formatting stripped).
+    With count, parsing stops after the first count strings.
+    """
+    return list(islice(_iter_strings(src), count))
+
+
+def text_content(node) -> str:
+    """Plain text of a string item (<si> or <is>): its <t> plus rich text runs."""
+    plain = None
+    runs = []
+    for child in node:
+        if child.tag == _TEXT:
+            plain = child.text
+        elif child.tag == _RUN:
+            text = None
+            for part in child:
+                if part.tag == _TEXT:
+                    text = part.text
+            if text is not None:
+                runs.append(text)
+    return (plain or "") + "".join(runs)
+
+
+def _iter_strings(src) -> Iterator[str]:
+    for _, node in iterparse(src):
+        if node.tag == _SI:
+            yield text_content(node).replace("x005F_", "")
+            node.clear()
+
+
+class SharedStringRef:
+    """
+    A cell's shared string, by index, not yet decoded. blank tells whether the
+    string is empty after stripping, so blank rows can be found without it.
+    """
+
+    __slots__ = ("index", "blank")
+
+    def __init__(self, index: int, blank: bool):
+        self.index = index
+        self.blank = blank
+
+    def __repr__(self) -> str:
+        return f"SharedStringRef({self.index})"
+
+
+class SpilledStrings:
+    """
+    Read-only sequence of shared strings backed by a memory-mapped temporary
+    file. strings[i] decodes string i (stripped if strip is set); ref(i) returns
+    a SharedStringRef for it without decoding.
+
+    The file is deleted when the object that created it is garbage collected.
+    Pickling sends only the file path and index, so worker processes can read
+    the table while its owner is alive (e.g. during a chunked parse).
+    """
+
+    def __init__(
+        self, path: str, offsets: array, blanks: bytearray, strip: bool, owner: bool
+    ):
+        self.path = path
+        self.strip = strip
+        self._offsets = offsets
+        self._blanks = blanks
+        self._file = open(path, "rb")
+        # one byte more than the strings: an empty file cannot be mapped
+        self._map = mmap.mmap(
+            self._file.fileno(), offsets[-1] + 1, access=mmap.ACCESS_READ
+        )
+        weakref.finalize(self, _release, self._map, self._file, path if owner else None)
+
+    @classmethod
+    def from_xml(cls, src, strip: bool = False, directory=None) -> "SpilledStrings":
+        """Decode a sharedStrings part into a new spill file."""
+        offsets = array("Q", [0])
+        blanks = bytearray()
+        fd, path = tempfile.mkstemp(
+            prefix="shared_strings_", suffix=".bin", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "wb") as spill:
+                for text in _iter_strings(src):
+                    if strip:
+                        text = text.strip()
+                    blanks.append(not text.strip())
+                    data = text.encode("utf-8", "surrogatepass")
+                    spill.write(data)
+                    offsets.append(offsets[-1] + len(data))
+                spill.write(b"\0")
+            return cls(path, offsets, blanks, strip, owner=True)
+        except BaseException:
+            os.unlink(path)
+            raise
+
+    def __len__(self) -> int:
+        return len(self._blanks)
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("shared string index out of range")
+        return self._map[self._offsets[i] : self._offsets[i + 1]].decode(
+            "utf-8", "surrogatepass"
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+    def ref(self, i: int) -> SharedStringRef:
+        return SharedStringRef(i, bool(self._blanks[i]))
+
+    def __reduce__(self):
+        return SpilledStrings, (
+            self.path,
+            self._offsets,
+            self._blanks,
+            self.strip,
+            False,
+        )
+
+
+def _release(mapping, file, path) -> None:
+    mapping.close()
+    file.close()
+    if path is not None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
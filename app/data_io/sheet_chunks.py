@@ -0,0 +1,253 @@
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from openpyxl.formula.translate import Translator
+from openpyxl.worksheet._reader import FORMULA_TAG, ROW_TAG, WorkSheetParser
+from openpyxl.xml.functions import iterparse
+
+from config import CHUNKED_PARSE_CHUNK_BYTES
+from app.data_io.parallel_read import available_cpus
+
+_READ_BLOCK = 1 << 20
+_SHEET_DATA = re.compile(rb"<([\w.-]+:)?sheetData\b[^>]*?(/?)>")
+_WORKSHEET = re.compile(rb"<([\w.-]+:)?worksheet\b")
+_AFTER_ROW_TAG = b" \t\r\n>/"
+
+
+def sheet_xml_size(ws) -> int:
+    """Uncompressed size of a read-only worksheet's XML part."""
+    return ws.parent._archive.getinfo(ws._worksheet_path).file_size
+
+
+def iter_rows_chunked(
+    ws,
+    max_col: Optional[int],
+    convert: Callable,
+    workers: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+) -> Iterator[Tuple[int, list]]:
+    """
+    Parse the data rows (row 2 onward) of a read-only worksheet on several cores.
+
+    Yields (sheet row, convert(row values)) for the rows that
+    ws.iter_rows(min_row=2, max_col=max_col, values_only=True) returns, in
+    order, leaving out rows that convert maps to None.
+
+    The decompressed sheet XML is cut at <row> tags into chunks of about
+    chunk_bytes, each wrapped in the sheet's own header so it parses as a
+    worksheet. Workers parse them with openpyxl's WorkSheetParser (same value
+    conversion as the streaming reader) and apply convert; the shared strings
+    and date formats are sent to each worker once. Rows are reassembled with
+    the read-only worksheet's row sequencing (the stored dimension bounds the
+    rows read unless reset_dimensions() was called). Assumes no comments or
+    CDATA sections in <sheetData>, which spreadsheet writers do not emit.
+    """
+    wb = ws.parent
+    workers = workers or available_cpus()
+    chunk_bytes = chunk_bytes or CHUNKED_PARSE_CHUNK_BYTES
+    max_col = max_col or ws.max_column
+    sequencer = _RowSequencer(ws.max_row)
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(
+            ws._shared_strings,
+            wb.data_only,
+            wb.epoch,
+            wb._date_formats,
+            wb._timedelta_formats,
+        ),
+    )
+    try:
+        with ws._get_source() as src:
+            in_flight = deque()
+            for chunk in split_sheet_xml(src, chunk_bytes):
+                in_flight.append(pool.submit(_parse_chunk, chunk, max_col, convert))
+                # a few chunks ahead per worker bounds memory on huge sheets
+                if len(in_flight) > 2 * workers:
+                    yield from sequencer.rows(in_flight.popleft().result(), convert)
+                    if sequencer.done:
+                        return
+            while in_flight and not sequencer.done:
+                yield from sequencer.rows(in_flight.popleft().result(), convert)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def split_sheet_xml(src, chunk_bytes: int) -> Iterator[bytes]:
+    """Cut a sheet XML stream into standalone worksheet documents at <row> tags."""
+    buf = bytearray()
+    match = None
+    while match is None:
+        block = src.read(_READ_BLOCK)
+        if not block:
+            return  # no <sheetData>: no rows
+        buf += block
+        match = _SHEET_DATA.search(buf)
+    if match.group(2):
+        return  # <sheetData/>
+
+    header = bytes(buf[: match.end()])
+    sheet_data_prefix = match.group(1) or b""
+    root = _WORKSHEET.search(header)
+    root_prefix = (root.group(1) if root else None) or b""
+    row_tag = b"<" + sheet_data_prefix + b"row"
+    closing = b"</%ssheetData></%sworksheet>" % (sheet_data_prefix, root_prefix)
+
+    pending = buf[match.end() :]
+    while True:
+        # cut at the first row starting past chunk_bytes
+        cut = _row_start(pending, row_tag, chunk_bytes)
+        while cut > 0:
+            yield header + bytes(pending[:cut]) + closing
+            del pending[:cut]
+            cut = _row_start(pending, row_tag, chunk_bytes)
+        block = src.read(_READ_BLOCK)
+        if not block:
+            break
+        pending += block
+    yield header + bytes(pending)  # ends with the sheet's own closing tags
+
+
+def _row_start(buf: bytearray, row_tag: bytes, start: int) -> int:
+    """Position of the first <row> tag at or after start, or -1."""
+    pos = buf.find(row_tag, start)
+    while pos != -1:
+        after = pos + len(row_tag)
+        if after >= len(buf):
+            return -1  # tag name may continue in the next block
+        if buf[after] in _AFTER_ROW_TAG:
+            return pos
+        pos = buf.find(row_tag, after)  # e.g. <rowBreaks>
+    return -1
+
+
+class _RowSequencer:
+    """
+    Joins chunk results in sheet order, the way ReadOnlyWorksheet._cells_by_row
+    sequences rows: stop past max_row, skip rows that go backwards.
+    """
+
+    def __init__(self, max_row: Optional[int]):
+        self.max_row = max_row
+        self.counter = 2  # next sheet row expected (data starts at row 2)
+        self.last_row = 0  # row counter of the parser at the end of the last chunk
+        self.formulae: Dict[str, Tuple[str, str]] = {}  # shared formula masters
+        self.done = False
+
+    def rows(self, parsed, convert: Callable) -> Iterator[Tuple[int, list]]:
+        rows, unnumbered, unresolved, masters = parsed
+        offset = self.last_row
+        for n, (idx, values) in enumerate(rows):
+            if n < unnumbered:
+                idx += offset  # rows without r="" before the first numbered one
+            self.last_row = idx
+            if self.max_row is not None and idx > self.max_row:
+                self.done = True
+                return
+            if idx < self.counter:
+                continue
+            self.counter = idx + 1
+            if n in unresolved:
+                values = convert(self._resolve(*unresolved[n]))
+            if values is not None:
+                yield idx, values
+        for si, master in masters:
+            self.formulae.setdefault(si, master)
+
+    def _resolve(self, row: list, refs) -> list:
+        """Shared formulas whose master cell is in an earlier chunk."""
+        for col, si, coordinate in refs:
+            if si in self.formulae and col < len(row):
+                formula, origin = self.formulae[si]
+                row[col] = Translator(formula, origin).translate_formula(coordinate)
+        return row
+
+
+# Per-worker parser settings, set once by the pool initializer
+_parser_args: dict = {}
+
+
+def _init_worker(shared_strings, data_only, epoch, date_formats, timedelta_formats):
+    _parser_args.update(
+        shared_strings=shared_strings,
+        data_only=data_only,
+        epoch=epoch,
+        date_formats=date_formats,
+        timedelta_formats=timedelta_formats,
+    )
+
+
+def _parse_chunk(doc: bytes, max_col: Optional[int], convert: Callable):
+    """
+    Worker side: parse one chunk. Returns its (row number, convert(values))
+    pairs, how many leading rows had no r="" (numbered from 1 here; the caller
+    adds the previous chunk's last row), rows holding shared formulas whose
+    master is in an earlier chunk, and the shared formula masters seen.
+    """
+    parser = WorkSheetParser(None, **_parser_args)
+    track_formulae = not parser.data_only and b'"shared"' in doc
+    rows, unresolved, masters = [], {}, []
+    unnumbered, numbered = 0, False
+    for _, element in iterparse(BytesIO(doc)):
+        if element.tag != ROW_TAG:
+            continue
+        if not numbered:
+            numbered = "r" in element.attrib
+            unnumbered += not numbered
+        refs = _shared_formulae(element, parser, masters) if track_formulae else None
+        idx, cells = parser.parse_row(element)
+        element.clear()
+        values = _row_values(cells, max_col)
+        if refs:
+            unresolved[len(rows)] = (values, refs)
+            rows.append((idx, None))
+        else:
+            rows.append((idx, convert(values)))
+    return rows, unnumbered, unresolved, masters
+
+
+def _shared_formulae(row, parser, masters: list) -> List[Tuple[int, str, str]]:
+    """Record the row's shared formula masters; return references to unknown ones."""
+    refs = []
+    col = 0
+    for cell in row:
+        coordinate = cell.get("r")
+        col = _column(coordinate) if coordinate else col + 1
+        formula = cell.find(FORMULA_TAG)
+        if formula is None or formula.get("t") != "shared":
+            continue
+        si = formula.get("si")
+        if si in parser.shared_formulae:
+            continue
+        if formula.text is not None:
+            masters.append((si, ("=" + formula.text, coordinate)))
+        else:
+            refs.append((col - 1, si, coordinate))
+    return refs
+
+
+def _column(coordinate: str) -> int:
+    col = 0
+    for ch in coordinate:
+        if ch.isdigit():
+            break
+        col = col * 26 + ord(ch.upper()) - 64
+    return col
+
+
+def _row_values(cells: list, max_col: Optional[int]) -> list:
+    """ReadOnlyWorksheet._get_row(values_only=True) with min_col=1."""
+    if not cells and not max_col:
+        return []
+    width = max_col or cells[-1]["column"]
+    row = [None] * width
+    for cell in cells:
+        column = cell["column"]
+        if 1 <= column <= width:
+            row[column - 1] = cell["value"]
+    return row
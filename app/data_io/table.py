@@ -0,0 +1,275 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.data_io.fingerprint import row_fingerprint
+from app.data_io.shared_strings import SharedStringRef
+
+
+class Table:
+    """
+    Compact, column-oriented string table used for SOT/TGT data.
+
+    One header index is shared by every row and values are stored per column
+    instead of one dict per row. Columns listed in `interned` (e.g. Status,
+    Owner) are dictionary-encoded: each distinct value is stored once and rows
+    hold a 4-byte code.
+
+    Indexing or iterating a Table yields RowView objects, which behave like the
+    read-only row dicts used elsewhere in the project.
+
+    If fingerprint_columns is given, a row fingerprint of those columns is
+    computed as each row is appended (see row_fingerprint()).
+
+    Columns listed in `lazy` take SharedStringRef values into `strings` (a
+    SpilledStrings table) and keep only the string index; the string is decoded
+    whenever the value is read. Pickling a Table decodes them.
+    """
+
+    def __init__(
+        self,
+        headers: Sequence[str],
+        interned: Iterable[str] = (),
+        fingerprint_columns: Optional[Sequence[str]] = None,
+        strings: Optional[Sequence[str]] = None,
+        lazy: Iterable[str] = (),
+    ):
+        self.headers: List[str] = list(headers)
+        self.index: Dict[str, int] = {h: i for i, h in enumerate(self.headers)}
+        if len(self.index) != len(self.headers):
+            raise ValueError("Table headers must be unique.")
+
+        interned = set(interned)
+        lazy = set(lazy) if strings is not None else set()
+        self._columns: List[object] = [
+            (
+                _InternedColumn()
+                if h in interned
+                else _SpilledColumn(strings) if h in lazy else []
+            )
+            for h in self.headers
+        ]
+        self.row_numbers = array("I")  # sheet row of every row
+
+        self.fingerprint_columns: Optional[Tuple[str, ...]] = None
+        self.fingerprints: Optional[List[bytes]] = None
+        self._fingerprint_positions: List[int] = []
+        if fingerprint_columns is not None:
+            self.add_fingerprints(fingerprint_columns)
+
+    @classmethod
+    def from_rows(
+        cls, headers: Sequence[str], rows: Iterable[Sequence[str]], **kwargs
+    ) -> "Table":
+        table = cls(headers, **kwargs)
+        for values in rows:
+            table.append(values)
+        return table
+
+    def append(self, values: Sequence[str], row_number: Optional[int] = None) -> None:
+        """
+        Append one row of string values, in header order (short rows are padded).
+        row_number defaults to the row below the previous one (first data row: 2).
+        """
+        width = len(self._columns)
+        if len(values) < width:
+            values = list(values) + [""] * (width - len(values))
+        for column, value in zip(self._columns, values):
+            column.append(value)
+        if self.fingerprints is not None:
+            self.fingerprints.append(
+                row_fingerprint([values[p] for p in self._fingerprint_positions])
+            )
+        if row_number is None:
+            row_number = self.row_numbers[-1] + 1 if self.row_numbers else 2
+        self.row_numbers.append(row_number)
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+    def __bool__(self) -> bool:
+        return len(self.row_numbers) > 0
+
+    def __getitem__(self, i: int) -> RowView:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Table row index out of range")
+        return RowView(self, i)
+
+    def __iter__(self) -> Iterator[RowView]:
+        for i in range(len(self)):
+            yield RowView(self, i)
+
+    def __repr__(self) -> str:
+        return f"Table({len(self)} rows x {len(self.headers)} columns)"
+
+    def add_fingerprints(self, columns: Sequence[str]) -> None:
+        """Fingerprint every row (existing and future) over the given columns."""
+        self._fingerprint_positions = [self.index[c] for c in columns]
+        self.fingerprint_columns = tuple(columns)
+        rows = self.project(columns) if columns else ((),) * len(self)
+        self.fingerprints = [row_fingerprint(values) for values in rows]
+
+    def subset(self, positions: Sequence[int]) -> "Table":
+        """New Table with the rows at the given positions (row numbers and
+        fingerprints included)."""
+        interned = [
+            h
+            for h, column in zip(self.headers, self._columns)
+            if isinstance(column, _InternedColumn)
+        ]
+        table = Table(self.headers, interned=interned)
+        for i in positions:
+            table.append(self.row_values(i), self.row_numbers[i])
+        if self.fingerprints is not None:
+            table.fingerprint_columns = self.fingerprint_columns
+            table._fingerprint_positions = list(self._fingerprint_positions)
+            table.fingerprints = [self.fingerprints[i] for i in positions]
+        return table
+
+    def fingerprints_for(self, columns: Sequence[str]) -> Optional[List[bytes]]:
+        """Row fingerprints if they were computed over exactly these columns."""
+        if self.fingerprint_columns == tuple(columns):
+            return self.fingerprints
+        return None
+
+    def project(self, columns: Sequence[str]) -> Iterator[Tuple[str, ...]]:
+        return zip(*(self.iter_column(c) for c in columns))
+
+    def value(self, i: int, name: str) -> str:
+        return self._columns[self.index[name]][i]
+
+    def iter_column(self, name: str) -> Iterator[str]:
+        """Iterate the values of one column without building a list."""
+        return iter(self._columns[self.index[name]])
+
+    def column(self, name: str) -> List[str]:
+        return list(self.iter_column(name))
+
+    def take(self, name: str, positions: Iterable[int]) -> List[str]:
+        """Values of one column at the given row positions."""
+        column = self._columns[self.index[name]]
+        return [column[i] for i in positions]
+
+    def row_values(self, i: int) -> Tuple[str, ...]:
+        return tuple(column[i] for column in self._columns)
+
+
+class RowView(Mapping):
+    """Read-only dict-like view of one Table row."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: Table, i: int):
+        self._table = table
+        self._i = i
+
+    @property
+    def row_number(self) -> int:
+        return self._table.row_numbers[self._i]
+
+    def __getitem__(self, key: str) -> str:
+        return self._table._columns[self._table.index[key]][self._i]
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        col = self._table.index.get(key)
+        if col is None:
+            return default
+        return self._table._columns[col][self._i]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._table.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.headers)
+
+    def __len__(self) -> int:
+        return len(self._table.headers)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class _InternedColumn:
+    """Dictionary-encoded column: distinct values stored once, rows keep codes."""
+
+    __slots__ = ("codes", "values", "lookup")
+
+    def __init__(self):
+        self.codes = array("I")
+        self.values: List[str] = []
+        self.lookup: Dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[self.codes[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.values.__getitem__, self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class _SpilledColumn:
+    """
+    Column of spilled shared strings: rows keep the string index and the
+    string is decoded on access. Other values (numbers, inline strings, "")
+    are kept in a side list under negative codes.
+    """
+
+    __slots__ = ("strings", "codes", "literals")
+
+    def __init__(self, strings: Sequence[str]):
+        self.strings = strings
+        self.codes = array("q")
+        self.literals: List[str] = [""]  # code -1
+
+    def append(self, value) -> None:
+        if type(value) is SharedStringRef:
+            self.codes.append(value.index)
+        elif value == "":
+            self.codes.append(-1)
+        else:
+            self.literals.append(value)
+            self.codes.append(-len(self.literals))
+
+    def __getitem__(self, i: int) -> str:
+        code = self.codes[i]
+        return self.strings[code] if code >= 0 else self.literals[-code - 1]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.__getitem__, range(len(self.codes)))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __reduce__(self):
+        # the spill file belongs to this process: send the strings themselves
+        return list, (list(self),)
+
+
+def headers_of(rows) -> List[str]:
+    """Column names of a Table, or of the first row of a list of row dicts."""
+    if isinstance(rows, Table):
+        return list(rows.headers)
+    return list(rows[0].keys()) if rows else []
+
+
+def project(rows, columns: Sequence[str]) -> Iterator[Tuple]:
+    """
+    Yield a tuple of the requested column values for every row.
+    Reads whole columns from a Table; falls back to .get() for plain row dicts
+    (missing keys give None, as with dict.get).
+    """
+    if isinstance(rows, Table):
+        return rows.project(columns)
+    return (tuple(r.get(c) for c in columns) for r in rows)
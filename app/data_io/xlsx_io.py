@@ -1,37 +1,630 @@
 from __future__ import annotations
-from typing import List, Dict, Tuple, Optional
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Dict, Iterable, Iterator, Tuple, Optional, Sequence
+from loguru import logger
 from openpyxl import load_workbook
 
-from config import OUTPUT_DIR
+from config import (
+    CHUNKED_PARSE_MIN_BYTES,
+    INTERNED_COLUMNS,
+    OUTPUT_DIR,
+    XLSX_READ_BACKEND,
+)
+from app.data_io.parallel_read import available_cpus
+from app.data_io.shared_strings import SharedStringRef
+from app.data_io.sheet_chunks import iter_rows_chunked, sheet_xml_size
+from app.data_io.table import Table
+from app.data_io.xlsx_native import NativeSheet, NativeWorkbook, UnsupportedWorkbook
 
 
 def read_sot_xlsx(
-    file_path: str, sheet_name: str
-) -> Tuple[List[str], List[Dict[str, str]]]:
+    file_path: str,
+    sheet_name: str,
+    interned: Iterable[str] = INTERNED_COLUMNS,
+    fingerprint_columns: Optional[Sequence[str]] = None,
+    validator=None,
+    parse_workers: Optional[int] = None,
+    backend: str = XLSX_READ_BACKEND,
+    spill_strings: Optional[bool] = None,
+    columns: Optional[Iterable[str]] = None,
+    where: Optional[Tuple[str, Callable[[str], bool]]] = None,
+    workbook=None,
+) -> Tuple[List[str], Table]:
     """
     Read SOT spreadsheet for data only (ignore styles).
-    Returns (headers, list of dicts).
+    Returns (headers, Table of stripped string values).
+    columns projects the read onto those columns: the Table only holds them
+    (see projected_columns()), while headers still lists every named column.
+    The native backend skips the other cells without decoding them.
+    where=(column, predicate) keeps only the rows whose value in column (a
+    read column, as the Table would hold it) passes predicate. The native
+    backend checks that cell first and skips the rest of a rejected row.
+    If fingerprint_columns is given (the mapped SOT columns), a row fingerprint
+    of those columns is computed while reading (see Table.fingerprints).
+    If a validator (DatasetValidator) is given, it checks the header row before
+    any data is read and every row as it is read.
+    parse_workers: None parses sheets of CHUNKED_PARSE_MIN_BYTES or more in
+    chunks on every CPU (see iter_rows_chunked()), 1 always streams the sheet
+    in this process, n > 1 always parses in chunks on n workers.
+    backend: "native" parses the package XML directly (see xlsx_native), falling
+    back to openpyxl if the package is not understood; "openpyxl" uses
+    openpyxl's read-only workbook. The result is the same either way.
+    spill_strings (native backend): True keeps the shared strings in a
+    memory-mapped spill file, None does so for large tables (see
+    SHARED_STRINGS_SPILL_MIN_BYTES). Columns that are not fingerprinted,
+    interned or the validator's ID column then hold string indexes and decode
+    a value only when it is read.
+    workbook: an open SOT workbook of file_path (see open_values_workbook())
+    to read the sheet from instead of opening the file; it is left open, so
+    several sheets can be read from one load. backend and spill_strings are
+    then those of the workbook.
+    """
+    wb, ws, header_row = _open_sot_sheet(
+        file_path, sheet_name, backend, spill_strings, workbook
+    )
+    headers = [h for h in header_row if h]
+    try:
+        data = _read_table(
+            ws,
+            header_row,
+            projected_columns(headers, columns),
+            interned,
+            fingerprint_columns,
+            validator,
+            strip=True,
+            parse_workers=parse_workers,
+            where=where,
+        )
+    finally:
+        if workbook is None:
+            wb.close()
+    return headers, data
+
+
+def read_tgt_values(
+    file_path: str,
+    sheet_name: str,
+    interned: Iterable[str] = INTERNED_COLUMNS,
+    fingerprint_columns: Optional[Sequence[str]] = None,
+    validator=None,
+    parse_workers: Optional[int] = None,
+    backend: str = XLSX_READ_BACKEND,
+    spill_strings: Optional[bool] = None,
+    columns: Optional[Iterable[str]] = None,
+    where: Optional[Tuple[str, Callable[[str], bool]]] = None,
+    workbook=None,
+) -> Tuple[List[str], Table]:
+    """
+    Read TGT spreadsheet values only, streaming the sheet (no styles loaded).
+    Returns (headers, Table). headers keeps every sheet column, so headers[i] is
+    column i + 1 (blank header cells are ""); the Table only holds named columns.
+    Blank rows are skipped; Table.row_numbers anchors every row to its sheet row.
+    fingerprint_columns (the mapped TGT columns), validator, parse_workers,
+    backend, spill_strings, columns, where and workbook work as in
+    read_sot_xlsx().
+
+    Use read_tgt_xlsx() only when the styled workbook must be written back.
+    """
+    wb, ws, header_row = _open_tgt_sheet(
+        file_path, sheet_name, backend, spill_strings, workbook
+    )
+    try:
+        data = _read_table(
+            ws,
+            header_row,
+            projected_columns(header_row, columns),
+            interned,
+            fingerprint_columns,
+            validator,
+            strip=False,
+            parse_workers=parse_workers,
+            where=where,
+        )
+    finally:
+        if workbook is None:
+            wb.close()
+    return header_row, data
+
+
+def stream_sot_rows(
+    file_path: str,
+    sheet_name: str,
+    validator=None,
+    parse_workers: Optional[int] = None,
+    backend: str = XLSX_READ_BACKEND,
+    spill_strings: Optional[bool] = None,
+    columns: Optional[Iterable[str]] = None,
+    where: Optional[Tuple[str, Callable[[str], bool]]] = None,
+) -> Tuple[List[str], Iterator[Tuple[int, List[str]]]]:
+    """
+    Streaming form of read_sot_xlsx(): returns (headers, rows) at once, where
+    rows yields (sheet row, stripped values in header order) as the sheet is
+    parsed, so nothing but the current row is held. With columns, rows hold
+    projected_columns(headers, columns) only, and where filters them as in
+    read_sot_xlsx(). The header row is checked
+    (and validator.start() called) before returning; validator.finish() runs
+    when the rows are exhausted. The workbook is closed when the generator is
+    exhausted or closed.
+    """
+    wb, ws, header_row = _open_sot_sheet(file_path, sheet_name, backend, spill_strings)
+    headers = [h for h in header_row if h]
+    return headers, _stream_rows(
+        wb,
+        ws,
+        header_row,
+        projected_columns(headers, columns),
+        validator,
+        strip=True,
+        parse_workers=parse_workers,
+        where=where,
+    )
+
+
+def stream_tgt_rows(
+    file_path: str,
+    sheet_name: str,
+    validator=None,
+    parse_workers: Optional[int] = None,
+    backend: str = XLSX_READ_BACKEND,
+    spill_strings: Optional[bool] = None,
+    columns: Optional[Iterable[str]] = None,
+    where: Optional[Tuple[str, Callable[[str], bool]]] = None,
+) -> Tuple[List[str], Iterator[Tuple[int, List[str]]]]:
+    """
+    Streaming form of read_tgt_values(): returns (headers, rows); headers keeps
+    every sheet column as in read_tgt_values(), rows yields (sheet row, values
+    of the named columns, or of projected_columns(headers, columns)).
+    Otherwise as stream_sot_rows().
+    """
+    wb, ws, header_row = _open_tgt_sheet(file_path, sheet_name, backend, spill_strings)
+    return header_row, _stream_rows(
+        wb,
+        ws,
+        header_row,
+        projected_columns(header_row, columns),
+        validator,
+        strip=False,
+        parse_workers=parse_workers,
+        where=where,
+    )
+
+
+def projected_columns(
+    headers: Sequence[str], columns: Optional[Iterable[str]] = None
+) -> List[str]:
+    """
+    The columns a reader returns for a header row: the named headers, in sheet
+    order, restricted to columns if given (columns not in the sheet are left
+    out; validators report the ones they need).
+    """
+    if columns is None:
+        return [h for h in headers if h]
+    wanted = set(columns)
+    return [h for h in headers if h and h in wanted]
+
+
+@dataclass
+class SheetHeader:
+    """
+    The header row of a sheet, read without its data rows. header_row keeps
+    every sheet column ("" for blank cells); max_row and max_column are the
+    sheet's stored dimension, a size hint that some writers leave stale.
+    """
+
+    header_row: List[str]
+    max_row: Optional[int] = None
+    max_column: Optional[int] = None
+
+    @property
+    def headers(self) -> List[str]:
+        """The named columns, in sheet order."""
+        return [h for h in self.header_row if h]
+
+
+def read_sot_header(
+    file_path: str, sheet_name: str, backend: str = XLSX_READ_BACKEND
+) -> SheetHeader:
+    """
+    The SOT header row as read_sot_xlsx() reads it, without reading any data
+    row: the native backend parses row 1 only, and only the shared strings it
+    uses. Raises ValueError if the sheet does not exist (listing the sheets
+    there are) or a column name is duplicated.
+    """
+    return _read_header(file_path, sheet_name, "SOT", backend)
+
+
+def read_tgt_header(
+    file_path: str, sheet_name: str, backend: str = XLSX_READ_BACKEND
+) -> SheetHeader:
+    """The TGT header row as read_tgt_values() reads it; see read_sot_header()."""
+    return _read_header(file_path, sheet_name, "TGT", backend)
+
+
+def _read_header(file_path: str, sheet_name: str, label: str, backend: str):
+    if not sheet_name:
+        raise ValueError(f"{label} sheet name must be provided in config.py")
+
+    wb = _load_values_workbook(
+        file_path, data_only=label == "SOT", backend=backend, load_strings=False
+    )
+    try:
+        if sheet_name not in wb.sheetnames:
+            raise ValueError(
+                f"{file_path}: {label} sheet '{sheet_name}' not found "
+                f"(sheets: {', '.join(wb.sheetnames)})"
+            )
+        ws = wb[sheet_name]
+        header = SheetHeader([], ws.max_row, ws.max_column)
+        if label == "TGT":
+            # read as _open_tgt_sheet() does: up to the last cell of the row
+            ws.reset_dimensions()
+        if isinstance(ws, NativeSheet):
+            values = ws.header_row()
+        else:
+            values = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        header.header_row = _header_row(values, label, file_path)
+    finally:
+        wb.close()
+    return header
+
+
+def open_values_workbook(
+    file_path: str,
+    label: str,
+    backend: str = XLSX_READ_BACKEND,
+    spill_strings: Optional[bool] = None,
+):
+    """
+    Open a SOT or TGT workbook (label) to read the values of several of its
+    sheets (the readers' workbook=). The caller closes it.
+    """
+    if label not in ("SOT", "TGT"):
+        raise ValueError(f"Unknown workbook label: {label}")
+    if label == "SOT":
+        return _load_values_workbook(
+            file_path,
+            data_only=True,
+            backend=backend,
+            spill_strings=spill_strings,
+            strip_strings=True,
+        )
+    return _load_values_workbook(
+        file_path, data_only=False, backend=backend, spill_strings=spill_strings
+    )
+
+
+def _open_sot_sheet(
+    file_path: str,
+    sheet_name: str,
+    backend: str,
+    spill_strings: Optional[bool],
+    workbook=None,
+):
+    """
+    (workbook, worksheet, stripped header row) of a SOT sheet, from workbook
+    if given (it is then not closed on error).
     """
     if not sheet_name:
         raise ValueError("SOT sheet name must be provided in config.py")
 
-    wb = load_workbook(filename=file_path, data_only=True, read_only=True)
-    ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
-    header_row = [
-        str(c).strip() if c else ""
-        for c in next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
-    ]
+    wb = workbook
+    if wb is None:
+        wb = open_values_workbook(file_path, "SOT", backend, spill_strings)
+    try:
+        ws = wb[sheet_name]
+        header_row = _header_row(
+            next(ws.iter_rows(min_row=1, max_row=1, values_only=True)),
+            "SOT",
+            file_path,
+        )
+    except BaseException:
+        if workbook is None:
+            wb.close()
+        raise
+    return wb, ws, header_row
 
-    headers = [h for h in header_row if h]
-    if len(headers) != len(set(headers)):
-        raise ValueError(f"{file_path}: duplicate column names detected in SOT.")
-
-    data = []
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        values = ["" if v is None else str(v).strip() for v in row[: len(headers)]]
-        if any(values):
-            data.append(dict(zip(headers, values)))
-    return headers, data
+
+def _open_tgt_sheet(
+    file_path: str,
+    sheet_name: str,
+    backend: str,
+    spill_strings: Optional[bool],
+    workbook=None,
+):
+    """
+    (workbook, worksheet, header row of every sheet column) of a TGT sheet,
+    from workbook if given, as _open_sot_sheet().
+    """
+    if not sheet_name:
+        raise ValueError("TGT sheet name must be provided in config.py")
+
+    wb = workbook
+    if wb is None:
+        wb = open_values_workbook(file_path, "TGT", backend, spill_strings)
+    try:
+        ws = wb[sheet_name]
+        # don't trust the stored <dimension>; some writers leave it at A1:A1
+        ws.reset_dimensions()
+        header_row = _header_row(
+            next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ()),
+            "TGT",
+            file_path,
+        )
+    except BaseException:
+        if workbook is None:
+            wb.close()
+        raise
+    return wb, ws, header_row
+
+
+def _header_row(values, label: str, file_path: str) -> List[str]:
+    """
+    Header cells as stripped strings: SOT blanks any false value, TGT only
+    empty cells (""). Duplicate column names raise ValueError.
+    """
+    if label == "SOT":
+        header_row = [str(c).strip() if c else "" for c in values]
+    else:
+        header_row = ["" if c is None else str(c).strip() for c in values]
+    named = [h for h in header_row if h]
+    if len(named) != len(set(named)):
+        raise ValueError(f"{file_path}: duplicate column names detected in {label}.")
+    return header_row
+
+
+def _stream_rows(
+    wb,
+    ws,
+    header_row: List[str],
+    headers: List[str],
+    validator,
+    strip: bool,
+    parse_workers,
+    where=None,
+) -> Iterator[Tuple[int, List[str]]]:
+    # validator.start() runs now, not at the first next(): header problems
+    # must surface before the caller starts consuming rows
+    try:
+        if validator is not None:
+            validator.start(headers)
+    except BaseException:
+        wb.close()
+        raise
+    return _validated_rows(
+        wb, ws, header_row, headers, validator, strip, parse_workers, where
+    )
+
+
+def _validated_rows(
+    wb,
+    ws,
+    header_row: List[str],
+    headers: List[str],
+    validator,
+    strip: bool,
+    parse_workers,
+    where=None,
+) -> Iterator[Tuple[int, List[str]]]:
+    try:
+        rows = _data_rows(ws, header_row, headers, strip, parse_workers, where=where)
+        for row_num, values in rows:
+            if validator is not None:
+                validator.row(row_num, values)
+            yield row_num, values
+        if validator is not None:
+            validator.finish()
+    finally:
+        wb.close()
+
+
+def _load_values_workbook(
+    file_path: str,
+    data_only: bool,
+    backend: str,
+    spill_strings: Optional[bool] = None,
+    strip_strings: bool = False,
+    load_strings: bool = True,
+):
+    """A workbook for streaming values: NativeWorkbook or openpyxl read-only."""
+    if backend not in ("native", "openpyxl"):
+        raise ValueError(f"Unknown XLSX read backend: {backend}")
+    if backend == "native":
+        try:
+            return NativeWorkbook(
+                file_path,
+                data_only=data_only,
+                spill_strings=spill_strings,
+                strip_strings=strip_strings,
+                load_strings=load_strings,
+            )
+        except UnsupportedWorkbook as e:
+            logger.warning(
+                f"{file_path}: native reader not usable ({e}); using openpyxl"
+            )
+    return load_workbook(filename=file_path, data_only=data_only, read_only=True)
+
+
+def _read_table(
+    ws,
+    header_row: List[str],
+    headers: List[str],
+    interned: Iterable[str],
+    fingerprint_columns: Optional[Sequence[str]],
+    validator,
+    strip: bool,
+    parse_workers: Optional[int] = None,
+    where: Optional[Tuple[str, Callable[[str], bool]]] = None,
+) -> Table:
+    """
+    Stream data rows (row 2 onward) of a read-only worksheet into a Table of
+    the headers columns (all named columns or a projection of them).
+    Values become strings (None → ""), stripped if requested; blank rows are skipped.
+    Fingerprints are skipped if a fingerprint column is missing (validation
+    reports it later).
+    """
+    if fingerprint_columns is not None and not set(fingerprint_columns) <= set(headers):
+        fingerprint_columns = None
+    strings = getattr(ws.parent, "spilled_strings", None)
+    lazy = set()
+    if strings is not None:
+        # values needed while reading are decoded; the rest stay in the spill
+        lazy = set(headers) - set(interned) - set(fingerprint_columns or ())
+        if validator is not None:
+            lazy.discard(validator.unique_id_col)
+        if where is not None:
+            lazy.discard(where[0])
+    table = Table(
+        headers,
+        interned=interned,
+        fingerprint_columns=fingerprint_columns,
+        strings=strings,
+        lazy=lazy,
+    )
+    if validator is not None:
+        validator.start(headers)
+
+    rows = _data_rows(
+        ws, header_row, headers, strip, parse_workers, strings, lazy, where
+    )
+    for row_num, values in rows:
+        table.append(values, row_num)
+        if validator is not None:
+            validator.row(row_num, values)
+    if validator is not None:
+        validator.finish()
+    return table
+
+
+def _data_rows(
+    ws,
+    header_row: List[str],
+    headers: List[str],
+    strip: bool,
+    parse_workers: Optional[int],
+    strings=None,
+    lazy: Iterable[str] = (),
+    where: Optional[Tuple[str, Callable[[str], bool]]] = None,
+) -> Iterator[Tuple[int, list]]:
+    """
+    (sheet row, values of the headers columns) for the data rows (row 2
+    onward) of a worksheet, blank rows left out (a row is blank if those
+    columns are), as are rows rejected by where (column, predicate). Columns
+    in lazy keep SharedStringRef values from the spilled shared strings table
+    `strings`. The native reader skips the cells of other columns before
+    decoding them, and the rest of a row once its where cell fails.
+    """
+    wanted = set(headers)
+    positions = [i for i, h in enumerate(header_row) if h and h in wanted]
+    convert = partial(_row_strings, positions=positions, strip=strip)
+    max_col = len(header_row) or None
+    sheet_options = {}
+    if len(positions) < sum(1 for h in header_row if h):
+        # projected: nothing right of the last wanted column is needed
+        max_col = positions[-1] + 1 if positions else 1
+        if isinstance(ws, NativeSheet):
+            sheet_options["columns"] = frozenset(p + 1 for p in positions)
+    if where is not None:
+        column, predicate = where
+        if column not in wanted:
+            raise ValueError(f"Row filter column '{column}' is not read")
+        if isinstance(ws, NativeSheet):
+            sheet_options["where"] = (
+                header_row.index(column) + 1,
+                partial(
+                    _cell_passes, predicate=predicate, strip=strip, strings=strings
+                ),
+            )
+    if parse_workers is None:
+        chunked = available_cpus() > 1 and sheet_xml_size(ws) >= CHUNKED_PARSE_MIN_BYTES
+    else:
+        chunked = parse_workers > 1
+    if chunked:
+        # workers decode the strings they use from the spill file
+        rows = iter_rows_chunked(ws, max_col, convert, workers=parse_workers)
+    elif lazy:
+        lazy_positions = {i for i, h in enumerate(header_row) if h in lazy}
+        rows = (
+            (
+                row_num,
+                _row_strings_spilled(row, positions, strip, strings, lazy_positions),
+            )
+            for row_num, row in enumerate(
+                ws.iter_rows(
+                    min_row=2,
+                    max_col=max_col,
+                    values_only=True,
+                    string_refs=True,
+                    **sheet_options,
+                ),
+                start=2,
+            )
+        )
+    else:
+        rows = (
+            (row_num, convert(row))
+            for row_num, row in enumerate(
+                ws.iter_rows(
+                    min_row=2, max_col=max_col, values_only=True, **sheet_options
+                ),
+                start=2,
+            )
+        )
+    if where is not None:
+        position = headers.index(column)
+        return (
+            (row_num, values)
+            for row_num, values in rows
+            if values is not None and predicate(values[position])
+        )
+    return ((row_num, values) for row_num, values in rows if values is not None)
+
+
+def _cell_passes(
+    value, predicate: Callable[[str], bool], strip: bool, strings=None
+) -> bool:
+    """predicate on a raw cell value, converted as _row_strings() converts it."""
+    if type(value) is SharedStringRef:
+        return predicate(strings[value.index])
+    value = "" if value is None else str(value)
+    return predicate(value.strip() if strip else value)
+
+
+def _row_strings(row, positions: List[int], strip: bool) -> Optional[List[str]]:
+    """The named columns of a row as strings, or None for a blank row."""
+    if strip:
+        values = [
+            "" if i >= len(row) or row[i] is None else str(row[i]).strip()
+            for i in positions
+        ]
+        return values if any(values) else None
+    values = ["" if i >= len(row) or row[i] is None else str(row[i]) for i in positions]
+    return values if any(v.strip() for v in values) else None
+
+
+def _row_strings_spilled(
+    row, positions: List[int], strip: bool, strings, lazy: set
+) -> Optional[list]:
+    """
+    _row_strings() for rows holding SharedStringRef values: refs in lazy
+    positions are kept for the Table, other refs are decoded (the spill file
+    already holds stripped strings when strip is set).
+    """
+    values = []
+    blank = True
+    for i in positions:
+        value = row[i] if i < len(row) else None
+        if type(value) is SharedStringRef:
+            blank = blank and value.blank
+            values.append(value if i in lazy else strings[value.index])
+            continue
+        value = "" if value is None else str(value)
+        if strip:
+            value = value.strip()
+        if blank and value.strip():
+            blank = False
+        values.append(value)
+    return None if blank else values
 
 
 def read_tgt_xlsx(file_path: str, sheet_name: str) -> Tuple:
@@ -51,35 +644,66 @@ from datetime import datetime
 from pathlib import Path
 
 
+def build_output_path(tgt_filename: str, output_dir: str = OUTPUT_DIR) -> Path:
+    """
+    Return <output_dir>/<tgt_stem>_updated_<YYYYMMDD_HHMM>.xlsx, creating output_dir.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+    out_name = f"{Path(tgt_filename).stem}_updated_{timestamp}.xlsx"
+    out_path = Path(output_dir) / out_name
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    return out_path
+
+
 def write_tgt_xlsx(
-    wb, ws, updated_rows, tgt_filename: str, output_dir: str = OUTPUT_DIR
+    wb,
+    ws,
+    cell_updates: Dict[int, Dict[int, str]],
+    tgt_filename: str,
+    output_dir: str = OUTPUT_DIR,
 ) -> str:
     """
     Write updated TGT workbook while preserving styles (fills, fonts, etc.).
     Arguments:
       wb, ws: workbook and worksheet returned from read_tgt_xlsx()
-      updated_rows: list of dicts with updated values (headers must match first row)
+      cell_updates: {sheet row: {column index (1-based): new value}};
+                    only these cells are touched (see ChangeSet.cell_updates())
       output_dir: directory where output will be saved
       tgt_filename: base filename of original TGT file
 
     Returns path of the newly saved file.
     """
-    headers = [str(c.value).strip() for c in next(ws.iter_rows(min_row=1, max_row=1))]
-    header_index = {h: idx + 1 for idx, h in enumerate(headers)}
+    _set_values(ws, cell_updates)
 
-    # Update cells based on updated_rows (row 2 onward)
-    for i, row_dict in enumerate(updated_rows, start=2):
-        for col_name, new_value in row_dict.items():
-            if col_name in header_index:
-                cell = ws.cell(row=i, column=header_index[col_name])
-                # Only update value; openpyxl keeps styles automatically
-                cell.value = new_value
+    out_path = build_output_path(tgt_filename, output_dir)
+    wb.save(out_path)
 
-    # generate filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    out_name = f"{Path(tgt_filename).stem}_updated_{timestamp}.xlsx"
-    out_path = Path(output_dir) / out_name
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    return str(out_path)
+
+
+def write_tgt_sheets_xlsx(
+    wb,
+    sheet_updates: Dict[str, Dict[int, Dict[int, str]]],
+    tgt_filename: str,
+    output_dir: str = OUTPUT_DIR,
+) -> str:
+    """
+    write_tgt_xlsx() for several worksheets of wb, saved once: sheet_updates
+    maps each worksheet name to its cell_updates.
+
+    Returns path of the newly saved file.
+    """
+    for sheet_name, cell_updates in sheet_updates.items():
+        _set_values(wb[sheet_name], cell_updates)
+
+    out_path = build_output_path(tgt_filename, output_dir)
     wb.save(out_path)
 
     return str(out_path)
+
+
+def _set_values(ws, cell_updates: Dict[int, Dict[int, str]]) -> None:
+    for row_num, columns in cell_updates.items():
+        for col_idx, new_value in columns.items():
+            # Only update value; openpyxl keeps styles automatically
+            ws.cell(row=row_num, column=col_idx).value = new_value
@@ -0,0 +1,460 @@
+"""
+Value-only XLSX reader that parses the package XML directly.
+
+It reads the workbook, sheet, shared strings and cell values with the
+streaming XML parser and skips openpyxl's per-cell objects, dicts and
+coordinate parsing. Values and row sequencing match openpyxl's read-only
+worksheets (same number/date/boolean conversion, formulas via openpyxl's
+formula parser when data_only is False), so readers can use either.
+"""
+
+import posixpath
+import zipfile
+from typing import AbstractSet, Callable, Dict, Iterator, List, Optional, Tuple
+from warnings import warn
+
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    WINDOWS_EPOCH,
+    from_excel,
+    from_ISO8601,
+)
+from openpyxl.worksheet._reader import WorkSheetParser, _cast_number
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import fromstring, iterparse
+
+from config import SHARED_STRINGS_SPILL_MIN_BYTES
+from app.data_io.shared_strings import (
+    SharedStringRef,
+    SpilledStrings,
+    read_shared_strings,
+    text_content,
+)
+from app.data_io.sheet_chunks import split_sheet_xml
+
+_ROW_BLOCK_BYTES = 128 * 1024  # small blocks keep the trees (and peak memory) small
+
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_REL = f"{{{_PKG_REL_NS}}}Relationship"
+_WORKBOOK = f"{{{SHEET_MAIN_NS}}}workbook"
+_WORKBOOK_PR = f"{{{SHEET_MAIN_NS}}}workbookPr"
+_SHEET = f"{{{SHEET_MAIN_NS}}}sheet"
+_SHEET_ID = f"{{{_DOC_REL_NS}}}id"
+_DIMENSION = f"{{{SHEET_MAIN_NS}}}dimension"
+_SHEET_DATA = f"{{{SHEET_MAIN_NS}}}sheetData"
+_ROW = f"{{{SHEET_MAIN_NS}}}row"
+_VALUE = f"{{{SHEET_MAIN_NS}}}v"
+_FORMULA = f"{{{SHEET_MAIN_NS}}}f"
+_INLINE = f"{{{SHEET_MAIN_NS}}}is"
+
+
+class UnsupportedWorkbook(Exception):
+    """The package layout is not understood; use the openpyxl reader instead."""
+
+
+class NativeWorkbook:
+    """
+    A workbook opened for value-only reading. Mirrors the parts of openpyxl's
+    read-only workbook the readers use: wb[sheet_name], close(), data_only.
+    Raises UnsupportedWorkbook if the package cannot be resolved.
+
+    spill_strings: True keeps the shared strings in a memory-mapped spill file
+    (SpilledStrings, stripped if strip_strings) instead of a list; None does so
+    when the sharedStrings part is at least SHARED_STRINGS_SPILL_MIN_BYTES.
+    load_strings=False defers reading the table until a sheet's rows are read,
+    so NativeSheet.header_row() only decodes the strings the header uses.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        data_only: bool = False,
+        spill_strings: Optional[bool] = None,
+        strip_strings: bool = False,
+        load_strings: bool = True,
+    ):
+        self.data_only = data_only
+        self._spill_strings = spill_strings
+        self._strip_strings = strip_strings
+        self._load_strings = load_strings
+        try:
+            self._archive = zipfile.ZipFile(file_path)
+        except zipfile.BadZipFile as e:
+            raise UnsupportedWorkbook(f"not a zip package: {e}") from e
+        try:
+            self._resolve_parts()
+        except (KeyError, StopIteration, ValueError, SyntaxError) as e:
+            self._archive.close()
+            raise UnsupportedWorkbook(f"cannot resolve workbook parts: {e}") from e
+
+    def _resolve_parts(self) -> None:
+        root_rels = _relationships(self._archive, "_rels/.rels", "")
+        workbook_path = next(
+            target
+            for rel_type, target in root_rels.values()
+            if rel_type.endswith("/officeDocument")
+        )
+        workbook = fromstring(self._archive.read(workbook_path))
+        if workbook.tag != _WORKBOOK:
+            raise ValueError(f"unexpected workbook root {workbook.tag}")
+        rels = _relationships(
+            self._archive,
+            posixpath.join(
+                posixpath.dirname(workbook_path),
+                "_rels",
+                posixpath.basename(workbook_path) + ".rels",
+            ),
+            posixpath.dirname(workbook_path),
+        )
+
+        properties = workbook.find(_WORKBOOK_PR)
+        date1904 = properties is not None and properties.get("date1904") in (
+            "1",
+            "true",
+        )
+        self.epoch = CALENDAR_MAC_1904 if date1904 else WINDOWS_EPOCH
+
+        self._sheet_paths: Dict[str, str] = {}
+        for sheet in workbook.iter(_SHEET):
+            rel_id = sheet.get(_SHEET_ID)
+            if rel_id in rels and rels[rel_id][0].endswith("/worksheet"):
+                self._sheet_paths[sheet.get("name")] = rels[rel_id][1]
+
+        self._strings_part: Optional[str] = None
+        self._date_formats, self._timedelta_formats = set(), set()
+        for rel_type, target in rels.values():
+            if rel_type.endswith("/sharedStrings"):
+                self._strings_part = target
+            elif rel_type.endswith("/styles"):
+                stylesheet = Stylesheet.from_tree(
+                    fromstring(self._archive.read(target))
+                )
+                if stylesheet.cell_styles:
+                    self._date_formats = stylesheet.date_formats
+                    self._timedelta_formats = stylesheet.timedelta_formats
+        # None until read (load_strings=False)
+        self._shared_strings = (
+            self._read_shared_strings() if self._load_strings else None
+        )
+
+    def _read_shared_strings(self):
+        part = self._strings_part
+        if part is None:
+            return []
+        spill = self._spill_strings
+        if spill is None:
+            spill = (
+                SHARED_STRINGS_SPILL_MIN_BYTES is not None
+                and self._archive.getinfo(part).file_size
+                >= SHARED_STRINGS_SPILL_MIN_BYTES
+            )
+        with self._archive.open(part) as src:
+            if spill:
+                return SpilledStrings.from_xml(src, strip=self._strip_strings)
+            return read_shared_strings(src)
+
+    @property
+    def shared_strings(self):
+        """The shared strings table (list or SpilledStrings), read on first use."""
+        if self._shared_strings is None:
+            self._shared_strings = self._read_shared_strings()
+        return self._shared_strings
+
+    def leading_strings(self, count: int) -> List[str]:
+        """The first count shared strings; the rest of the table is not parsed."""
+        if self._shared_strings is not None:
+            return [self._shared_strings[i] for i in range(count)]
+        strings = []
+        if self._strings_part is not None:
+            with self._archive.open(self._strings_part) as src:
+                strings = read_shared_strings(src, count)
+        if len(strings) < count:
+            raise IndexError("shared string index out of range")
+        return strings
+
+    @property
+    def spilled_strings(self) -> Optional[SpilledStrings]:
+        """The shared strings table if it was spilled, else None."""
+        if isinstance(self.shared_strings, SpilledStrings):
+            return self.shared_strings
+        return None
+
+    def __getitem__(self, sheet_name: str) -> "NativeSheet":
+        if sheet_name not in self._sheet_paths:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+        return NativeSheet(self, self._sheet_paths[sheet_name])
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self._sheet_paths)
+
+    def close(self) -> None:
+        self._archive.close()
+
+
+class NativeSheet:
+    """
+    Rows of one worksheet, read like ReadOnlyWorksheet.iter_rows(values_only=True):
+    missing rows/cells are filled with None and the stored <dimension> bounds
+    the rows and columns read unless reset_dimensions() is called.
+    """
+
+    def __init__(self, parent: NativeWorkbook, worksheet_path: str):
+        self.parent = parent
+        self._worksheet_path = worksheet_path
+        self.max_row = self.max_column = None
+        with self._get_source() as src:
+            dimensions = _read_dimensions(src)
+        if dimensions is not None:
+            _, _, self.max_column, self.max_row = dimensions
+
+    @property
+    def _shared_strings(self):
+        return self.parent.shared_strings
+
+    def _get_source(self):
+        return self.parent._archive.open(self._worksheet_path)
+
+    def reset_dimensions(self) -> None:
+        self.max_row = self.max_column = None
+
+    def iter_rows(
+        self,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        max_col: Optional[int] = None,
+        values_only: bool = True,
+        string_refs: bool = False,
+        columns: Optional[AbstractSet[int]] = None,
+        where: Optional[Tuple[int, Callable[[object], bool]]] = None,
+    ) -> Iterator[tuple]:
+        """
+        string_refs: with a spilled shared strings table, shared string cells
+        come back as SharedStringRef (see SpilledStrings.ref) instead of str.
+        columns: read only these (1-based) columns; the other cells are skipped
+        unparsed (no shared string lookup, number or date conversion) and come
+        back as None.
+        where: (1-based column, predicate). The cell of that column is checked
+        as soon as it is parsed (None if the row has none); a row failing the
+        predicate comes back empty and its remaining cells are not parsed.
+        """
+        if not values_only:
+            raise ValueError("NativeSheet only reads values (values_only=True)")
+        min_row = min_row or 1
+        max_col = max_col or self.max_column
+        max_row = max_row or self.max_row
+        empty_row = (None,) * max_col if max_col is not None else ()
+
+        counter = min_row
+        idx = 1
+        with self._get_source() as src:
+            for idx, cells in self._parse_rows(src, string_refs, columns, where):
+                if max_row is not None and idx > max_row:
+                    break
+                for _ in range(counter, idx):  # missing rows
+                    counter += 1
+                    yield empty_row
+                if counter <= idx:
+                    counter += 1
+                    yield _row_tuple(cells, max_col)
+        if max_row is not None and max_row < idx:
+            for _ in range(counter, max_row + 1):
+                yield empty_row
+
+    def _parse_rows(
+        self,
+        src,
+        string_refs: bool = False,
+        wanted: Optional[AbstractSet[int]] = None,
+        where: Optional[Tuple[int, Callable[[object], bool]]] = None,
+        unresolved_strings: bool = False,
+    ) -> Iterator[Tuple[int, List[Tuple[int, object]]]]:
+        """
+        (row number, [(column, value), ...]) for every <row>, in file order;
+        only cells in the wanted columns, if given, and no cells for rows
+        rejected by where (see iter_rows()). unresolved_strings leaves the
+        shared strings table alone: shared string cells come back as
+        SharedStringRef for the caller to look up.
+        """
+        if unresolved_strings:
+            shared_strings = []
+            string_at = _unresolved_string
+        else:
+            shared_strings = self._shared_strings
+            string_at = (
+                shared_strings.ref
+                if string_refs and isinstance(shared_strings, SpilledStrings)
+                else shared_strings.__getitem__
+            )
+        data_only = self.parent.data_only
+        date_formats = self.parent._date_formats
+        # openpyxl's formula parser keeps shared formulas, array formulas etc. identical
+        formulae = WorkSheetParser(None, shared_strings) if not data_only else None
+        columns: Dict[str, int] = {}
+        where_column, keep = where if where is not None else (None, None)
+
+        row_counter = 0
+        for row in self._iter_row_elements(src):
+            r = row.get("r")
+            row_counter = _row_number(r) if r is not None else row_counter + 1
+
+            cells = []
+            checked = False
+            col_counter = 0
+            for cell in row:
+                coordinate = cell.get("r")
+                if coordinate:
+                    letters = coordinate.rstrip("0123456789")
+                    col_counter = columns.get(letters)
+                    if col_counter is None:
+                        col_counter = columns[letters] = column_index_from_string(
+                            letters
+                        )
+                else:
+                    col_counter += 1
+                if wanted is not None and col_counter not in wanted:
+                    continue
+
+                data_type = cell.get("t", "n")
+                if formulae is not None and cell.find(_FORMULA) is not None:
+                    value = formulae.parse_formula(cell)
+                elif data_type == "inlineStr":
+                    inline = cell.find(_INLINE)
+                    value = text_content(inline) if inline is not None else None
+                else:
+                    value = cell.findtext(_VALUE) or None
+                    if value is not None:
+                        if data_type == "s":
+                            value = string_at(int(value))
+                        elif data_type == "n":
+                            value = _cast_number(value)
+                            if date_formats:
+                                style = cell.get("s", 0)
+                                style = int(style) if style else style
+                                if style in date_formats:
+                                    value = self._date(value, style, coordinate)
+                        elif data_type == "b":
+                            value = bool(int(value))
+                        elif data_type == "d":
+                            value = from_ISO8601(value)
+                if col_counter == where_column:
+                    checked = True
+                    if not keep(value):
+                        cells = None
+                        break
+                cells.append((col_counter, value))
+            if cells is not None and keep is not None and not checked:
+                if not keep(None):
+                    cells = None
+            yield row_counter, cells or []
+
+    def header_row(self) -> tuple:
+        """
+        Row 1 as iter_rows(min_row=1, max_row=1) returns it, parsing nothing
+        past that row. Its shared strings are looked up afterwards, so with
+        load_strings=False the table is only read up to the last one it uses.
+        """
+        with self._get_source() as src:
+            row_num, cells = next(
+                self._parse_rows(src, unresolved_strings=True), (None, [])
+            )
+        if row_num != 1:
+            cells = []
+        indexes = [v.index for _, v in cells if type(v) is SharedStringRef]
+        if indexes:
+            strings = self.parent.leading_strings(max(indexes) + 1)
+            cells = [
+                (c, strings[v.index] if type(v) is SharedStringRef else v)
+                for c, v in cells
+            ]
+        return _row_tuple(cells, self.max_column)
+
+    @staticmethod
+    def _iter_row_elements(src) -> Iterator:
+        """
+        <row> elements in file order. The sheet is cut into blocks of whole rows
+        and each block is built as one tree by the C parser, which costs far
+        less than an iterparse event per element.
+        """
+        for block in split_sheet_xml(src, _ROW_BLOCK_BYTES):
+            sheet_data = fromstring(block).find(_SHEET_DATA)
+            if sheet_data is None:
+                continue
+            for row in sheet_data:
+                if row.tag == _ROW:
+                    yield row
+
+    def _date(self, value, style: int, coordinate: Optional[str]):
+        try:
+            return from_excel(
+                value,
+                self.parent.epoch,
+                timedelta=style in self.parent._timedelta_formats,
+            )
+        except (OverflowError, ValueError):
+            warn(
+                f"Cell {coordinate} is marked as a date but the serial value {value} "
+                "is outside the limits for dates. The cell will be treated as an error."
+            )
+            return "#VALUE!"
+
+
+def _relationships(
+    archive, rels_path: str, base_dir: str
+) -> Dict[str, Tuple[str, str]]:
+    """{relationship id: (type, part path)} of a .rels part (missing part: {})."""
+    try:
+        root = fromstring(archive.read(rels_path))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iter(_REL):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target")
+        if target.startswith("/"):
+            path = target[1:]
+        else:
+            path = posixpath.normpath(posixpath.join(base_dir, target))
+        rels[rel.get("Id")] = (rel.get("Type"), path)
+    return rels
+
+
+def _read_dimensions(src) -> Optional[Tuple[int, int, int, int]]:
+    """The stored <dimension>; stops at <sheetData> instead of reading the rows."""
+    for _, element in iterparse(src, events=("start",)):
+        if element.tag == _DIMENSION:
+            return range_boundaries(element.get("ref"))
+        if element.tag == _SHEET_DATA:
+            return None
+    return None
+
+
+def _unresolved_string(index: int) -> SharedStringRef:
+    return SharedStringRef(index, False)
+
+
+def _row_number(r: str) -> int:
+    try:
+        return int(r)
+    except ValueError:
+        value = float(r)
+        if value.is_integer():
+            return int(value)
+        raise ValueError(f"{r} is not a valid row number")
+
+
+def _row_tuple(cells: List[Tuple[int, object]], max_col: Optional[int]) -> tuple:
+    """ReadOnlyWorksheet._get_row(values_only=True) with min_col=1."""
+    if not cells and not max_col:
+        return ()
+    width = max_col or cells[-1][0]
+    row = [None] * width
+    for column, value in cells:
+        if 1 <= column <= width:
+            row[column - 1] = value
+    return tuple(row)
@@ -0,0 +1,674 @@
+from __future__ import annotations
+import platform
+import posixpath
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import zipfile
+from contextlib import ExitStack
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape, unescape
+
+from loguru import logger
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from config import OUTPUT_DIR
+from app.data_io.xlsx_io import build_output_path
+
+_CHUNK_SIZE = 1 << 20
+
+_RELS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_CALC_CHAIN_TYPE = _RELS_NS + "/calcChain"
+
+# ZipInfo.flag_bits
+_ENCRYPTED_FLAG = 0x01
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+# _copy_member_raw() appends to a ZipFile through its internals; they are
+# checked to exist on these CPython versions, elsewhere members are recompressed
+_RAW_COPY_VERSIONS = ((3, 8), (3, 13))
+_ZIPFILE_INTERNALS = ("fp", "_lock", "start_dir", "_didModify", "_writing")
+
+_ATTR_RE = re.compile(rb'([\w:]+)\s*=\s*"([^"]*)"')
+_CELL_RE = re.compile(rb"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.DOTALL)
+_CELL_REF_RE = re.compile(rb"([A-Z]+)(\d+)")
+_FORMULA_RE = re.compile(rb"<f\b([^>]*?)(?:/>|>(.*?)</f>)", re.DOTALL)
+_DIMENSION_RE = re.compile(rb'<dimension\s+ref="([^"]*)"\s*/>')
+_ILLEGAL_XML_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def patch_tgt_xlsx(
+    tgt_path: str,
+    sheet_name: str,
+    cell_updates: Dict[int, Dict[int, str]],
+    output_dir: str = OUTPUT_DIR,
+) -> str:
+    """
+    Write updated TGT workbook by patching the worksheet XML in place.
+
+    Only the <c> elements listed in cell_updates are rewritten; rows that do not
+    exist yet are created. Every other zip member is copied through untouched, so
+    styles, fills, drawings, etc. are preserved exactly as in the original file.
+
+    Arguments:
+      tgt_path: path of the original TGT workbook
+      sheet_name: worksheet to patch
+      cell_updates: {sheet row: {column index (1-based): new value}}
+      output_dir: directory where output will be saved
+
+    Returns path of the newly saved file.
+    """
+    if not sheet_name:
+        raise ValueError("TGT sheet name must be provided in config.py")
+    return patch_tgt_xlsx_sheets(tgt_path, {sheet_name: cell_updates}, output_dir)
+
+
+def patch_tgt_xlsx_sheets(
+    tgt_path: str,
+    sheet_updates: Dict[str, Dict[int, Dict[int, str]]],
+    output_dir: str = OUTPUT_DIR,
+) -> str:
+    """
+    patch_tgt_xlsx() for several worksheets of one workbook, written in a
+    single pass: sheet_updates maps each worksheet to patch to its
+    {sheet row: {column index: new value}}.
+
+    Returns path of the newly saved file.
+    """
+    out_path = build_output_path(tgt_path, output_dir)
+
+    with zipfile.ZipFile(tgt_path) as zin, ExitStack() as stack:
+        # Patch the sheets first: we need to know whether formulas were
+        # overwritten before deciding what to do with the calculation chain.
+        patched_parts = {}
+        formulas_removed = False
+        for sheet_name, cell_updates in sheet_updates.items():
+            sheet_part = resolve_sheet_part(zin, sheet_name)
+            patched = stack.enter_context(
+                tempfile.SpooledTemporaryFile(max_size=32 * _CHUNK_SIZE)
+            )
+            with zin.open(sheet_part) as src:
+                if _patch_sheet_xml(src, patched, cell_updates):
+                    formulas_removed = True
+            patched_parts[sheet_part] = patched
+        _write_patched_workbook(zin, patched_parts, formulas_removed, out_path)
+
+    return str(out_path)
+
+
+def patch_tgt_xlsx_streaming(
+    tgt_path: str,
+    sheet_name: str,
+    row_updates: Iterable[Tuple[int, Dict[int, str]]],
+    output_dir: str = OUTPUT_DIR,
+) -> Tuple[str, int]:
+    """
+    patch_tgt_xlsx() for updates produced while the patch runs: row_updates
+    yields (sheet row, {column index: new value}) in ascending row order and
+    is consumed in step with the sheet XML, so neither is held in memory.
+    The <dimension> is fixed up once the last update is known.
+
+    If row_updates yields nothing, the original file is copied unchanged.
+    Returns (output path, number of rows updated or added).
+    """
+    if not sheet_name:
+        raise ValueError("TGT sheet name must be provided in config.py")
+
+    out_path = build_output_path(tgt_path, output_dir)
+
+    with zipfile.ZipFile(tgt_path) as zin:
+        sheet_part = resolve_sheet_part(zin, sheet_name)
+        with tempfile.SpooledTemporaryFile(max_size=32 * _CHUNK_SIZE) as patched:
+            with zin.open(sheet_part) as src:
+                formulas_removed, rows_patched = _patch_sheet_xml_streaming(
+                    src, patched, row_updates
+                )
+            if rows_patched:
+                _write_patched_workbook(
+                    zin, {sheet_part: patched}, formulas_removed, out_path
+                )
+    if not rows_patched:
+        shutil.copyfile(tgt_path, out_path)
+    return str(out_path), rows_patched
+
+
+def _write_patched_workbook(
+    zin: zipfile.ZipFile,
+    patched_parts: Dict[str, BinaryIO],
+    formulas_removed: bool,
+    out_path,
+    raw_copy: bool = True,
+) -> None:
+    """
+    Copy the workbook to out_path with each sheet part of patched_parts
+    replaced by its patched XML. Every other part (other sheets, drawings,
+    pivot caches, ...) is copied still compressed, without being inflated or
+    parsed, where _raw_copy_supported(); the copies are then checked against
+    the source, and the workbook is written again with every part
+    recompressed if they do not match.
+    """
+    drop_calc_chain = formulas_removed and "xl/calcChain.xml" in zin.NameToInfo
+    copied: List[zipfile.ZipInfo] = []
+
+    with zipfile.ZipFile(out_path, "w") as zout:
+        raw_copy = raw_copy and _raw_copy_supported(zout)
+        for info in zin.infolist():
+            patched = patched_parts.get(info.filename)
+            if patched is not None:
+                force_zip64 = patched.seek(0, 2) >= zipfile.ZIP64_LIMIT
+                patched.seek(0)
+                with zout.open(_clone_info(info), "w", force_zip64=force_zip64) as dst:
+                    shutil.copyfileobj(patched, dst, _CHUNK_SIZE)
+            elif drop_calc_chain and info.filename == "xl/calcChain.xml":
+                continue
+            elif drop_calc_chain and info.filename in (
+                "[Content_Types].xml",
+                "xl/_rels/workbook.xml.rels",
+            ):
+                zout.writestr(
+                    _clone_info(info),
+                    _strip_calc_chain_refs(zin.read(info.filename)),
+                )
+            elif raw_copy and not info.flag_bits & _ENCRYPTED_FLAG:
+                _copy_member_raw(zin, zout, info)
+                copied.append(info)
+            else:
+                _copy_member(zin, zout, info)
+
+    if copied and not _copies_match(out_path, copied):
+        logger.warning(f"{out_path}: raw zip copy not readable back; recompressing")
+        _write_patched_workbook(
+            zin, patched_parts, formulas_removed, out_path, raw_copy=False
+        )
+
+
+def resolve_sheet_part(zf: zipfile.ZipFile, sheet_name: str) -> str:
+    """
+    Return the zip member name (e.g. 'xl/worksheets/sheet1.xml') of a worksheet.
+    """
+    workbook_xml = zf.read("xl/workbook.xml")
+    rel_id = None
+    for m in re.finditer(rb"<sheet\b([^>]*)/?>", workbook_xml):
+        attrs = _parse_attrs(m.group(1))
+        if _unescape(attrs.get(b"name", b"")) == sheet_name:
+            rel_id = attrs.get(b"r:id")
+            break
+    if rel_id is None:
+        raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+    rels_xml = zf.read("xl/_rels/workbook.xml.rels")
+    for m in re.finditer(rb"<Relationship\b([^>]*)/?>", rels_xml):
+        attrs = _parse_attrs(m.group(1))
+        if attrs.get(b"Id") == rel_id:
+            target = attrs[b"Target"].decode("utf-8")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+
+    raise KeyError(f"Worksheet {sheet_name} has no part in the workbook.")
+
+
+# ---------------------------------------------------------------------------
+# Sheet XML patching
+# ---------------------------------------------------------------------------
+def _patch_sheet_xml(
+    src: BinaryIO, dst: BinaryIO, cell_updates: Dict[int, Dict[int, str]]
+) -> bool:
+    """
+    Stream worksheet XML from src to dst, rewriting only rows in cell_updates.
+    Returns True if at least one formula cell was overwritten.
+    """
+    pending = sorted((r, cols) for r, cols in cell_updates.items() if cols)
+    max_row = pending[-1][0] if pending else 0
+    max_col = max((max(cols) for _, cols in pending), default=0)
+
+    tokens = _iter_sheet_tokens(src)
+    for kind, chunk in tokens:
+        if kind == "head":
+            dst.write(_expand_dimension(chunk, max_row, max_col))
+            break
+        dst.write(chunk)
+    formulas_removed, _, _, _ = _patch_rows(tokens, iter(pending), dst)
+    return formulas_removed
+
+
+def _patch_sheet_xml_streaming(
+    src: BinaryIO, dst: BinaryIO, row_updates: Iterable[Tuple[int, Dict[int, str]]]
+) -> Tuple[bool, int]:
+    """
+    _patch_sheet_xml() for updates in ascending row order that are not known
+    up front. The rows go to a spool first; the head, whose <dimension> depends
+    on the last update, is written once they are done.
+    Returns (formulas overwritten, rows patched).
+    """
+    head = b""
+    tokens = _iter_sheet_tokens(src)
+    for kind, chunk in tokens:
+        head += chunk
+        if kind == "head":
+            break
+    with tempfile.SpooledTemporaryFile(max_size=32 * _CHUNK_SIZE) as body:
+        formulas_removed, rows_patched, max_row, max_col = _patch_rows(
+            tokens, iter(row_updates), body
+        )
+        dst.write(_expand_dimension(head, max_row, max_col))
+        body.seek(0)
+        shutil.copyfileobj(body, dst, _CHUNK_SIZE)
+    return formulas_removed, rows_patched
+
+
+def _patch_rows(
+    tokens: Iterator[Tuple[str, bytes]],
+    updates: Iterator[Tuple[int, Dict[int, str]]],
+    dst: BinaryIO,
+) -> Tuple[bool, int, int, int]:
+    """
+    Copy the row tokens after the head to dst, patching the rows in updates
+    ((sheet row, {column: value}) in ascending row order) and inserting the
+    ones that do not exist yet. Returns (formulas overwritten, rows patched,
+    last row patched, widest column patched).
+    """
+    formulas_removed = False
+    rows_patched = max_row = max_col = 0
+    # shared formulas whose master cell was overwritten: si -> (formula, master ref)
+    orphaned: Dict[bytes, Tuple[str, str]] = {}
+
+    def next_update():
+        nonlocal rows_patched, max_row, max_col
+        for row_num, cols in updates:
+            if cols:
+                rows_patched += 1
+                max_row = max(max_row, row_num)
+                max_col = max(max_col, max(cols))
+                return row_num, cols
+        return None
+
+    update = next_update()
+
+    def flush_new_rows(before: Optional[int]) -> None:
+        nonlocal update
+        while update is not None and (before is None or update[0] < before):
+            dst.write(_build_row(*update))
+            update = next_update()
+
+    last_row = 0
+    for kind, chunk in tokens:
+        if kind == "row":
+            row_num = _row_number(chunk, last_row)
+            last_row = row_num
+            flush_new_rows(row_num)
+            if update is not None and update[0] == row_num:
+                chunk, had_formula = _patch_row(chunk, row_num, update[1], orphaned)
+                formulas_removed = formulas_removed or had_formula
+                update = next_update()
+            elif orphaned and b"si=" in chunk:
+                chunk, _ = _patch_row(chunk, row_num, {}, orphaned)
+            dst.write(chunk)
+        elif kind == "end":
+            flush_new_rows(None)
+            dst.write(chunk)
+        else:
+            dst.write(chunk)
+
+    return formulas_removed, rows_patched, max_row, max_col
+
+
+def _iter_sheet_tokens(src: BinaryIO) -> Iterator[Tuple[str, bytes]]:
+    """
+    Split worksheet XML into tokens without building a DOM:
+      ("head", bytes)  everything up to and including the <sheetData> start tag
+      ("row", bytes)   one complete <row> element
+      ("end", bytes)   the closing </sheetData> tag
+      ("text", bytes)  anything else, copied verbatim
+    An empty <sheetData/> is expanded so that new rows can be inserted.
+    """
+    buf = b""
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, eof
+        if eof:
+            return False
+        data = src.read(_CHUNK_SIZE)
+        if not data:
+            eof = True
+            return False
+        buf += data
+        return True
+
+    # Head: up to the <sheetData> start tag
+    while True:
+        m = re.search(rb"<sheetData\s*(/?)>", buf)
+        if m:
+            break
+        if not fill():
+            yield "text", buf
+            return
+    if m.group(1):
+        yield "head", buf[: m.start()] + b"<sheetData>"
+        buf = b"</sheetData>" + buf[m.end() :]
+    else:
+        yield "head", buf[: m.end()]
+        buf = buf[m.end() :]
+
+    # Body: rows until </sheetData>
+    pos = 0
+    while True:
+        row_start = buf.find(b"<row", pos)
+        end_start = buf.find(
+            b"</sheetData>", pos, len(buf) if row_start == -1 else row_start
+        )
+        if end_start != -1 and (row_start == -1 or end_start < row_start):
+            if end_start > pos:
+                yield "text", buf[pos:end_start]
+            yield "end", b"</sheetData>"
+            pos = end_start + len(b"</sheetData>")
+            break
+        if row_start == -1:
+            # keep a small tail in case a tag is split across chunks
+            keep = max(pos, len(buf) - 16)
+            if keep > pos:
+                yield "text", buf[pos:keep]
+            buf, pos = buf[keep:], 0
+            if not fill():
+                raise ValueError("Malformed worksheet XML: missing </sheetData>.")
+            continue
+
+        tag_end = buf.find(b">", row_start)
+        while tag_end == -1:
+            if not fill():
+                raise ValueError("Malformed worksheet XML: unterminated <row>.")
+            tag_end = buf.find(b">", row_start)
+        if buf[tag_end - 1 : tag_end] == b"/":
+            row_end = tag_end + 1
+        else:
+            close = buf.find(b"</row>", tag_end)
+            while close == -1:
+                if not fill():
+                    raise ValueError("Malformed worksheet XML: missing </row>.")
+                close = buf.find(b"</row>", tag_end)
+            row_end = close + len(b"</row>")
+
+        if row_start > pos:
+            yield "text", buf[pos:row_start]
+        yield "row", buf[row_start:row_end]
+        pos = row_end
+
+        # drop consumed bytes now and then so the buffer stays small
+        if pos > _CHUNK_SIZE:
+            buf, pos = buf[pos:], 0
+
+    # Tail: everything after </sheetData>
+    yield "text", buf[pos:]
+    buf = b""
+    while fill():
+        yield "text", buf
+        buf = b""
+
+
+def _row_number(row_xml: bytes, last_row: int) -> int:
+    """Return the row number of a <row> element (the r attribute is optional)."""
+    m = re.match(rb"<row\b([^>]*?)/?>", row_xml)
+    attrs = _parse_attrs(m.group(1)) if m else {}
+    if b"r" in attrs:
+        return int(attrs[b"r"])
+    return last_row + 1
+
+
+def _patch_row(
+    row_xml: bytes,
+    row_num: int,
+    updates: Dict[int, str],
+    orphaned: Optional[Dict[bytes, Tuple[str, str]]] = None,
+) -> Tuple[bytes, bool]:
+    """
+    Rewrite the cells of one existing <row> element.
+    Cells not listed in updates are kept byte for byte, except the dependents
+    of a shared formula whose master cell was overwritten: orphaned (si ->
+    (formula, master ref)) collects those masters, in this row and the ones
+    before it, and each dependent gets its own formula, so no cell refers to
+    a master that is gone.
+    """
+    if orphaned is None:
+        orphaned = {}
+    m = re.match(rb"<row\b([^>]*?)(/?)>", row_xml)
+    row_attrs = _parse_attrs(m.group(1))
+    body = b"" if m.group(2) else row_xml[m.end() : -len(b"</row>")]
+
+    # Cells inherit the row style when the row is explicitly formatted
+    default_style = (
+        row_attrs.get(b"s")
+        if row_attrs.get(b"customFormat") in (b"1", b"true")
+        else None
+    )
+
+    cells: List[Tuple[int, bytes]] = []
+    had_formula = False
+    col = 0
+    for cm in _CELL_RE.finditer(body):
+        attrs = _parse_attrs(cm.group(1))
+        ref = attrs.get(b"r")
+        if ref:
+            ref_m = _CELL_REF_RE.match(ref)
+            col = column_index_from_string(ref_m.group(1).decode("ascii"))
+        else:
+            col += 1
+        inner = cm.group(2) or b""
+        if col in updates:
+            if b"<f" in inner:
+                had_formula = True
+                _record_shared_master(inner, row_num, col, orphaned)
+            cells.append(
+                (col, _build_cell(row_num, col, updates[col], attrs.get(b"s")))
+            )
+        elif orphaned and b"<f" in inner:
+            cells.append((col, _detach_shared_formula(cm, row_num, col, orphaned)))
+        else:
+            cells.append((col, cm.group(0)))
+
+    existing = {c for c, _ in cells}
+    for col, value in updates.items():
+        if col not in existing:
+            cells.append((col, _build_cell(row_num, col, value, default_style)))
+    cells.sort(key=lambda item: item[0])
+
+    # "spans" is only an optimisation hint; drop it as the cells may have moved
+    open_tag = b"<row" + re.sub(rb'\s+spans="[^"]*"', b"", m.group(1)) + b">"
+    return open_tag + b"".join(c for _, c in cells) + b"</row>", had_formula
+
+
+def _record_shared_master(
+    inner: bytes, row_num: int, col: int, orphaned: Dict[bytes, Tuple[str, str]]
+) -> None:
+    """Add the shared formula of an overwritten cell to orphaned if it is its master."""
+    fm = _FORMULA_RE.search(inner)
+    attrs = _parse_attrs(fm.group(1))
+    if attrs.get(b"t") == b"shared" and b"si" in attrs and fm.group(2):
+        origin = f"{get_column_letter(col)}{row_num}"
+        orphaned[attrs[b"si"]] = (_unescape(fm.group(2)), origin)
+
+
+def _detach_shared_formula(
+    cell_match, row_num: int, col: int, orphaned: Dict[bytes, Tuple[str, str]]
+) -> bytes:
+    """
+    The <c> element of cell_match, with its formula written out in full if it
+    is a dependent of an orphaned shared formula (otherwise unchanged).
+    """
+    cell_xml = cell_match.group(0)
+    inner = cell_match.group(2) or b""
+    fm = _FORMULA_RE.search(inner)
+    attrs = _parse_attrs(fm.group(1))
+    if attrs.get(b"t") != b"shared" or fm.group(2) or attrs.get(b"si") not in orphaned:
+        return cell_xml
+    formula, origin = orphaned[attrs[b"si"]]
+    translated = Translator("=" + formula, origin=origin).translate_formula(
+        f"{get_column_letter(col)}{row_num}"
+    )
+    own = b"<f>" + escape(translated[1:]).encode("utf-8") + b"</f>"
+    start = cell_match.start(2) + fm.start() - cell_match.start()
+    end = cell_match.start(2) + fm.end() - cell_match.start()
+    return cell_xml[:start] + own + cell_xml[end:]
+
+
+def _build_row(row_num: int, updates: Dict[int, str]) -> bytes:
+    cells = b"".join(
+        _build_cell(row_num, col, updates[col], None) for col in sorted(updates)
+    )
+    return b'<row r="%d">' % row_num + cells + b"</row>"
+
+
+def _build_cell(row_num: int, col: int, value: str, style: Optional[bytes]) -> bytes:
+    """
+    Build a <c> element holding an inline string, so sharedStrings.xml stays untouched.
+    """
+    ref = f"{get_column_letter(col)}{row_num}".encode("ascii")
+    style_attr = b' s="' + style + b'"' if style else b""
+    value = "" if value is None else str(value)
+    if value == "":
+        return b'<c r="' + ref + b'"' + style_attr + b"/>"
+
+    text = escape(_ILLEGAL_XML_CHARS_RE.sub("", value)).encode("utf-8")
+    space = b' xml:space="preserve"' if value != value.strip() else b""
+    return (
+        b'<c r="'
+        + ref
+        + b'"'
+        + style_attr
+        + b' t="inlineStr"><is><t'
+        + space
+        + b">"
+        + text
+        + b"</t></is></c>"
+    )
+
+
+def _expand_dimension(head: bytes, max_row: int, max_col: int) -> bytes:
+    """Grow <dimension ref="A1:X99"/> so it covers the patched cells."""
+    m = _DIMENSION_RE.search(head)
+    if not m or not max_row:
+        return head
+
+    refs = m.group(1).split(b":")
+    last = _CELL_REF_RE.match(refs[-1])
+    if not last:
+        return head
+    last_col = max(column_index_from_string(last.group(1).decode("ascii")), max_col)
+    last_row = max(int(last.group(2)), max_row)
+    new_ref = (
+        refs[0] + b":" + f"{get_column_letter(last_col)}{last_row}".encode("ascii")
+    )
+    return head[: m.start(1)] + new_ref + head[m.end(1) :]
+
+
+# ---------------------------------------------------------------------------
+# Zip helpers
+# ---------------------------------------------------------------------------
+def _clone_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    clone = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    clone.compress_type = info.compress_type
+    clone.external_attr = info.external_attr
+    clone.create_system = info.create_system
+    return clone
+
+
+def _raw_copy_supported(zout: zipfile.ZipFile) -> bool:
+    """True where _copy_member_raw() can append to zout (see _RAW_COPY_VERSIONS)."""
+    low, high = _RAW_COPY_VERSIONS
+    return (
+        platform.python_implementation() == "CPython"
+        and low <= sys.version_info[:2] <= high
+        and all(hasattr(zout, name) for name in _ZIPFILE_INTERNALS)
+    )
+
+
+def _copy_member(
+    zin: zipfile.ZipFile, zout: zipfile.ZipFile, info: zipfile.ZipInfo
+) -> None:
+    """Copy a zip member by decompressing and recompressing it."""
+    with zin.open(info) as src, zout.open(_clone_info(info), "w") as dst:
+        shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+
+
+def _copy_member_raw(
+    zin: zipfile.ZipFile, zout: zipfile.ZipFile, info: zipfile.ZipInfo
+) -> None:
+    """
+    Copy a zip member's compressed bytes as they are: only its local header is
+    rewritten. zipfile has no public API for this, so the member is appended to
+    zout the way ZipFile.write() does (only where _raw_copy_supported()).
+    """
+    if zout._writing:
+        raise ValueError("Cannot copy a member while another one is being written")
+    zin.fp.seek(info.header_offset)
+    header = zin.fp.read(zipfile.sizeFileHeader)
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    zin.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+
+    clone = _clone_info(info)
+    clone.flag_bits = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG
+    clone.CRC = info.CRC
+    clone.compress_size = info.compress_size
+    clone.file_size = info.file_size
+    with zout._lock:
+        clone.header_offset = zout.fp.tell()
+        zout.fp.write(clone.FileHeader())
+        remaining = info.compress_size
+        while remaining:
+            chunk = zin.fp.read(min(remaining, _CHUNK_SIZE))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+            zout.fp.write(chunk)
+            remaining -= len(chunk)
+        zout.filelist.append(clone)
+        zout.NameToInfo[clone.filename] = clone
+        zout.start_dir = zout.fp.tell()
+        zout._didModify = True
+
+
+def _copies_match(out_path, copied: List[zipfile.ZipInfo]) -> bool:
+    """
+    True if out_path is a readable zip whose raw-copied members have the
+    source's CRC and sizes and a valid local header (no data is decompressed).
+    """
+    try:
+        with zipfile.ZipFile(out_path) as zf:
+            for info in copied:
+                out = zf.getinfo(info.filename)
+                if (out.CRC, out.compress_size, out.file_size) != (
+                    info.CRC,
+                    info.compress_size,
+                    info.file_size,
+                ):
+                    return False
+                with zf.open(out):  # checks the local header
+                    pass
+    except (zipfile.BadZipFile, KeyError, OSError):
+        return False
+    return True
+
+
+def _strip_calc_chain_refs(xml: bytes) -> bytes:
+    """
+    Remove calcChain references from [Content_Types].xml or workbook.xml.rels.
+    Excel rebuilds the chain on open; a stale one is reported as corruption.
+    """
+    xml = re.sub(rb'<Override\b[^>]*PartName="/xl/calcChain.xml"[^>]*/>', b"", xml)
+    return re.sub(
+        rb'<Relationship\b[^>]*Type="'
+        + re.escape(_CALC_CHAIN_TYPE.encode())
+        + rb'"[^>]*/>',
+        b"",
+        xml,
+    )
+
+
+def _parse_attrs(raw: bytes) -> Dict[bytes, bytes]:
+    return {k: v for k, v in _ATTR_RE.findall(raw)}
+
+
+def _unescape(raw: bytes) -> str:
+    return unescape(raw.decode("utf-8"), {"&quot;": '"', "&apos;": "'"})
@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+
+class CellChange(NamedTuple):
+    """A single TGT cell overwritten by the sync."""
+
+    record_id: str
+    row: int  # sheet row number
+    column: int  # sheet column index (1-based)
+    old_value: str
+    new_value: str
+
+
+@dataclass
+class AppendedRow:
+    """A SOT record missing from TGT, written below the last TGT row."""
+
+    record_id: str
+    row: int
+    values: Dict[int, str]  # sheet column index (1-based) -> value
+
+
+@dataclass
+class ChangeSet:
+    """
+    Explicit result of a SOT → TGT sync: what changes, and where in the sheet.
+    Writers only touch the cells listed here, so write cost scales with the delta.
+
+    Old values are recorded at the moment they are replaced, so the TGT rows are
+    never mutated and no snapshot of the dataset is needed for reporting.
+    """
+
+    headers: List[str]  # TGT header row; headers[i] is sheet column i + 1
+    cell_changes: List[CellChange] = field(default_factory=list)
+    appended_rows: List[AppendedRow] = field(default_factory=list)
+    # original (unmodified) TGT row of every updated sheet row — references, not copies
+    tgt_rows: Dict[int, Dict[str, str]] = field(default_factory=dict)
+    # SOT/TGT cell pairs actually compared (fingerprint-matched records are not)
+    cells_compared: int = 0
+
+    def is_empty(self) -> bool:
+        return not self.cell_changes and not self.appended_rows
+
+    def column_name(self, column: int) -> str:
+        return self.headers[column - 1]
+
+    def updated_records(self) -> Iterator[Tuple[str, int, List[CellChange]]]:
+        """Yield (record_id, sheet row, changes) per updated record, in sync order."""
+        by_row: Dict[int, List[CellChange]] = {}
+        for change in self.cell_changes:
+            by_row.setdefault(change.row, []).append(change)
+        for row, changes in by_row.items():
+            yield changes[0].record_id, row, changes
+
+    def cell_updates(self) -> Dict[int, Dict[int, str]]:
+        """Return {sheet row: {column index: new value}} for the writers."""
+        updates: Dict[int, Dict[int, str]] = {}
+        for change in self.cell_changes:
+            updates.setdefault(change.row, {})[change.column] = change.new_value
+        for appended in self.appended_rows:
+            updates.setdefault(appended.row, {}).update(appended.values)
+        return updates
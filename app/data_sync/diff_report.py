@@ -1,6 +1,17 @@
 import os
-from typing import List, Dict, Optional
-from config import OUTPUT_DIR, LOG_PATH, UNIQUE_ID_PREFIX
+import sys
+import tempfile
+from typing import List, Dict, Iterable, Optional
+from config import OUTPUT_DIR, LOG_PATH
+
+from app.data_io.fingerprint import fingerprints_of
+from app.data_io.table import project
+from app.data_sync.change_set import ChangeSet
+from app.data_sync.mapping_plan import normalize_value
+from app.data_sync.orphan_detection import write_orphan_section
+from app.data_sync.row_filter import RowFilter, compile_row_filter
+
+SENTINEL_TEXT = "Record Should Not be Touched"
 
 
 def generate_diff_report(
@@ -11,6 +22,7 @@ def generate_diff_report(
     column_mapping: Dict[str, str],
     output_dir: str = OUTPUT_DIR,
     valid_ids: Optional[set] = None,
+    row_filter: Optional[RowFilter] = None,
 ) -> str:
     """
     Generate a human-readable text diff report comparing OLD vs NEW dataset
@@ -20,6 +32,7 @@ def generate_diff_report(
     - Skips any record containing the text 'Record Should Not be Touched'
     - Shows only real field-level differences in mapped columns
     - Detects and logs new records (ADDED)
+    - Reuses read-time row fingerprints (Tables) to skip unchanged records
 
     Args:
         old_rows: original dataset (TGT before sync)
@@ -28,58 +41,64 @@ def generate_diff_report(
         column_mapping: mapping of columns to compare
         output_dir: directory where the .log file should be written
         valid_ids: optional set of IDs known from SOT (to ignore others)
+        row_filter: the run's RowFilter (default: compiled from config); only
+            records whose ID has the required prefix are reported
 
     Returns:
         Path to the generated diff log file
     """
-    new_index = {r.get(unique_id_col): r for r in new_rows if r.get(unique_id_col)}
-
-    log_path = LOG_PATH.format(timestamp=timestamp)
-    os.makedirs(output_dir, exist_ok=True)
+    row_filter = row_filter or compile_row_filter()
+    tgt_columns = list(column_mapping.values())
+    # (id, *mapped values) tuples; whole columns are read from a Table
+    old_values = list(project(old_rows, [unique_id_col, *tgt_columns]))
+    new_values = list(project(new_rows, [unique_id_col, *tgt_columns]))
+    new_index = {values[0]: j for j, values in enumerate(new_values) if values[0]}
+    old_fp = fingerprints_of(old_rows, tgt_columns)
+    new_fp = fingerprints_of(new_rows, tgt_columns)
+    if old_fp is None or new_fp is None:
+        old_fp = new_fp = None
 
     lines = []
 
     # === UPDATED RECORDS ===
-    for old in old_rows:
-        record_id = old.get(unique_id_col)
+    for i, old in enumerate(old_values):
+        record_id = old[0]
         if not record_id:
             continue
 
-        if not record_id.startswith(UNIQUE_ID_PREFIX):
+        if not row_filter.keeps_id(record_id):
             continue
 
         if valid_ids and record_id not in valid_ids:
             continue
 
-        new = new_index.get(record_id)
-        if not new:
+        j = new_index.get(record_id)
+        if j is None:
             continue  # skip deletions (sync never deletes)
+        if old_fp is not None and old_fp[i] == new_fp[j]:
+            continue  # same fingerprint: no field-level differences
 
         # skip sentinel/safeguard records
-        if "Record Should Not be Touched" in str(new.values()):
+        if is_sentinel(new_rows[j].values()):
             continue
 
+        # Compare TGT→TGT (old vs new) using TGT columns only
         diffs = []
-        for col_old, col_new in column_mapping.items():
-            # Compare TGT→TGT (old vs new) using TGT column names only
-            old_val = str(old.get(col_new, "") or "").strip()
-            new_val = str(new.get(col_new, "") or "").strip()
+        for col, old_v, new_v in zip(tgt_columns, old[1:], new_values[j][1:]):
+            old_val = normalize_value(old_v)
+            new_val = normalize_value(new_v)
             if old_val != new_val:
-                diffs.append((col_new, old_val, new_val))
+                diffs.append((col, old_val, new_val))
 
         if diffs:
-            lines.append(f"[UPDATED] {record_id}")
-            for col, old_v, new_v in diffs:
-                lines.append(f"    {col}: '{old_v}' → '{new_v}'")
-            lines.append("")
+            lines.extend(_updated_lines(record_id, diffs))
 
     # === NEW RECORDS ===
-    old_ids = {r.get(unique_id_col) for r in old_rows if r.get(unique_id_col)}
-    for new in new_rows:
-        rec_id = new.get(unique_id_col)
+    old_ids = {values[0] for values in old_values if values[0]}
+    for new, (rec_id, *_) in zip(new_rows, new_values):
         if not rec_id:
             continue
-        if not rec_id.startswith(UNIQUE_ID_PREFIX):
+        if not row_filter.keeps_id(rec_id):
             continue
         if valid_ids and rec_id not in valid_ids:
             continue
@@ -87,15 +106,185 @@ def generate_diff_report(
             continue
 
         # skip sentinel/safeguard records
-        if "Record Should Not be Touched" in str(new.values()):
+        if is_sentinel(new.values()):
             continue
 
-        lines.append(f"[ADDED] {rec_id}")
-        for c in column_mapping.values():
-            val = str(new.get(c, "") or "").strip()
-            if val:
-                lines.append(f"    {c}: '{val}'")
-        lines.append("")
+        lines.extend(_added_lines(rec_id, new, column_mapping))
+
+    return _write_report(timestamp, lines, output_dir)
+
+
+def generate_diff_report_from_change_set(
+    timestamp: str,
+    change_set: ChangeSet,
+    column_mapping: Dict[str, str],
+    output_dir: str = OUTPUT_DIR,
+    valid_ids: Optional[set] = None,
+    log_path: Optional[str] = None,
+    row_filter: Optional[RowFilter] = None,
+) -> str:
+    """
+    Generate the same report as generate_diff_report(), straight from the
+    ChangeSet produced by sync_sot_to_tgt(). Old values were recorded by the
+    engine, so no before/after snapshot of TGT is needed or compared again.
+    log_path overrides config.LOG_PATH (one report per target in batch syncs).
+    valid_ids and row_filter work as in generate_diff_report().
+
+    Returns:
+        Path to the generated diff log file
+    """
+    row_filter = row_filter or compile_row_filter()
+    lines = []
+
+    def keep(record_id: str) -> bool:
+        if not row_filter.keeps_id(record_id):
+            return False
+        return not (valid_ids and record_id not in valid_ids)
+
+    # === UPDATED RECORDS === (TGT row order, as in generate_diff_report())
+    updated = sorted(change_set.updated_records(), key=lambda record: record[1])
+    for record_id, row, changes in updated:
+        if not keep(record_id):
+            continue
+
+        # skip sentinel/safeguard records (old row plus the values written into it)
+        original = change_set.tgt_rows.get(row, {})
+        if is_sentinel(original.values()) or is_sentinel(c.new_value for c in changes):
+            continue
+
+        diffs = [
+            (change_set.column_name(c.column), c.old_value, c.new_value)
+            for c in changes
+        ]
+        lines.extend(_updated_lines(record_id, diffs))
+
+    # === NEW RECORDS ===
+    for appended in change_set.appended_rows:
+        if not keep(appended.record_id):
+            continue
+        if is_sentinel(appended.values.values()):
+            continue
+
+        new = {change_set.column_name(c): v for c, v in appended.values.items()}
+        lines.extend(_added_lines(appended.record_id, new, column_mapping))
+
+    return _write_report(timestamp, lines, output_dir, log_path)
+
+
+class DiffReportWriter:
+    """
+    Streaming counterpart of generate_diff_report_from_change_set() plus the
+    orphan section of generate_orphan_report_to_log(), for syncs that find
+    changes while the sheets are still being read.
+
+    Report lines are written to spool files as they come (updated records
+    first, then added ones, then orphans), not held in a list; close() writes
+    the log, so a run that fails part-way leaves no report behind. valid_ids
+    and row_filter work as in generate_diff_report().
+    """
+
+    def __init__(
+        self,
+        timestamp: str,
+        column_mapping: Dict[str, str],
+        output_dir: str = OUTPUT_DIR,
+        valid_ids: Optional[set] = None,
+        log_path: Optional[str] = None,
+        row_filter: Optional[RowFilter] = None,
+    ):
+        self.column_mapping = column_mapping
+        self.output_dir = output_dir
+        self.valid_ids = valid_ids
+        self.row_filter = row_filter or compile_row_filter()
+        self.log_path = log_path or LOG_PATH.format(timestamp=timestamp)
+        self.orphans_found = 0
+        self._lines = tempfile.SpooledTemporaryFile(mode="w+", encoding="utf-8")
+        self._orphans = tempfile.SpooledTemporaryFile(mode="w+", encoding="utf-8")
+        self._empty = True
+
+    def _keep(self, record_id: str) -> bool:
+        if not self.row_filter.keeps_id(record_id):
+            return False
+        return not (self.valid_ids and record_id not in self.valid_ids)
+
+    def _write(self, lines: List[str]) -> None:
+        for line in lines:
+            if not self._empty:
+                self._lines.write("\n")
+            self._lines.write(line)
+            self._empty = False
+
+    def updated(self, record_id: str, diffs: List[tuple], tgt_values: Iterable) -> None:
+        """diffs: (TGT column, old, new) per changed cell; tgt_values: the
+        record's original TGT values (checked for the sentinel text)."""
+        if not self._keep(record_id):
+            return
+        if is_sentinel(tgt_values) or is_sentinel(new for _, _, new in diffs):
+            return
+        self._write(_updated_lines(record_id, diffs))
+
+    def added(self, record_id: str, new: Dict[str, str]) -> None:
+        """new: the appended record's values by TGT column name."""
+        if not self._keep(record_id) or is_sentinel(new.values()):
+            return
+        self._write(_added_lines(record_id, new, self.column_mapping))
+
+    def orphan(self, record_id: str) -> None:
+        self._orphans.write(record_id + "\n")
+        self.orphans_found += 1
+
+    def close(self) -> str:
+        """Write the log (config.LOG_PATH unless log_path was given); return its path."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self._empty:
+            self._write(["No differences found."])
+        with (
+            self._lines,
+            self._orphans,
+            open(self.log_path, "w", encoding="utf-8") as f,
+        ):
+            print(f"\n===== SYNC DIFF REPORT =====\n")
+            self._lines.seek(0)
+            for chunk in iter(lambda: self._lines.read(1 << 16), ""):
+                f.write(chunk)
+                sys.stdout.write(chunk)
+            print(f"\n\n✅ Diff report saved to: {self.log_path}\n")
+            if self.orphans_found:
+                self._orphans.seek(0)
+                write_orphan_section(f, (line.rstrip("\n") for line in self._orphans))
+        return self.log_path
+
+
+def is_sentinel(values: Iterable) -> bool:
+    """True if any value holds the 'Record Should Not be Touched' marker."""
+    return any(SENTINEL_TEXT in str(v) for v in values if v)
+
+
+def _updated_lines(record_id: str, diffs: List[tuple]) -> List[str]:
+    lines = [f"[UPDATED] {record_id}"]
+    for col, old_v, new_v in diffs:
+        lines.append(f"    {col}: '{old_v}' → '{new_v}'")
+    lines.append("")
+    return lines
+
+
+def _added_lines(
+    record_id: str, new: Dict[str, str], column_mapping: Dict[str, str]
+) -> List[str]:
+    lines = [f"[ADDED] {record_id}"]
+    for c in column_mapping.values():
+        val = str(new.get(c, "") or "").strip()
+        if val:
+            lines.append(f"    {c}: '{val}'")
+    lines.append("")
+    return lines
+
+
+def _write_report(
+    timestamp: str, lines: List[str], output_dir: str, log_path: Optional[str] = None
+) -> str:
+    log_path = log_path or LOG_PATH.format(timestamp=timestamp)
+    os.makedirs(output_dir, exist_ok=True)
 
     # === NO CHANGES CASE ===
     if not lines:
@@ -125,9 +314,9 @@ def test_diff_report_skips_non_sot_records_in_updated(tmp_path, monkeypatch):
     )
 
     # IMPORTANT:
-    # Patch UNIQUE_ID_PREFIX *inside diff_report module*, not the config module.
+    # Patch UNIQUE_ID_PREFIX *inside row_filter module*, not the config module.
     monkeypatch.setattr(
-        "app.data_sync.diff_report.UNIQUE_ID_PREFIX",
+        "app.data_sync.row_filter.UNIQUE_ID_PREFIX",
         "TEST-",
     )
 
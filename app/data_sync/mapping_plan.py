@@ -0,0 +1,177 @@
+"""
+The SOT → TGT column mapping of a run, compiled once against both header rows.
+
+A MappingPlan resolves every mapped column to its position in the data rows
+(the tuples the readers yield) and to its TGT sheet column, so the sync stages
+pick values by index instead of looking column names up row by row. It is also
+where a mapping is checked against the sheets: mapping_errors() lists every
+mapped or ID column that a header row lacks.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def normalize_value(value: Any) -> str:
+    """Comparison form of a cell value: text, surrounding whitespace removed."""
+    return str(value or "").strip()
+
+
+@dataclass(frozen=True)
+class MappingPlan:
+    """
+    Column positions of one mapping against one SOT and one TGT header row.
+
+    sot_positions/tgt_positions index the data row values, which hold the named
+    (or projected) columns in header order, as the readers and
+    Table.row_values() give them; tgt_columns are the 1-based TGT sheet
+    columns the writers update. All are in column_mapping order, as are
+    normalizers (the comparison form of each mapped column). Build plans with
+    compile_mapping().
+    """
+
+    column_mapping: Dict[str, str]
+    unique_id_sot: str
+    unique_id_tgt: str
+    sot_headers: Tuple[str, ...]
+    tgt_headers: Tuple[str, ...]
+    tgt_row_columns: Tuple[str, ...]
+    sot_names: Tuple[str, ...]
+    tgt_names: Tuple[str, ...]
+    sot_id_position: int
+    sot_positions: Tuple[int, ...]
+    tgt_id_position: int
+    tgt_positions: Tuple[int, ...]
+    tgt_id_column: int
+    tgt_columns: Tuple[int, ...]
+    normalizers: Tuple[Callable[[Any], str], ...]
+
+    def __len__(self) -> int:
+        return len(self.column_mapping)
+
+    def sot_values(self, values: Sequence) -> tuple:
+        """The mapped values of a SOT data row, in mapping order."""
+        return tuple(values[p] for p in self.sot_positions)
+
+    def tgt_values(self, values: Sequence) -> tuple:
+        """The mapped values of a TGT data row (named columns), in mapping order."""
+        return tuple(values[p] for p in self.tgt_positions)
+
+    def compare(
+        self, sot_values: Sequence, tgt_values: Sequence
+    ) -> List[Tuple[int, str, str]]:
+        """(mapped column, old TGT value, new SOT value) for every cell that differs."""
+        diffs = []
+        for c, (normalize, sot_v, tgt_v) in enumerate(
+            zip(self.normalizers, sot_values, tgt_values)
+        ):
+            sot_val = normalize(sot_v)
+            tgt_val = normalize(tgt_v)
+            if sot_val != tgt_val:
+                diffs.append((c, tgt_val, sot_val))
+        return diffs
+
+    def new_row(self, record_id: str, sot_values: Sequence) -> Dict[int, str]:
+        """{TGT sheet column: value} of a SOT record appended to TGT."""
+        new_values = {self.tgt_id_column: record_id}
+        for col_idx, sot_v in zip(self.tgt_columns, sot_values):
+            if sot_v:
+                new_values[col_idx] = sot_v
+        return new_values
+
+    def tgt_column_name(self, col_idx: int) -> str:
+        return self.tgt_headers[col_idx - 1]
+
+    def unmapped_sot_columns(self) -> List[str]:
+        """SOT columns that are neither mapped nor the unique ID, sorted."""
+        used = set(self.column_mapping) | {self.unique_id_sot}
+        return sorted(set(self.sot_headers) - used)
+
+
+def compile_mapping(
+    column_mapping: Dict[str, str],
+    unique_id_sot: str,
+    unique_id_tgt: str,
+    sot_headers: Sequence[str],
+    tgt_headers: Sequence[str],
+    sot_row_columns: Optional[Sequence[str]] = None,
+    tgt_row_columns: Optional[Sequence[str]] = None,
+) -> MappingPlan:
+    """
+    Compile column_mapping against the SOT header row (named columns) and the
+    full TGT header row (column i + 1 is tgt_headers[i]; blank cells allowed).
+    Raises ValueError listing every missing column.
+
+    sot_row_columns/tgt_row_columns are the columns the data rows hold, when
+    the rows were read with a column projection (see projected_columns());
+    by default every named header, in order.
+    """
+    if sot_row_columns is None:
+        sot_row_columns = sot_headers
+    if tgt_row_columns is None:
+        tgt_row_columns = [h for h in tgt_headers if h]
+    errors = mapping_errors(
+        column_mapping,
+        sot_row_columns,
+        tgt_row_columns,
+        unique_id_sot=unique_id_sot,
+        unique_id_tgt=unique_id_tgt,
+    )
+    if errors:
+        raise ValueError(
+            "Column mapping does not match the sheets:\n"
+            + "\n".join(f"- {error}" for error in errors)
+        )
+
+    sot_position = {h: i for i, h in enumerate(sot_row_columns)}
+    tgt_position = {h: i for i, h in enumerate(tgt_row_columns)}
+    tgt_column = {h: i + 1 for i, h in enumerate(tgt_headers) if h}
+    return MappingPlan(
+        column_mapping=dict(column_mapping),
+        unique_id_sot=unique_id_sot,
+        unique_id_tgt=unique_id_tgt,
+        sot_headers=tuple(sot_headers),
+        tgt_headers=tuple(tgt_headers),
+        tgt_row_columns=tuple(tgt_row_columns),
+        sot_names=tuple(column_mapping.keys()),
+        tgt_names=tuple(column_mapping.values()),
+        sot_id_position=sot_position[unique_id_sot],
+        sot_positions=tuple(sot_position[c] for c in column_mapping),
+        tgt_id_position=tgt_position[unique_id_tgt],
+        tgt_positions=tuple(tgt_position[c] for c in column_mapping.values()),
+        tgt_id_column=tgt_column[unique_id_tgt],
+        tgt_columns=tuple(tgt_column[c] for c in column_mapping.values()),
+        normalizers=tuple(normalize_value for _ in column_mapping),
+    )
+
+
+def sot_projection(column_mapping: Dict[str, str], unique_id_sot: str) -> List[str]:
+    """The SOT columns a sync reads: the unique ID and the mapped columns."""
+    return list(dict.fromkeys([unique_id_sot, *column_mapping]))
+
+
+def mapping_errors(
+    column_mapping: Dict[str, str],
+    sot_headers: Sequence[str],
+    tgt_headers: Sequence[str],
+    unique_id_sot: Optional[str] = None,
+    unique_id_tgt: Optional[str] = None,
+) -> List[str]:
+    """Every mapped (and, if given, unique ID) column missing from its header row."""
+    sot_columns = set(sot_headers)
+    tgt_columns = {h for h in tgt_headers if h}
+    errors = []
+    for sot_col, tgt_col in column_mapping.items():
+        if sot_col not in sot_columns:
+            errors.append(f"SOT column '{sot_col}' not found in SOT headers.")
+        if tgt_col not in tgt_columns:
+            errors.append(f"TGT column '{tgt_col}' not found in TGT headers.")
+    for label, col, columns in (
+        ("SOT", unique_id_sot, sot_columns),
+        ("TGT", unique_id_tgt, tgt_columns),
+    ):
+        if col is not None and col not in columns:
+            errors.append(
+                f"{label} unique ID column '{col}' not found in {label} headers."
+            )
+    return errors
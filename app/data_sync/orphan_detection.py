@@ -1,28 +1,33 @@
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 
-from config import LOG_PATH, ORPHANS_DETECTION_IGNORE_STATUS, UNIQUE_ID_PREFIX
+from config import LOG_PATH
+from app.data_io.table import project
+from app.data_sync.row_filter import RowFilter, compile_row_filter
 
 
 def find_orphaned_records(
     tgt_rows: List[Dict[str, str]],
     sot_ids: set,
     unique_id_col: str,
+    row_filter: Optional[RowFilter] = None,
 ) -> List[Dict[str, str]]:
     """
     Return TGT rows whose unique IDs do NOT exist in SOT.
     These rows are never updated by sync_engine and are effectively orphaned.
+    row_filter (default: compiled from config) leaves out the records that are
+    never orphans (see should_ignore_orphan()).
     """
+    row_filter = row_filter or compile_row_filter()
     orphans = []
-    for row in tgt_rows:
-        rec_id = row.get(unique_id_col)
-        if not rec_id:
+    for i, (rec_id,) in enumerate(project(tgt_rows, [unique_id_col])):
+        if not rec_id or rec_id in sot_ids:
             continue
 
-        if _should_ignore_orphan(row, unique_id_col):
+        row = tgt_rows[i]
+        if should_ignore_orphan(row, unique_id_col, row_filter):
             continue
 
-        if rec_id not in sot_ids:
-            orphans.append(row)
+        orphans.append(row)
     return orphans
 
 
@@ -33,41 +38,57 @@ def generate_orphan_report_to_log(
     unique_id_sot: str,
     unique_id_tgt: str,
     column_mapping: Dict[str, str],
-) -> None:
+    log_path: Optional[str] = None,
+    sot_ids: Optional[set] = None,
+    row_filter: Optional[RowFilter] = None,
+) -> int:
     """
     Append orphaned record details to the SAME diff log created by generate_diff_report().
-    Uses config.LOG_PATH and shared timestamp.
+    Uses config.LOG_PATH and shared timestamp, unless log_path is given.
+    sot_ids: the SOT ID set, if already built (batch syncs build it once for all targets).
+    row_filter: the run's RowFilter (default: compiled from config).
+    Returns the number of orphaned records found.
     """
-    log_path = LOG_PATH.format(timestamp=timestamp)
+    log_path = log_path or LOG_PATH.format(timestamp=timestamp)
 
-    sot_ids = {row.get(unique_id_sot) for row in sot_rows if row.get(unique_id_sot)}
+    if sot_ids is None:
+        sot_ids = sot_id_set(sot_rows, unique_id_sot)
 
     orphaned_rows = find_orphaned_records(
         tgt_rows=tgt_rows,
         sot_ids=sot_ids,
         unique_id_col=unique_id_tgt,
+        row_filter=row_filter,
     )
 
     if not orphaned_rows:
-        return
+        return 0
 
     with open(log_path, "a", encoding="utf-8") as f:
-        f.write("\n\n=== ORPHANED RECORDS (Present in TGT but not in SOT) ===\n")
-        for row in orphaned_rows:
-            rid = row.get(unique_id_tgt)
-            f.write(f"\n[ORPHANED] {rid}\n")
+        write_orphan_section(f, (row.get(unique_id_tgt) for row in orphaned_rows))
+    return len(orphaned_rows)
 
 
-def _should_ignore_orphan(row: Dict[str, str], unique_id_col: str) -> bool:
-    rec_id = (row.get(unique_id_col) or "").strip()
+def write_orphan_section(f, record_ids: Iterable[str]) -> None:
+    """Write the orphaned records section of the diff log to an open text file."""
+    f.write("\n\n=== ORPHANED RECORDS (Present in TGT but not in SOT) ===\n")
+    for rid in record_ids:
+        f.write(f"\n[ORPHANED] {rid}\n")
 
-    # 1. Reject if not starting with required prefix
-    if not rec_id.startswith(UNIQUE_ID_PREFIX):
-        return True
 
-    # 2. Ignore specific statuses
-    status = (row.get("Status") or "").strip()
-    if status in ORPHANS_DETECTION_IGNORE_STATUS:
-        return True
+def sot_id_set(sot_rows: List[Dict[str, str]], unique_id_sot: str) -> set:
+    """All non-empty SOT unique IDs."""
+    return {uid for (uid,) in project(sot_rows, [unique_id_sot]) if uid}
 
-    return False
+
+def should_ignore_orphan(
+    row: Dict[str, str], unique_id_col: str, row_filter: Optional[RowFilter] = None
+) -> bool:
+    """
+    True for TGT records that are never reported as orphans: IDs without the
+    required prefix and ignored statuses (see RowFilter.ignores_orphan()).
+    """
+    row_filter = row_filter or compile_row_filter()
+    return row_filter.ignores_orphan(
+        row.get(unique_id_col), row.get(row_filter.status_column)
+    )
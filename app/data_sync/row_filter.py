@@ -0,0 +1,91 @@
+"""
+The record filters of a run, compiled once from config.
+
+UNIQUE_ID_PREFIX decides which records are reported (diff report) and can be
+orphans; ORPHANS_DETECTION_IGNORE_STATUS lists the TGT statuses that are never
+reported as orphans. The report writers, orphan detection and the readers all
+ask the same RowFilter, so they cannot disagree about a record.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+from config import ORPHANS_DETECTION_IGNORE_STATUS, UNIQUE_ID_PREFIX
+from app.data_sync.mapping_plan import normalize_value
+
+
+@dataclass(frozen=True)
+class RowFilter:
+    """
+    ID prefix and orphan status filter of a run. Values compare in their
+    normalized form (see normalize_value()). Build filters with
+    compile_row_filter().
+    """
+
+    id_prefix: str
+    ignore_statuses: FrozenSet[str]
+    status_column: str = "Status"
+
+    def keeps_id(self, record_id: Any) -> bool:
+        """True for record IDs starting with the prefix (the reported ones)."""
+        return normalize_value(record_id).startswith(self.id_prefix)
+
+    def ignores_orphan(self, record_id: Any, status: Any) -> bool:
+        """True for TGT records that are never reported as orphans."""
+        if not self.keeps_id(record_id):
+            return True
+        return normalize_value(status) in self.ignore_statuses
+
+    def orphan_check(
+        self, columns: Sequence[str], unique_id_col: str
+    ) -> Callable[[Sequence], bool]:
+        """
+        ignores_orphan() for data rows holding columns, in that order: values
+        are picked by position, no row dict is built. Rows without the status
+        column have no status.
+        """
+        id_position = list(columns).index(unique_id_col)
+        if self.status_column not in columns:
+            return lambda values: self.ignores_orphan(values[id_position], None)
+        status_position = list(columns).index(self.status_column)
+        return lambda values: self.ignores_orphan(
+            values[id_position], values[status_position]
+        )
+
+    def id_filter(self, unique_id_col: str) -> Tuple[str, "IdPrefixFilter"]:
+        """The readers' where= filter keeping the records with a prefixed ID."""
+        return unique_id_col, IdPrefixFilter(self.id_prefix)
+
+
+@dataclass(frozen=True)
+class IdPrefixFilter:
+    """
+    Predicate of RowFilter.id_filter(): True for record IDs starting with
+    id_prefix. Unlike a bound method it describes itself by value
+    (cache_key), so reads filtered by it can be cached across runs.
+    """
+
+    id_prefix: str
+
+    def __call__(self, record_id: Any) -> bool:
+        return normalize_value(record_id).startswith(self.id_prefix)
+
+    @property
+    def cache_key(self) -> Tuple[str, str]:
+        return "id_prefix", self.id_prefix
+
+
+def compile_row_filter(
+    id_prefix: Optional[str] = None,
+    ignore_statuses: Optional[Iterable[str]] = None,
+) -> RowFilter:
+    """The RowFilter of UNIQUE_ID_PREFIX and ORPHANS_DETECTION_IGNORE_STATUS,
+    unless other values are given."""
+    if id_prefix is None:
+        id_prefix = UNIQUE_ID_PREFIX
+    if ignore_statuses is None:
+        ignore_statuses = ORPHANS_DETECTION_IGNORE_STATUS
+    return RowFilter(
+        id_prefix=id_prefix,
+        ignore_statuses=frozenset(normalize_value(s) for s in ignore_statuses),
+    )
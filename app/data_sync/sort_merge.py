@@ -0,0 +1,291 @@
+"""
+External-memory sort-merge join of SOT and TGT.
+
+Both sides are spilled to disk as sorted runs keyed by unique ID, then merged
+and joined in one pass: every ID is seen once, with its SOT and TGT rows side
+by side, and turns into an update, an addition or an orphan. The resulting
+changes are spilled again in sheet row order, which is the order the writer
+needs and the one the hash-join engines report updates in. Only
+SORT_MERGE_RUN_ROWS items per sorter are held in memory at a time.
+"""
+
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from config import SORT_MERGE_RUN_ROWS
+from app.data_sync.diff_report import DiffReportWriter, is_sentinel
+from app.data_sync.mapping_plan import MappingPlan
+from app.data_sync.row_filter import RowFilter, compile_row_filter
+from app.data_sync.sync_engine import log_unmapped_sot_columns
+
+# Items pickled together in a run file (one pickle.load per batch when merging)
+_RUN_BATCH = 4096
+
+
+class ExternalSorter:
+    """
+    Sorts (key, item) pairs that may not fit in memory.
+
+    Pairs are buffered; every run_rows pairs the buffer is sorted by key and
+    written to a run file in a temporary directory. Iterating merges the runs
+    and the buffer into one stream sorted by key; pairs with equal keys keep
+    the order they were added in. The sorter can be iterated more than once
+    and its files are deleted by close() (or when it is garbage collected).
+    """
+
+    def __init__(self, run_rows: Optional[int] = None, directory=None):
+        self.run_rows = run_rows or SORT_MERGE_RUN_ROWS
+        self.path = tempfile.mkdtemp(prefix="sort_merge_", dir=directory)
+        self._buffer: List[Tuple[Any, Any]] = []
+        self._runs: List[str] = []
+        self._count = 0
+        self._cleanup = weakref.finalize(
+            self, shutil.rmtree, self.path, ignore_errors=True
+        )
+
+    def add(self, key, item) -> None:
+        self._buffer.append((key, item))
+        self._count += 1
+        if len(self._buffer) >= self.run_rows:
+            self._spill()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        self._buffer.sort(key=itemgetter(0))
+        # heapq.merge keeps equal keys in run order: earlier runs first
+        return heapq.merge(
+            *(_read_run(run) for run in self._runs),
+            iter(self._buffer),
+            key=itemgetter(0),
+        )
+
+    def close(self) -> None:
+        self._buffer = []
+        self._cleanup()
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _spill(self) -> None:
+        self._buffer.sort(key=itemgetter(0))
+        run = os.path.join(self.path, f"run_{len(self._runs):05d}.pkl")
+        with open(run, "wb") as f:
+            it = iter(self._buffer)
+            while batch := list(islice(it, _RUN_BATCH)):
+                pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._runs.append(run)
+        self._buffer = []
+
+
+def _read_run(run: str) -> Iterator[Tuple[Any, Any]]:
+    with open(run, "rb") as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def spill_sot_rows(
+    rows: Iterable[Tuple[int, Sequence[str]]],
+    plan: MappingPlan,
+    sorter: ExternalSorter,
+) -> None:
+    """
+    Add streamed SOT rows to sorter as ID -> (SOT position, sheet row, mapped
+    values). Rows without an ID are logged and skipped, as by the engines, and
+    unmapped SOT columns are logged once.
+    """
+    log_unmapped_sot_columns(plan)
+    id_position = plan.sot_id_position
+    for sot_pos, (row_num, values) in enumerate(rows):
+        sot_id = values[id_position]
+        if not sot_id:
+            logger.error(f"SOT record missing unique ID — skipped: row {row_num}")
+            continue
+        sorter.add(sot_id, (sot_pos, row_num, plan.sot_values(values)))
+
+
+def spill_tgt_rows(
+    rows: Iterable[Tuple[int, Sequence[str]]],
+    plan: MappingPlan,
+    sorter: ExternalSorter,
+    row_filter: Optional[RowFilter] = None,
+) -> int:
+    """
+    Add streamed TGT rows (values of the named columns) to sorter as
+    ID -> (sheet row, mapped values, holds the sentinel text, never an orphan).
+    The last two are decided here, while the whole row is at hand, the latter
+    by row_filter (default: compiled from config). Returns the last sheet row
+    read (1 if there are no data rows).
+    """
+    row_filter = row_filter or compile_row_filter()
+    ignores_orphan = row_filter.orphan_check(plan.tgt_row_columns, plan.unique_id_tgt)
+    id_position = plan.tgt_id_position
+    last_row = 1
+    for row_num, values in rows:
+        last_row = max(last_row, row_num)
+        tgt_id = values[id_position]
+        if not tgt_id:
+            continue
+        sorter.add(
+            tgt_id,
+            (
+                row_num,
+                plan.tgt_values(values),
+                is_sentinel(values),
+                ignores_orphan(values),
+            ),
+        )
+    return last_row
+
+
+class SortedChanges:
+    """
+    The outcome of merge_changes(), spilled to disk: updated records by sheet
+    row (for the writer and the report), SOT records to append, in SOT order, and orphaned TGT records by row.
+    Duplicate IDs found on either side are listed as (sheet row, ID, first
+    row) for DatasetValidator.report_duplicates().
+    """
+
+    def __init__(
+        self,
+        plan: MappingPlan,
+        last_row: int,
+        run_rows: Optional[int] = None,
+        directory=None,
+    ):
+        self.plan = plan
+        self.last_row = last_row
+        self.updates = ExternalSorter(run_rows, directory)
+        self.appends = ExternalSorter(run_rows, directory)
+        self.orphans = ExternalSorter(run_rows, directory)
+        self.sot_duplicates: List[Tuple[int, str, int]] = []
+        self.tgt_duplicates: List[Tuple[int, str, int]] = []
+
+    def is_empty(self) -> bool:
+        return not self.updates and not self.appends
+
+    def row_updates(self) -> Iterator[Tuple[int, Dict[int, str]]]:
+        """
+        (sheet row, {column index: new value}) in ascending row order: the
+        updated TGT rows, then the new records below the last TGT row.
+        """
+        tgt_columns = self.plan.tgt_columns
+        for row_num, (_, diffs, _) in self.updates:
+            yield row_num, {tgt_columns[c]: new for c, _, new in diffs}
+        for row_num, (_, (sot_id, values)) in enumerate(
+            self.appends, self.last_row + 1
+        ):
+            yield row_num, self.plan.new_row(sot_id, values)
+
+    def write_report(self, report: DiffReportWriter) -> None:
+        """Send every change to report in the order the hash-join engines use."""
+        plan = self.plan
+        for _, (record_id, diffs, sentinel) in self.updates:
+            diffs = [(plan.tgt_names[c], old, new) for c, old, new in diffs]
+            logger.info(f"{record_id}: updated {[col for col, _, _ in diffs]}")
+            if not sentinel:
+                report.updated(record_id, diffs, ())
+        for _, (sot_id, values) in self.appends:
+            logger.info(f"{sot_id}: added new record")
+            new_values = plan.new_row(sot_id, values)
+            report.added(
+                sot_id, {plan.tgt_column_name(c): v for c, v in new_values.items()}
+            )
+        for _, record_id in self.orphans:
+            report.orphan(record_id)
+
+    def close(self) -> None:
+        for sorter in (
+            self.updates,
+            self.appends,
+            self.orphans,
+        ):
+            sorter.close()
+
+
+def merge_changes(
+    sot_sorted: Iterable[Tuple[str, tuple]],
+    tgt_sorted: Iterable[Tuple[str, tuple]],
+    plan: MappingPlan,
+    last_row: int,
+    counters: Dict[str, int],
+    run_rows: Optional[int] = None,
+    directory=None,
+) -> SortedChanges:
+    """
+    Join the sorted SOT and TGT spills (see spill_sot_rows(), spill_tgt_rows())
+    in one pass. Matched records compare as in sync_sot_to_tgt()
+    (plan.compare()); SOT-only records become additions and TGT-only records
+    orphans. counters (cells_compared, cells_changed, rows_appended) are
+    updated in place. If an ID occurs more than once on a side, the first row
+    is used and the others are listed as duplicates.
+    """
+    changes = SortedChanges(plan, last_row, run_rows, directory)
+
+    for record_id, sot_items, tgt_items in _join(sot_sorted, tgt_sorted):
+        for _, row_num, _ in sot_items[1:]:
+            changes.sot_duplicates.append((row_num, record_id, sot_items[0][1]))
+        for row_num, *_ in tgt_items[1:]:
+            changes.tgt_duplicates.append((row_num, record_id, tgt_items[0][0]))
+
+        if not tgt_items:
+            sot_pos, _, sot_values = sot_items[0]
+            changes.appends.add(sot_pos, (record_id, sot_values))
+            counters["rows_appended"] += 1
+            continue
+        row_num, tgt_values, sentinel, ignored = tgt_items[0]
+        if not sot_items:
+            if not ignored:
+                changes.orphans.add(row_num, record_id)
+            continue
+
+        _, _, sot_values = sot_items[0]
+        counters["cells_compared"] += len(plan)
+        diffs = plan.compare(sot_values, tgt_values)
+        if diffs:
+            counters["cells_changed"] += len(diffs)
+            changes.updates.add(row_num, (record_id, diffs, sentinel))
+    return changes
+
+
+def _join(
+    sot_sorted: Iterable[Tuple[str, tuple]], tgt_sorted: Iterable[Tuple[str, tuple]]
+) -> Iterator[Tuple[str, List[tuple], List[tuple]]]:
+    """(ID, its SOT items, its TGT items) for every ID on either side, in ID order."""
+    sot_groups = _groups(sot_sorted)
+    tgt_groups = _groups(tgt_sorted)
+    sot = next(sot_groups, None)
+    tgt = next(tgt_groups, None)
+    while sot is not None or tgt is not None:
+        if tgt is None or (sot is not None and sot[0] < tgt[0]):
+            yield sot[0], sot[1], []
+            sot = next(sot_groups, None)
+        elif sot is None or tgt[0] < sot[0]:
+            yield tgt[0], [], tgt[1]
+            tgt = next(tgt_groups, None)
+        else:
+            yield sot[0], sot[1], tgt[1]
+            sot = next(sot_groups, None)
+            tgt = next(tgt_groups, None)
+
+
+def _groups(pairs: Iterable[Tuple[str, tuple]]) -> Iterator[Tuple[str, List[tuple]]]:
+    for key, group in groupby(pairs, key=itemgetter(0)):
+        yield key, [item for _, item in group]
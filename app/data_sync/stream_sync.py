@@ -0,0 +1,95 @@
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+
+from loguru import logger
+
+from app.data_sync.diff_report import DiffReportWriter
+from app.data_sync.mapping_plan import MappingPlan
+from app.data_sync.sync_engine import log_unmapped_sot_columns
+
+# SOT record ID -> its mapped values, in column_mapping order
+SotIndex = Dict[str, Tuple[str, ...]]
+
+
+def index_sot_rows(
+    rows: Iterable[Tuple[int, Sequence[str]]], plan: MappingPlan
+) -> SotIndex:
+    """
+    Consume streamed SOT rows ((sheet row, values in header order)) into an
+    index of the mapped values by record ID. Only the mapped columns are kept,
+    in SOT order; rows without an ID are logged and skipped, as by the engines,
+    and unmapped SOT columns are logged once.
+    """
+    log_unmapped_sot_columns(plan)
+    id_position = plan.sot_id_position
+    index: SotIndex = {}
+    for row_num, values in rows:
+        sot_id = values[id_position]
+        if not sot_id:
+            logger.error(f"SOT record missing unique ID — skipped: row {row_num}")
+            continue
+        index[sot_id] = plan.sot_values(values)
+    return index
+
+
+def stream_row_updates(
+    sot_index: SotIndex,
+    tgt_rows: Iterable[Tuple[int, Sequence[str]]],
+    plan: MappingPlan,
+    report: DiffReportWriter,
+    counters: Dict[str, int],
+) -> Iterator[Tuple[int, Dict[int, str]]]:
+    """
+    Match streamed TGT rows against the SOT index and yield the TGT updates,
+    (sheet row, {column index: new value}), in sheet row order: changed rows
+    as they are read, then the SOT records missing from TGT as new rows below
+    the last TGT row. Meant to feed patch_tgt_xlsx_streaming().
+
+    Values compare as in sync_sot_to_tgt() (plan.compare()). Each change is
+    also sent to the report as it is found, TGT records missing from SOT are
+    reported as orphans, and counters (cells_compared, cells_changed,
+    rows_appended, orphans_found) are updated in place. Matched records are
+    removed from sot_index, so it shrinks as TGT is read. Orphans are told
+    apart with the report's RowFilter.
+
+    tgt_rows yields (sheet row, values of the named TGT columns).
+    """
+    ignores_orphan = report.row_filter.orphan_check(
+        plan.tgt_row_columns, plan.unique_id_tgt
+    )
+    id_position = plan.tgt_id_position
+
+    last_row = 1
+    for row_num, values in tgt_rows:
+        last_row = max(last_row, row_num)
+        tgt_id = values[id_position]
+        if not tgt_id:
+            continue
+        sot_values = sot_index.pop(tgt_id, None)
+        if sot_values is None:
+            if not ignores_orphan(values):
+                report.orphan(tgt_id)
+            continue
+
+        counters["cells_compared"] += len(plan)
+        diffs = plan.compare(sot_values, plan.tgt_values(values))
+        if diffs:
+            counters["cells_changed"] += len(diffs)
+            changed = [plan.tgt_names[c] for c, _, _ in diffs]
+            logger.info(f"{tgt_id}: updated {changed}")
+            report.updated(
+                tgt_id,
+                [(plan.tgt_names[c], old, new) for c, old, new in diffs],
+                values,
+            )
+            yield row_num, {plan.tgt_columns[c]: new for c, _, new in diffs}
+
+    # SOT records not found in TGT, in SOT order
+    for row_num, (sot_id, sot_values) in enumerate(sot_index.items(), last_row + 1):
+        new_values = plan.new_row(sot_id, sot_values)
+        counters["rows_appended"] += 1
+        logger.info(f"{sot_id}: added new record")
+        report.added(
+            sot_id, {plan.tgt_column_name(c): v for c, v in new_values.items()}
+        )
+        yield row_num, new_values
+    counters["orphans_found"] = report.orphans_found
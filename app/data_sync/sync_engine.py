@@ -1,6 +1,12 @@
-from typing import Dict, List
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
 from loguru import logger
 
+from app.data_io.fingerprint import fingerprints_of
+from app.data_io.table import Table, headers_of, project
+from app.data_sync.change_set import AppendedRow, CellChange, ChangeSet
+from app.data_sync.mapping_plan import MappingPlan, compile_mapping
+
 
 def sync_sot_to_tgt(
     sot_rows: List[Dict[str, str]],
@@ -8,56 +14,291 @@ def sync_sot_to_tgt(
     unique_id_col_sot: str,
     unique_id_col_tgt: str,
     column_mapping: Dict[str, str],
-) -> List[Dict[str, str]]:
+    tgt_headers: Optional[List[str]] = None,
+    tgt_row_numbers: Optional[List[int]] = None,
+    plan: Optional[MappingPlan] = None,
+) -> ChangeSet:
     """
     Synchronize SOT → TGT.
     - Updates mapped fields where IDs match.
     - Adds new rows from SOT if missing in TGT.
     - Logs all operations.
 
+    When both sides carry row fingerprints of the mapped columns (computed at
+    read time), matched records with equal fingerprints are skipped without
+    comparing their columns.
+
     Args:
-        sot_rows: list of dicts from SOT
-        tgt_rows: list of dicts from TGT
+        sot_rows: Table (or list of dicts) from SOT
+        tgt_rows: Table (or list of dicts) from TGT
         unique_id_col_sot: SOT unique ID column
         unique_id_col_tgt: TGT unique ID column
         column_mapping: mapping of SOT→TGT column names
+        tgt_headers: TGT header row (defaults to the TGT columns)
+        tgt_row_numbers: sheet row of each TGT row (defaults to the Table's
+                         row numbers, or 2, 3, ... for a list of dicts)
+        plan: the mapping compiled against both header rows (compiled here
+              from the arguments above if not given)
+
+    Returns:
+        ChangeSet with every changed cell (sheet row, column, old, new) and the
+        rows to append below the last TGT row. tgt_rows is left untouched.
     """
-    tgt_index = {r[unique_id_col_tgt]: r for r in tgt_rows if r.get(unique_id_col_tgt)}
+    plan = plan or _compile_plan(
+        sot_rows,
+        tgt_rows,
+        unique_id_col_sot,
+        unique_id_col_tgt,
+        column_mapping,
+        tgt_headers,
+    )
+    tgt_row_numbers = _tgt_row_numbers(tgt_rows, tgt_row_numbers)
+    change_set = ChangeSet(headers=list(plan.tgt_headers))
+    next_row = max(tgt_row_numbers, default=1) + 1
 
-    # Detect and log unmapped SOT columns once
-    unmapped = find_unmapped_sot_columns(sot_rows, column_mapping, unique_id_col_sot)
-    if unmapped:
-        logger.warning(
-            f"Unmapped SOT columns ignored ({len(unmapped)}): {', '.join(unmapped)}"
-        )
+    # Work on (id, *mapped values) tuples; whole columns are read from a Table
+    tgt_index = {}
+    for i, (values, row_num) in enumerate(
+        zip(project(tgt_rows, [plan.unique_id_tgt, *plan.tgt_names]), tgt_row_numbers)
+    ):
+        if values[0]:
+            tgt_index[values[0]] = (i, row_num, values[1:])
+
+    log_unmapped_sot_columns(plan)
 
-    for sot_row in sot_rows:
-        sot_id = sot_row.get(unique_id_col_sot)
+    sot_fp, tgt_fp = _mapped_fingerprints(sot_rows, tgt_rows, plan)
+    unchanged = 0
+
+    for i, values in enumerate(
+        project(sot_rows, [plan.unique_id_sot, *plan.sot_names])
+    ):
+        sot_id = values[0]
         if not sot_id:
-            logger.error(f"SOT record missing unique ID — skipped: {sot_row}")
+            logger.error(f"SOT record missing unique ID — skipped: {sot_rows[i]}")
             continue
 
         if sot_id in tgt_index:
-            tgt_row = tgt_index[sot_id]
+            tgt_i, row_num, tgt_values = tgt_index[sot_id]
+            if sot_fp is not None and sot_fp[i] == tgt_fp[tgt_i]:
+                unchanged += 1
+                continue
+            change_set.cells_compared += len(plan)
+            diffs = plan.compare(values[1:], tgt_values)
+            for c, tgt_val, sot_val in diffs:
+                change_set.cell_changes.append(
+                    CellChange(sot_id, row_num, plan.tgt_columns[c], tgt_val, sot_val)
+                )
+            if diffs:
+                change_set.tgt_rows[row_num] = tgt_rows[tgt_i]
+                logger.info(
+                    f"{sot_id}: updated {[plan.tgt_names[c] for c, _, _ in diffs]}"
+                )
+        else:
+            change_set.appended_rows.append(
+                AppendedRow(sot_id, next_row, plan.new_row(sot_id, values[1:]))
+            )
+            next_row += 1
+            logger.info(f"{sot_id}: added new record")
+
+    _log_fingerprint_skips(sot_fp, unchanged)
+    return change_set
+
+
+def sync_sot_to_tgt_vectorized(
+    sot_rows: List[Dict[str, str]],
+    tgt_rows: List[Dict[str, str]],
+    unique_id_col_sot: str,
+    unique_id_col_tgt: str,
+    column_mapping: Dict[str, str],
+    tgt_headers: Optional[List[str]] = None,
+    tgt_row_numbers: Optional[List[int]] = None,
+    plan: Optional[MappingPlan] = None,
+) -> ChangeSet:
+    """
+    Same contract and result as sync_sot_to_tgt(), built for wide/large sheets.
+
+    SOT and TGT are first aligned by unique ID; then every mapped column is
+    compared as one NumPy batch, giving the changed-cell mask for all matched
+    records at once. Python only runs per differing cell. Records whose row
+    fingerprints match are dropped before the column batches are built.
+
+    Requires numpy; falls back to sync_sot_to_tgt() without it.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        logger.warning("numpy not installed — using per-cell comparison")
+        return sync_sot_to_tgt(
+            sot_rows,
+            tgt_rows,
+            unique_id_col_sot,
+            unique_id_col_tgt,
+            column_mapping,
+            tgt_headers=tgt_headers,
+            tgt_row_numbers=tgt_row_numbers,
+            plan=plan,
+        )
+
+    plan = plan or _compile_plan(
+        sot_rows,
+        tgt_rows,
+        unique_id_col_sot,
+        unique_id_col_tgt,
+        column_mapping,
+        tgt_headers,
+    )
+    tgt_row_numbers = _tgt_row_numbers(tgt_rows, tgt_row_numbers)
+    change_set = ChangeSet(headers=list(plan.tgt_headers))
+    next_row = max(tgt_row_numbers, default=1) + 1
+
+    log_unmapped_sot_columns(plan)
+
+    # Step 1: align SOT and TGT by unique ID
+    tgt_pos = {}
+    for i, (tgt_id,) in enumerate(project(tgt_rows, [plan.unique_id_tgt])):
+        if tgt_id:
+            tgt_pos[tgt_id] = i
+
+    sot_fp, tgt_fp = _mapped_fingerprints(sot_rows, tgt_rows, plan)
+    unchanged = 0
+
+    sot_ids = [sot_id for (sot_id,) in project(sot_rows, [plan.unique_id_sot])]
+    matched_sot, matched_tgt, unmatched_sot = [], [], []
+    for i, sot_id in enumerate(sot_ids):
+        if not sot_id:
+            logger.error(f"SOT record missing unique ID — skipped: {sot_rows[i]}")
+            continue
+        j = tgt_pos.get(sot_id)
+        if j is None:
+            unmatched_sot.append(i)
+        elif sot_fp is not None and sot_fp[i] == tgt_fp[j]:
+            unchanged += 1
+        else:
+            matched_sot.append(i)
+            matched_tgt.append(j)
+
+    # Step 2: compare each mapped column as a whole batch. Raw values are
+    # compared first (one C-level pass per column); only the few cells that
+    # differ are normalised (strip) to drop whitespace-only differences.
+    def batch(rows, col: str, positions) -> "np.ndarray":
+        if isinstance(rows, Table):
+            if len(positions) < len(rows) // 2:  # mostly skipped by fingerprint
+                return np.array(rows.take(col, positions.tolist()), dtype=object)
+            values = rows.column(col)  # already strings
+        else:
+            values = [str(v or "") for (v,) in project(rows, [col])]
+        return np.array(values, dtype=object)[positions]
+
+    sot_positions = np.array(matched_sot, dtype=np.intp)
+    tgt_positions = np.array(matched_tgt, dtype=np.intp)
+    mask = np.zeros((len(matched_sot), len(plan)), dtype=bool)
+    change_set.cells_compared = mask.size
+    old_new = {}
+    for c, (sot_col, tgt_col, normalize) in enumerate(
+        zip(plan.sot_names, plan.tgt_names, plan.normalizers)
+    ):
+        sot_batch = batch(sot_rows, sot_col, sot_positions)
+        tgt_batch = batch(tgt_rows, tgt_col, tgt_positions)
+        candidates = np.flatnonzero(sot_batch != tgt_batch)
+        for m in candidates.tolist():
+            sot_val, tgt_val = normalize(sot_batch[m]), normalize(tgt_batch[m])
+            if sot_val != tgt_val:
+                mask[m, c] = True
+                old_new[m, c] = (tgt_val, sot_val)
+
+    # Step 3: emit changes (row-major = SOT order, then mapping order)
+    changes_by_sot = {}
+    for m, c in zip(*np.nonzero(mask)):
+        changes_by_sot.setdefault(matched_sot[m], []).append((int(m), int(c)))
+
+    for i in heapq.merge(changes_by_sot, unmatched_sot):
+        sot_id = sot_ids[i]
+        if i in changes_by_sot:
+            m = changes_by_sot[i][0][0]
+            tgt_i = matched_tgt[m]
+            row_num = tgt_row_numbers[tgt_i]
             changed = []
-            for sot_col, tgt_col in column_mapping.items():
-                sot_val = str(sot_row.get(sot_col, "") or "").strip()
-                tgt_val = str(tgt_row.get(tgt_col, "") or "").strip()
-                if sot_val != tgt_val:
-                    tgt_row[tgt_col] = sot_val
-                    changed.append(tgt_col)
-            if changed:
-                logger.info(f"{sot_id}: updated {changed}")
+            for _, c in changes_by_sot[i]:
+                change_set.cell_changes.append(
+                    CellChange(sot_id, row_num, plan.tgt_columns[c], *old_new[m, c])
+                )
+                changed.append(plan.tgt_names[c])
+            change_set.tgt_rows[row_num] = tgt_rows[tgt_i]
+            logger.info(f"{sot_id}: updated {changed}")
         else:
-            new_row = {
-                tgt_col: sot_row.get(sot_col, "")
-                for sot_col, tgt_col in column_mapping.items()
-            }
-            new_row[unique_id_col_tgt] = sot_id
-            tgt_rows.append(new_row)
+            values = [sot_rows[i].get(sot_col) for sot_col in plan.sot_names]
+            change_set.appended_rows.append(
+                AppendedRow(sot_id, next_row, plan.new_row(sot_id, values))
+            )
+            next_row += 1
             logger.info(f"{sot_id}: added new record")
 
-    return tgt_rows
+    _log_fingerprint_skips(sot_fp, unchanged)
+    return change_set
+
+
+def _mapped_fingerprints(
+    sot_rows, tgt_rows, plan: MappingPlan
+) -> Tuple[Optional[List[bytes]], Optional[List[bytes]]]:
+    """
+    Return the read-time fingerprints of the mapped SOT and TGT columns, or
+    (None, None) unless both sides have them in mapping order.
+    """
+    sot_fp = fingerprints_of(sot_rows, list(plan.sot_names))
+    tgt_fp = fingerprints_of(tgt_rows, list(plan.tgt_names))
+    if sot_fp is None or tgt_fp is None:
+        return None, None
+    return sot_fp, tgt_fp
+
+
+def _log_fingerprint_skips(sot_fp: Optional[List[bytes]], unchanged: int) -> None:
+    if sot_fp is not None:
+        logger.debug(f"{unchanged} matched records skipped (fingerprint unchanged)")
+
+
+def _compile_plan(
+    sot_rows,
+    tgt_rows,
+    unique_id_col_sot: str,
+    unique_id_col_tgt: str,
+    column_mapping: Dict[str, str],
+    tgt_headers: Optional[List[str]],
+) -> MappingPlan:
+    """
+    Compile the mapping against the row headers. Plain SOT row dicts read
+    missing columns as None (see project()), so only TGT columns must exist.
+    """
+    sot_headers = headers_of(sot_rows)
+    if not isinstance(sot_rows, Table):
+        sot_headers = list(
+            dict.fromkeys([*sot_headers, unique_id_col_sot, *column_mapping])
+        )
+    if tgt_headers is None:
+        tgt_headers = headers_of(tgt_rows) or [
+            unique_id_col_tgt,
+            *column_mapping.values(),
+        ]
+    return compile_mapping(
+        column_mapping, unique_id_col_sot, unique_id_col_tgt, sot_headers, tgt_headers
+    )
+
+
+def _tgt_row_numbers(tgt_rows, tgt_row_numbers: Optional[Sequence[int]]):
+    """Sheet row of each TGT row: the Table's row numbers, or 2, 3, ... for dicts."""
+    if tgt_row_numbers is not None:
+        return tgt_row_numbers
+    if isinstance(tgt_rows, Table):
+        return tgt_rows.row_numbers
+    return range(2, len(tgt_rows) + 2)
+
+
+def log_unmapped_sot_columns(plan: MappingPlan) -> None:
+    """Log the SOT columns the sync ignores, once per run."""
+    unmapped = plan.unmapped_sot_columns()
+    if unmapped:
+        logger.warning(
+            f"Unmapped SOT columns ignored ({len(unmapped)}): {', '.join(unmapped)}"
+        )
 
 
 def find_unmapped_sot_columns(
@@ -72,7 +313,7 @@ def find_unmapped_sot_columns(
     if not sot_rows:
         return []
 
-    all_sot_columns = set(sot_rows[0].keys())
+    all_sot_columns = set(headers_of(sot_rows))
     mapped_columns = set(column_mapping.keys()) | {unique_id_col_sot}
     unmapped = sorted(all_sot_columns - mapped_columns)
     return unmapped
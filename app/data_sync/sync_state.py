@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from app.data_io.fingerprint import fingerprints_of, row_fingerprint
+from app.data_io.parse_cache import file_sha256
+from app.data_io.table import project
+
+STATE_VERSION = 1
+
+
+def file_signature(path: str, known: Iterable[Optional[dict]] = ()) -> dict:
+    """
+    Return {"path", "size", "mtime_ns", "sha256"} for a file.
+    The content hash is reused from a known signature with the same size and
+    mtime; otherwise the file is hashed.
+    """
+    stat = os.stat(path)
+    for sig in known:
+        if sig and sig["size"] == stat.st_size and sig["mtime_ns"] == stat.st_mtime_ns:
+            sha256 = sig["sha256"]
+            break
+    else:
+        sha256 = file_sha256(path)
+    return {
+        "path": str(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+    }
+
+
+def mapping_key(
+    sot_sheet_name: str,
+    tgt_sheet_name: str,
+    unique_id_sot: str,
+    unique_id_tgt: str,
+    column_mapping: Dict[str, str],
+    sot_id_prefix: Optional[str] = None,
+) -> str:
+    """
+    Hash of everything that shapes the sync result besides the input files.
+    sot_id_prefix: the prefix SOT records were filtered by while reading, if any.
+    """
+    spec = [
+        STATE_VERSION,
+        sot_sheet_name,
+        tgt_sheet_name,
+        unique_id_sot,
+        unique_id_tgt,
+        list(column_mapping.items()),
+    ]
+    if sot_id_prefix is not None:
+        spec.append(sot_id_prefix)
+    return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()
+
+
+def state_entry_key(sot_path: str, sot_sheet_name: str, tgt_sheet_name: str) -> str:
+    """One state entry per SOT sheet → TGT sheet pair (the TGT file may vary)."""
+    return f"{Path(sot_path).resolve()}::{sot_sheet_name}->{tgt_sheet_name}"
+
+
+def load_sync_state(state_path: Path, entry_key: str, mapping: str) -> Optional[dict]:
+    """
+    Return the saved state of the last successful run of this pair, or None if
+    there is none or it was produced with another mapping.
+    """
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            entry = json.load(f).get(entry_key)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Sync state unreadable, ignoring it: {e}")
+        return None
+
+    if not entry:
+        return None
+    if entry.get("mapping") != mapping:
+        logger.info("Column mapping changed since last sync — sync state discarded")
+        return None
+    return entry
+
+
+def save_sync_state(state_path: Path, entry_key: str, entry: dict) -> None:
+    """Store the entry for this pair, keeping other pairs' entries."""
+    state_path = Path(state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state[entry_key] = entry
+
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def reusable_output(
+    state: Optional[dict], sot_sig: dict, tgt_sig: dict
+) -> Optional[str]:
+    """
+    Return the previous output path if it is still the correct result: same
+    SOT, and TGT is either the previous input or the previous output itself.
+    """
+    if not state or sot_sig["sha256"] != state["sot"]["sha256"]:
+        return None
+    output = state["output"]
+    if tgt_sig["sha256"] not in (state["tgt"]["sha256"], output["sha256"]):
+        return None
+    if not os.path.exists(output["path"]):
+        return None
+    if file_signature(output["path"], [output])["sha256"] != output["sha256"]:
+        return None
+    return output["path"]
+
+
+def id_fingerprints(rows, unique_id_col: str, columns: List[str]) -> Dict[str, str]:
+    """{unique ID: hex fingerprint of the mapped columns}, from read-time fingerprints."""
+    fingerprints = fingerprints_of(rows, columns)
+    if fingerprints is None:
+        return {}
+    return {
+        rec_id: fp.hex()
+        for (rec_id,), fp in zip(project(rows, [unique_id_col]), fingerprints)
+        if rec_id
+    }
+
+
+def changed_sot_positions(
+    state: dict,
+    sot_fingerprints: Dict[str, str],
+    tgt_fingerprints: Dict[str, str],
+    sot_ids: Iterable[str],
+) -> List[int]:
+    """
+    Positions of SOT rows that must be re-synced: their SOT fingerprint moved,
+    or their TGT fingerprint differs from what the last run produced.
+    Rows without an ID are always kept (the engine reports them).
+    """
+    prev_sot, prev_tgt = state["sot_fingerprints"], state["tgt_fingerprints"]
+    return [
+        i
+        for i, rec_id in enumerate(sot_ids)
+        if not rec_id
+        or rec_id not in prev_sot
+        or prev_sot[rec_id] != sot_fingerprints.get(rec_id)
+        or prev_tgt.get(rec_id) != tgt_fingerprints.get(rec_id)
+    ]
+
+
+def written_fingerprints(
+    tgt_fingerprints: Dict[str, str], change_set, tgt_columns: List[str]
+) -> Dict[str, str]:
+    """
+    {unique ID: hex fingerprint of the mapped TGT columns} of the output
+    workbook: the input TGT fingerprints, recomputed from the written values
+    for every record the change set updated or appended. Records the sync
+    left alone (e.g. sentinel rows) keep the fingerprint they have in TGT.
+    Appended rows omit blank cells; those hash as "", as they do when read.
+    """
+    fingerprints = dict(tgt_fingerprints)
+    for record_id, row, changes in change_set.updated_records():
+        values = dict(change_set.tgt_rows[row])
+        for change in changes:
+            values[change_set.column_name(change.column)] = change.new_value
+        fingerprints[record_id] = row_fingerprint(
+            [values.get(c, "") for c in tgt_columns]
+        ).hex()
+    for appended in change_set.appended_rows:
+        values = {change_set.column_name(c): v for c, v in appended.values.items()}
+        fingerprints[appended.record_id] = row_fingerprint(
+            [values.get(c, "") for c in tgt_columns]
+        ).hex()
+    return fingerprints
+
+
+def build_state_entry(
+    mapping: str,
+    sot_sig: dict,
+    tgt_sig: dict,
+    output_sig: dict,
+    sot_fingerprints: Dict[str, str],
+    output_fingerprints: Dict[str, str],
+) -> dict:
+    """
+    State after a successful run; output_fingerprints are those of the TGT
+    rows actually written (see written_fingerprints()).
+    """
+    return {
+        "mapping": mapping,
+        "sot": sot_sig,
+        "tgt": tgt_sig,
+        "output": output_sig,
+        "sot_fingerprints": sot_fingerprints,
+        "tgt_fingerprints": output_fingerprints,
+    }
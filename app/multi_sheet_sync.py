@@ -0,0 +1,398 @@
+from loguru import logger
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    OUTPUT_DIR,
+    SHEETS_MAX_WORKERS,
+    SYNC_ENGINE,
+    SYNC_PREFIXED_IDS_ONLY,
+    TGT_WRITE_MODE,
+)
+from app.data_io.xlsx_io import (
+    build_output_path,
+    open_values_workbook,
+    read_sot_xlsx,
+    read_tgt_values,
+    read_tgt_xlsx,
+    write_tgt_sheets_xlsx,
+)
+from app.data_io.xlsx_patch import patch_tgt_xlsx_sheets
+from app.data_sync.mapping_plan import compile_mapping, sot_projection
+from app.data_sync.row_filter import RowFilter, compile_row_filter
+from app.data_sync.sync_engine import sync_sot_to_tgt, sync_sot_to_tgt_vectorized
+from app.validation.dataset_validation import DatasetValidator
+from app.validation.preflight import preflight
+from app.sync_metrics import COUNTERS, SyncMetrics
+from app.xlsx_sync import record_change_counts, write_reports
+
+
+@dataclass
+class SheetPair:
+    """One SOT sheet synced into one TGT sheet, with its own IDs and mapping."""
+
+    sot_sheet_name: str
+    tgt_sheet_name: str
+    unique_id_sot: str
+    unique_id_tgt: str
+    column_mapping: Dict[str, str]
+
+
+@dataclass
+class SheetPairResult:
+    """Outcome of one sheet pair: its report, or the error."""
+
+    pair: SheetPair
+    output_dir: str  # where its report is written
+    report_file: Optional[str] = None
+    metrics: Optional[SyncMetrics] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class MultiSheetResult:
+    """Outcome of run_sync_sheets: the output workbook and per-pair results."""
+
+    pairs: List[SheetPairResult]
+    output_file: Optional[str]  # None if every pair failed
+    metrics: SyncMetrics  # reads, write and the whole run
+    summary: dict = field(default_factory=dict)
+    summary_file: Optional[str] = None
+
+
+def run_sync_sheets(
+    sot_path: str,
+    tgt_path: str,
+    pairs: List[SheetPair],
+    output_dir: str = OUTPUT_DIR,
+    write_mode: str = TGT_WRITE_MODE,
+    engine: str = SYNC_ENGINE,
+    max_workers: Optional[int] = SHEETS_MAX_WORKERS,
+    prefixed_ids_only: bool = SYNC_PREFIXED_IDS_ONLY,
+) -> MultiSheetResult:
+    """
+    Sync several sheet pairs of one SOT and one TGT workbook.
+
+    Every pair is first checked against the header rows alone (preflight(),
+    as run_sync does); a pair that fails it is not synced. The others are
+    synced concurrently in worker processes, each of which opens both
+    workbooks once and then reads (only the ID and mapped SOT columns, each
+    sheet validated as in run_sync), syncs and reports its pairs, so no
+    parsed sheet crosses a process boundary. Every pair writes its
+    diff/orphan report to its own subdirectory of output_dir (named after
+    the TGT sheet). The changes of every pair go into a single output
+    workbook, written once. A failing pair is reported in the summary and its
+    TGT sheet is left unchanged; it does not stop the others.
+
+    engine: "python" or "vectorized". The sort-merge engine and the streaming
+    pipeline work on one sheet pair at a time and are only available through
+    run_sync(); incremental sync and the parse cache are not used either.
+    max_workers=1 syncs the pairs one after the other in this process, with
+    both workbooks opened once.
+    prefixed_ids_only works as in run_sync().
+    Returns a MultiSheetResult; the summary is also written to
+    output_dir/sheets_summary_<timestamp>.json.
+    """
+    if write_mode not in ("openpyxl", "patch"):
+        raise ValueError(f"Unknown TGT write mode: {write_mode}")
+    if engine not in ("python", "vectorized"):
+        raise ValueError(
+            f"Unknown sync engine for run_sync_sheets: {engine} "
+            "(use 'python' or 'vectorized')"
+        )
+    if not pairs:
+        raise ValueError("No sheet pairs given")
+    tgt_sheets = [pair.tgt_sheet_name for pair in pairs]
+    if len(tgt_sheets) != len(set(tgt_sheets)):
+        raise ValueError(f"TGT sheets synced by more than one pair: {tgt_sheets}")
+
+    logger.info(f"=== XLSX Delta Sync Starting ({len(pairs)} sheet pairs) ===")
+    row_filter = compile_row_filter()
+    metrics = SyncMetrics()
+    results = [
+        SheetPairResult(pair=pair, output_dir=pair_dir, metrics=SyncMetrics())
+        for pair, pair_dir in zip(pairs, _pair_dirs(pairs, output_dir))
+    ]
+    output_file = None
+    with metrics.capture():
+        with metrics.stage("preflight"):
+            for result in results:
+                _preflight_pair(sot_path, tgt_path, result)
+
+        with metrics.stage("pairs"):
+            synced = [r for r in results if r.error is None]
+            args = [
+                (
+                    r.pair,
+                    r.output_dir,
+                    sot_path,
+                    tgt_path,
+                    engine,
+                    row_filter,
+                    prefixed_ids_only,
+                    r.metrics,
+                )
+                for r in synced
+            ]
+            if max_workers == 1 or len(args) <= 1:
+                _init_worker(sot_path, tgt_path)
+                try:
+                    outcomes = [_sync_pair(*a) for a in args]
+                finally:
+                    _close_workbooks()
+            else:
+                # each worker opens the workbooks once, for all of its pairs
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_worker,
+                    initargs=(sot_path, tgt_path),
+                ) as pool:
+                    outcomes = list(pool.map(_sync_pair, *zip(*args)))
+
+        sheet_updates = {}
+        for result, (pair_metrics, report_file, cell_updates, error) in zip(
+            synced, outcomes
+        ):
+            result.metrics, result.report_file, result.error = (
+                pair_metrics,
+                report_file,
+                error,
+            )
+            if error is None:
+                sheet_updates[result.pair.tgt_sheet_name] = cell_updates
+                for name, value in pair_metrics.counters.items():
+                    metrics.counters[name] += value
+            else:
+                logger.error(f"Sheet {result.pair.tgt_sheet_name} failed: {error}")
+
+        if sheet_updates:
+            with metrics.stage("write"):
+                output_file = _write_output(
+                    tgt_path, sheet_updates, output_dir, write_mode
+                )
+            metrics.counters["bytes_written"] = os.path.getsize(output_file)
+            logger.success(f"Updated TGT written to: {output_file}")
+
+    result = MultiSheetResult(pairs=results, output_file=output_file, metrics=metrics)
+    result.summary = _summary(sot_path, tgt_path, result)
+    result.summary_file = _write_summary(result.summary, output_dir)
+    _log_summary(result)
+    logger.info("=== Sync Complete ===")
+    return result
+
+
+def _pair_dirs(pairs: List[SheetPair], output_dir: str) -> List[str]:
+    """One report subdirectory per pair, named after its TGT sheet."""
+    dirs, seen = [], {}
+    for pair in pairs:
+        name = re.sub(r"[^\w.-]+", "_", pair.tgt_sheet_name).strip("_") or "sheet"
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}_{seen[name]}"
+        dirs.append(str(Path(output_dir) / name))
+    return dirs
+
+
+def _preflight_pair(sot_path: str, tgt_path: str, result: SheetPairResult) -> None:
+    """Check one pair against the header rows; record the problems as its error."""
+    pair = result.pair
+    with result.metrics.stage("preflight"):
+        check = preflight(
+            sot_path,
+            tgt_path,
+            pair.sot_sheet_name,
+            pair.tgt_sheet_name,
+            pair.unique_id_sot,
+            pair.unique_id_tgt,
+            pair.column_mapping,
+        )
+    if not check.ok:
+        result.error = "Preflight failed: " + "; ".join(check.errors)
+        logger.error(f"Sheet {pair.tgt_sheet_name} failed: {result.error}")
+
+
+# Per-process SOT and TGT workbooks, opened once by _init_worker()
+_sot_wb = None
+_tgt_wb = None
+
+
+def _init_worker(sot_path: str, tgt_path: str) -> None:
+    global _sot_wb, _tgt_wb
+    _sot_wb = open_values_workbook(sot_path, "SOT")
+    _tgt_wb = open_values_workbook(tgt_path, "TGT")
+
+
+def _close_workbooks() -> None:
+    global _sot_wb, _tgt_wb
+    for wb in (_sot_wb, _tgt_wb):
+        if wb is not None:
+            wb.close()
+    _sot_wb = _tgt_wb = None
+
+
+def _sync_pair(
+    pair: SheetPair,
+    output_dir: str,
+    sot_path: str,
+    tgt_path: str,
+    engine: str,
+    row_filter: RowFilter,
+    prefixed_ids_only: bool,
+    metrics: SyncMetrics,
+) -> tuple:
+    """
+    Read, sync and report one pair from the process's workbooks. Returns
+    (metrics, report file, cell updates, None), or (metrics, None, None,
+    error) if it failed.
+    """
+    logger.info(f"--- Sheets {pair.sot_sheet_name} -> {pair.tgt_sheet_name} ---")
+    try:
+        with metrics.stage("read_sot"):
+            sot_headers, sot_rows = read_sot_xlsx(
+                sot_path,
+                pair.sot_sheet_name,
+                columns=sot_projection(pair.column_mapping, pair.unique_id_sot),
+                where=(
+                    row_filter.id_filter(pair.unique_id_sot)
+                    if prefixed_ids_only
+                    else None
+                ),
+                validator=DatasetValidator(
+                    "SOT", pair.unique_id_sot, list(pair.column_mapping.keys())
+                ),
+                workbook=_sot_wb,
+            )
+        with metrics.stage("read_tgt"):
+            tgt_headers, tgt_rows = read_tgt_values(
+                tgt_path,
+                pair.tgt_sheet_name,
+                validator=DatasetValidator(
+                    "TGT", pair.unique_id_tgt, list(pair.column_mapping.values())
+                ),
+                workbook=_tgt_wb,
+            )
+        logger.info(
+            f"{pair.sot_sheet_name}: {len(sot_rows)} SOT records, "
+            f"{pair.tgt_sheet_name}: {len(tgt_rows)} TGT records"
+        )
+
+        with metrics.stage("sync"):
+            sync = (
+                sync_sot_to_tgt_vectorized
+                if engine == "vectorized"
+                else sync_sot_to_tgt
+            )
+            change_set = sync(
+                sot_rows,
+                tgt_rows,
+                pair.unique_id_sot,
+                pair.unique_id_tgt,
+                pair.column_mapping,
+                tgt_headers=tgt_headers,
+                plan=compile_mapping(
+                    pair.column_mapping,
+                    pair.unique_id_sot,
+                    pair.unique_id_tgt,
+                    sot_headers,
+                    tgt_headers,
+                    sot_row_columns=sot_rows.headers,
+                ),
+            )
+        record_change_counts(metrics, change_set)
+        report_file = write_reports(
+            change_set,
+            sot_rows,
+            tgt_rows,
+            pair.unique_id_sot,
+            pair.unique_id_tgt,
+            pair.column_mapping,
+            output_dir,
+            metrics,
+            log_path=str(
+                Path(output_dir) / f"sync_diff_{datetime.now():%Y%m%d_%H%M}.log"
+            ),
+            row_filter=row_filter,
+        )
+    except Exception as e:
+        return metrics, None, None, f"{type(e).__name__}: {e}"
+    return metrics, report_file, change_set.cell_updates(), None
+
+
+def _write_output(
+    tgt_path: str,
+    sheet_updates: Dict[str, Dict[int, Dict[int, str]]],
+    output_dir: str,
+    write_mode: str,
+) -> str:
+    """Write every pair's changed cells into one copy of TGT; return its path."""
+    sheet_updates = {name: cells for name, cells in sheet_updates.items() if cells}
+    if not sheet_updates:
+        output_file = str(build_output_path(tgt_path, output_dir))
+        shutil.copyfile(tgt_path, output_file)
+        logger.info("No changes detected — TGT copied unchanged")
+        return output_file
+    if write_mode == "patch":
+        return patch_tgt_xlsx_sheets(tgt_path, sheet_updates, output_dir)
+    wb, _ = read_tgt_xlsx(tgt_path, next(iter(sheet_updates)))
+    return write_tgt_sheets_xlsx(wb, sheet_updates, tgt_path, output_dir)
+
+
+def _summary(sot_path: str, tgt_path: str, result: MultiSheetResult) -> dict:
+    pairs = []
+    for pair_result in result.pairs:
+        pair = pair_result.pair
+        pairs.append(
+            {
+                "sot_sheet_name": pair.sot_sheet_name,
+                "tgt_sheet_name": pair.tgt_sheet_name,
+                "report_file": pair_result.report_file,
+                "error": pair_result.error,
+                "metrics": pair_result.metrics.to_dict(),
+            }
+        )
+    failed = sum(1 for p in result.pairs if p.error is not None)
+    return {
+        "sot_path": sot_path,
+        "tgt_path": tgt_path,
+        "output_file": result.output_file,
+        "succeeded": len(result.pairs) - failed,
+        "failed": failed,
+        "totals": {name: result.metrics.counters[name] for name in COUNTERS},
+        "metrics": result.metrics.to_dict(),
+        "pairs": pairs,
+    }
+
+
+def _write_summary(summary: dict, output_dir: str) -> str:
+    path = Path(output_dir) / f"sheets_summary_{datetime.now():%Y%m%d_%H%M%S}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    logger.info(f"Sheets summary written to: {path}")
+    return str(path)
+
+
+def _log_summary(result: MultiSheetResult) -> None:
+    result.metrics.log_summary()
+    for pair_result in result.pairs:
+        pair = pair_result.pair
+        if pair_result.error:
+            logger.warning(f"{pair.tgt_sheet_name}: FAILED — {pair_result.error}")
+        else:
+            counters = pair_result.metrics.counters
+            logger.info(
+                f"{pair.sot_sheet_name} -> {pair.tgt_sheet_name}: "
+                f"{counters['cells_changed']} cells updated, "
+                f"{counters['rows_appended']} rows appended, "
+                f"{counters['orphans_found']} orphans -> {pair_result.report_file}"
+            )
+    summary = result.summary
+    logger.info(
+        f"Sheets: {summary['succeeded']} pairs synced, {summary['failed']} failed"
+    )
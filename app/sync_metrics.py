@@ -0,0 +1,191 @@
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, memory deltas are reported as 0
+    resource = None
+
+COUNTERS = [
+    "cells_compared",
+    "cells_changed",
+    "rows_appended",
+    "orphans_found",
+    "bytes_written",
+]
+PROFILE_MODES = (None, "cprofile", "tracemalloc")
+SIDECAR_FORMATS = (None, "json", "prometheus")
+
+# ru_maxrss is in kilobytes on Linux, bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+@dataclass
+class StageMetrics:
+    """Wall time and memory of one run_sync step."""
+
+    name: str
+    wall_s: float
+    # growth of the process peak RSS during the step (0 if the step stayed
+    # below an earlier high-water mark)
+    peak_rss_delta_bytes: int
+    # tracemalloc peak above the step's starting point (profile="tracemalloc")
+    peak_alloc_bytes: Optional[int] = None
+
+
+@dataclass
+class SyncMetrics:
+    """
+    Per-stage timing/memory and counters of one run_sync call.
+
+    profile: None, "cprofile" (whole-run cProfile stats) or "tracemalloc"
+    (per-stage allocation peaks plus the top allocation sites); the capture
+    is saved next to the output workbook by save_profile().
+    """
+
+    profile: Optional[str] = None
+    started_at: str = field(
+        default_factory=lambda: datetime.now().isoformat(timespec="seconds")
+    )
+    stages: List[StageMetrics] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(COUNTERS, 0))
+    total_wall_s: float = 0.0
+    profile_file: Optional[str] = None
+
+    def __post_init__(self):
+        if self.profile not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {self.profile}")
+        self._profiler = None
+        self._snapshot = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time one step and record its peak-memory delta."""
+        rss_before = _peak_rss_bytes()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage = StageMetrics(
+                name=name,
+                wall_s=round(time.perf_counter() - start, 6),
+                peak_rss_delta_bytes=_peak_rss_bytes() - rss_before,
+            )
+            if tracing:
+                stage.peak_alloc_bytes = (
+                    tracemalloc.get_traced_memory()[1] - traced_before
+                )
+            self.stages.append(stage)
+
+    @contextmanager
+    def capture(self):
+        """Run the whole sync under the opt-in profiler, and time it."""
+        start = time.perf_counter()
+        if self.profile == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile == "tracemalloc":
+            tracemalloc.start()
+        try:
+            yield self
+        finally:
+            if self.profile == "cprofile":
+                self._profiler.disable()
+            elif self.profile == "tracemalloc":
+                self._snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+            self.total_wall_s = round(time.perf_counter() - start, 6)
+
+    def save_profile(self, output_file: str) -> Optional[str]:
+        """Write the captured profile next to output_file; returns its path."""
+        out = Path(output_file)
+        if self._profiler is not None:
+            path = out.with_name(f"{out.stem}.prof")
+            self._profiler.dump_stats(path)
+        elif self._snapshot is not None:
+            path = out.with_name(f"{out.stem}.tracemalloc.txt")
+            top = self._snapshot.statistics("lineno")[:50]
+            path.write_text("\n".join(str(s) for s in top) + "\n", encoding="utf-8")
+        else:
+            return None
+        self.profile_file = str(path)
+        logger.info(f"Profile saved to: {path}")
+        return self.profile_file
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "total_wall_s": self.total_wall_s,
+            "stages": [asdict(s) for s in self.stages],
+            "counters": dict(self.counters),
+            "profile": self.profile,
+            "profile_file": self.profile_file,
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus textfile-collector format."""
+        lines = [
+            "# HELP xlsx_sync_stage_seconds Wall time of each run_sync stage.",
+            "# TYPE xlsx_sync_stage_seconds gauge",
+        ]
+        lines += [
+            f'xlsx_sync_stage_seconds{{stage="{s.name}"}} {s.wall_s}'
+            for s in self.stages
+        ]
+        lines += [
+            "# HELP xlsx_sync_stage_peak_rss_delta_bytes Peak RSS growth of each stage.",
+            "# TYPE xlsx_sync_stage_peak_rss_delta_bytes gauge",
+        ]
+        lines += [
+            f'xlsx_sync_stage_peak_rss_delta_bytes{{stage="{s.name}"}} '
+            f"{s.peak_rss_delta_bytes}"
+            for s in self.stages
+        ]
+        lines += [
+            "# HELP xlsx_sync_total_seconds Wall time of the whole run.",
+            "# TYPE xlsx_sync_total_seconds gauge",
+            f"xlsx_sync_total_seconds {self.total_wall_s}",
+        ]
+        for name, value in self.counters.items():
+            lines += [f"# TYPE xlsx_sync_{name} gauge", f"xlsx_sync_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_sidecar(self, output_file: str, fmt: str) -> str:
+        """Write the metrics next to output_file as "json" or "prometheus"."""
+        out = Path(output_file)
+        if fmt == "json":
+            path = out.with_name(f"{out.stem}.metrics.json")
+            path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        elif fmt == "prometheus":
+            path = out.with_name(f"{out.stem}.prom")
+            path.write_text(self.to_prometheus(), encoding="utf-8")
+        else:
+            raise ValueError(f"Unknown metrics sidecar format: {fmt}")
+        logger.info(f"Metrics written to: {path}")
+        return str(path)
+
+    def log_summary(self) -> None:
+        stages = ", ".join(f"{s.name} {s.wall_s:.3f}s" for s in self.stages)
+        counters = ", ".join(f"{k}={v}" for k, v in self.counters.items())
+        logger.info(f"Timings: {stages} (total {self.total_wall_s:.3f}s)")
+        logger.info(f"Counters: {counters}")
@@ -0,0 +1,141 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.data_io.table import Table, headers_of, project
+
+
+class DatasetValidator:
+    """
+    Single-pass validation of one dataset (SOT or TGT).
+
+    Checks header consistency, mapped/ID column presence, missing IDs and
+    duplicate IDs, reporting every problem with its sheet row number.
+
+    Readers call start() with the header row — fatal header problems raise
+    there, before any data row is read — then row() for every data row as it
+    is read, then finish(), which raises with every row-level problem found.
+    validate() runs the same checks on already-loaded rows.
+
+    track_duplicates=False skips the duplicate-ID check, which remembers every
+    ID; callers that see equal IDs side by side anyway (the sort-merge join)
+    report them through report_duplicates() instead.
+
+    require_ids makes a row without a unique ID an error (default: for SOT
+    only, the fatal validation the README lists); otherwise it is a warning
+    and the row is never matched.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        unique_id_col: str,
+        mapped_columns: Sequence[str],
+        track_duplicates: bool = True,
+        require_ids: Optional[bool] = None,
+    ):
+        self.label = label
+        self.unique_id_col = unique_id_col
+        self.mapped_columns = list(mapped_columns)
+        self.track_duplicates = track_duplicates
+        self.require_ids = label == "SOT" if require_ids is None else require_ids
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.row_count = 0
+        self._id_position: Optional[int] = None
+        self._first_seen: Dict[str, int] = {}
+
+    def start(self, headers: Sequence[str]) -> None:
+        """Check the header row (named columns only, in data row order)."""
+        columns = set(headers)
+        header_errors = [
+            f"{self.label} column '{col}' not found in {self.label} headers."
+            for col in self.mapped_columns
+            if col not in columns
+        ]
+        if self.unique_id_col not in columns:
+            header_errors.append(
+                f"{self.label} unique ID column '{self.unique_id_col}' not found "
+                f"in {self.label} headers."
+            )
+        if header_errors:
+            self.errors.extend(header_errors)
+            self._fail()
+        self._id_position = list(headers).index(self.unique_id_col)
+
+    def row(self, row_number: int, values: Sequence[str]) -> None:
+        """Check one data row (values in the order of the headers given to start())."""
+        self._check_id(row_number, values[self._id_position])
+
+    def finish(self) -> None:
+        """Raise ValueError listing every problem found, if any; log warnings."""
+        if not self.row_count and not self.errors:
+            self.errors.append(f"{self.label} is empty — cannot validate mapping.")
+        for warning in self.warnings:
+            logger.warning(f"{self.label} {warning}")
+        if self.errors:
+            self._fail()
+
+    def validate(self, rows, row_numbers: Optional[Sequence[int]] = None) -> None:
+        """
+        Run every check over loaded rows (a Table or a list of row dicts).
+        row_numbers defaults to the Table's sheet rows, or 2, 3, ... for dicts.
+        """
+        if not rows:
+            self.finish()
+            return
+        headers = headers_of(rows)
+        if not isinstance(rows, Table):
+            # a Table shares one header list, so only row dicts can disagree
+            expected = set(headers)
+            for i, row in enumerate(rows[1:], start=3):
+                if row.keys() != expected:
+                    self.errors.append(
+                        f"row {i}: inconsistent columns "
+                        f"(expected {sorted(expected)}, found {sorted(row.keys())})"
+                    )
+        self.start(headers)
+
+        if row_numbers is None:
+            row_numbers = (
+                rows.row_numbers if isinstance(rows, Table) else range(2, len(rows) + 2)
+            )
+        for row_number, (rec_id,) in zip(
+            row_numbers, project(rows, [self.unique_id_col])
+        ):
+            self._check_id(row_number, rec_id)
+        self.finish()
+
+    def report_duplicates(self, duplicates: Iterable[Tuple[int, str, int]]) -> None:
+        """
+        Raise ValueError for duplicate IDs found outside row(), given as
+        (sheet row, ID, row where the ID was first seen).
+        """
+        for row_number, rec_id, first in duplicates:
+            self._duplicate(row_number, rec_id, first)
+        if self.errors:
+            self._fail()
+
+    def _check_id(self, row_number: int, rec_id: Optional[str]) -> None:
+        self.row_count += 1
+        if not rec_id:
+            problem = f"row {row_number}: missing unique ID '{self.unique_id_col}'"
+            (self.errors if self.require_ids else self.warnings).append(problem)
+            return
+        if not self.track_duplicates:
+            return
+        first = self._first_seen.setdefault(rec_id, row_number)
+        if first != row_number:
+            self._duplicate(row_number, rec_id, first)
+
+    def _duplicate(self, row_number: int, rec_id: str, first: int) -> None:
+        self.errors.append(
+            f"row {row_number}: duplicate ID '{rec_id}' (first seen at row {first})"
+        )
+
+    def _fail(self) -> None:
+        message = f"{self.label} validation failed:\n" + "\n".join(
+            f"- {error}" for error in self.errors
+        )
+        logger.error(f"Validation failed: {message}")
+        raise ValueError(message)
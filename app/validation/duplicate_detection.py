@@ -1,5 +1,7 @@
 from typing import List, Dict
 
+from app.data_io.table import project
+
 
 def ensure_no_duplicate_ids(rows: List[Dict[str, str]], unique_id_col: str, label: str):
     """
@@ -8,8 +10,7 @@ def ensure_no_duplicate_ids(rows: List[Dict[str, str]], unique_id_col: str, labe
     seen = set()
     duplicates = []
 
-    for r in rows:
-        uid = r.get(unique_id_col)
+    for (uid,) in project(rows, [unique_id_col]):
         if uid in seen:
             duplicates.append(uid)
         else:
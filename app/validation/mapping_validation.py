@@ -1,5 +1,8 @@
 from typing import Dict, List
 
+from app.data_io.table import Table, headers_of
+from app.data_sync.mapping_plan import mapping_errors
+
 
 def validate_column_mapping(
     sot_rows: List[Dict[str, str]],
@@ -10,7 +13,9 @@ def validate_column_mapping(
     Validate that all mapped SOT and TGT columns exist in their respective datasets.
 
     Returns a list of error messages (empty list means mapping is valid).
-    Designed for early pre-sync validation.
+    Designed for early pre-sync validation; the checks are those of
+    compile_mapping(), which the sync runs on the header rows. To check the
+    files before loading them, use preflight(), which reads the header rows only.
     """
     errors = []
 
@@ -21,24 +26,16 @@ def validate_column_mapping(
         errors.append("TGT is empty — cannot validate mapping.")
         return errors
 
-    sot_columns = set(sot_rows[0].keys())
-    tgt_columns = set(tgt_rows[0].keys())
-
-    for sot_col, tgt_col in column_mapping.items():
-        if sot_col not in sot_columns:
-            errors.append(f"SOT column '{sot_col}' not found in SOT headers.")
-        if tgt_col not in tgt_columns:
-            errors.append(f"TGT column '{tgt_col}' not found in TGT headers.")
-
-    return errors
+    return mapping_errors(column_mapping, headers_of(sot_rows), headers_of(tgt_rows))
 
 
 def ensure_consistent_headers(rows: list[dict], dataset_name: str = "SOT") -> None:
     """
     Ensure all rows in a dataset (SOT/TGT) have consistent column headers.
     Raises ValueError if inconsistencies are detected.
+    A Table shares one header list across all rows, so it is consistent by construction.
     """
-    if not rows:
+    if not rows or isinstance(rows, Table):
         return
 
     expected_keys = set(rows[0].keys())
@@ -0,0 +1,96 @@
+"""
+Header-only check of a sync's configuration.
+
+preflight() opens the SOT and TGT workbooks, reads only each sheet's stored
+dimension and header row, and checks the sheet names, the unique ID columns
+and every mapped column. A typo in config.py is reported in milliseconds,
+before either workbook is loaded.
+"""
+
+import zipfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from loguru import logger
+from openpyxl.utils.exceptions import InvalidFileException
+
+from config import XLSX_READ_BACKEND
+from app.data_io.xlsx_io import SheetHeader, read_sot_header, read_tgt_header
+from app.data_sync.mapping_plan import mapping_errors
+
+
+@dataclass
+class PreflightResult:
+    """The headers found (None for a sheet that could not be read) and every problem."""
+
+    sot: Optional[SheetHeader] = None
+    tgt: Optional[SheetHeader] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """Raise ValueError listing every problem found, if any."""
+        if self.errors:
+            message = "Preflight failed:\n" + "\n".join(
+                f"- {error}" for error in self.errors
+            )
+            logger.error(message)
+            raise ValueError(message)
+
+
+def preflight(
+    sot_path: str,
+    tgt_path: str,
+    sot_sheet_name: str,
+    tgt_sheet_name: str,
+    unique_id_sot: str,
+    unique_id_tgt: str,
+    column_mapping: Dict[str, str],
+    backend: str = XLSX_READ_BACKEND,
+) -> PreflightResult:
+    """
+    Check a sync's configuration against the header rows of both sheets.
+
+    Unreadable files and missing sheets are reported per side; the mapped and
+    ID columns are checked against every header row that could be read.
+    Returns a PreflightResult (see raise_for_errors()).
+    """
+    result = PreflightResult()
+    for label, reader, path, sheet_name in (
+        ("SOT", read_sot_header, sot_path, sot_sheet_name),
+        ("TGT", read_tgt_header, tgt_path, tgt_sheet_name),
+    ):
+        try:
+            header = reader(path, sheet_name, backend=backend)
+        except (OSError, ValueError, zipfile.BadZipFile, InvalidFileException) as e:
+            result.errors.append(f"{label} cannot be read: {e}")
+            continue
+        setattr(result, label.lower(), header)
+        size = (
+            f"about {max(header.max_row - 1, 0)} records"
+            if header.max_row is not None
+            else "size unknown"
+        )
+        logger.info(
+            f"{label} header: {len(header.headers)} columns, {size} "
+            f"({path} [{sheet_name}])"
+        )
+
+    # a side that could not be read is checked no further: give it every column
+    sot_headers = result.sot.headers if result.sot else [unique_id_sot, *column_mapping]
+    tgt_headers = (
+        result.tgt.headers if result.tgt else [unique_id_tgt, *column_mapping.values()]
+    )
+    result.errors.extend(
+        mapping_errors(
+            column_mapping,
+            sot_headers,
+            tgt_headers,
+            unique_id_sot=unique_id_sot,
+            unique_id_tgt=unique_id_tgt,
+        )
+    )
+    return result
@@ -1,17 +1,78 @@
 from loguru import logger
-import copy
+import os
+import shutil
+from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
+from typing import Optional
 
-from config import OUTPUT_DIR
-from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_xlsx, write_tgt_xlsx
-from app.data_sync.sync_engine import sync_sot_to_tgt
-from app.data_sync.diff_report import generate_diff_report
+from config import (
+    INCREMENTAL_SYNC,
+    METRICS_SIDECAR,
+    OUTPUT_DIR,
+    PARALLEL_READ,
+    PARSE_CACHE,
+    PARSE_CACHE_DIRNAME,
+    PROFILE_MODE,
+    SYNC_ENGINE,
+    SYNC_PREFIXED_IDS_ONLY,
+    STREAMING_SYNC,
+    SYNC_STATE_FILENAME,
+    TGT_WRITE_MODE,
+)
+from app.data_io.parallel_read import read_sheets_parallel
+from app.data_io.parse_cache import ParseCache
+from app.data_io.table import project
+from app.data_io.xlsx_io import (
+    build_output_path,
+    projected_columns,
+    read_sot_xlsx,
+    read_tgt_values,
+    read_tgt_xlsx,
+    stream_sot_rows,
+    stream_tgt_rows,
+    write_tgt_xlsx,
+)
+from app.data_io.xlsx_patch import patch_tgt_xlsx, patch_tgt_xlsx_streaming
+from app.data_sync.sync_engine import sync_sot_to_tgt, sync_sot_to_tgt_vectorized
+from app.data_sync.diff_report import (
+    DiffReportWriter,
+    generate_diff_report_from_change_set,
+)
 from app.data_sync.orphan_detection import generate_orphan_report_to_log
-from app.validation.mapping_validation import (
-    validate_column_mapping,
-    ensure_consistent_headers,
+from app.data_sync.sort_merge import (
+    ExternalSorter,
+    merge_changes,
+    spill_sot_rows,
+    spill_tgt_rows,
+)
+from app.data_sync.mapping_plan import compile_mapping, sot_projection
+from app.data_sync.row_filter import RowFilter, compile_row_filter
+from app.data_sync.stream_sync import index_sot_rows, stream_row_updates
+from app.data_sync.sync_state import (
+    build_state_entry,
+    changed_sot_positions,
+    file_signature,
+    id_fingerprints,
+    load_sync_state,
+    mapping_key,
+    reusable_output,
+    save_sync_state,
+    state_entry_key,
+    written_fingerprints,
 )
-from app.validation.duplicate_detection import ensure_no_duplicate_ids
+from app.validation.dataset_validation import DatasetValidator
+from app.validation.preflight import preflight
+from app.sync_metrics import PROFILE_MODES, SIDECAR_FORMATS, SyncMetrics
+
+
+@dataclass
+class SyncResult:
+    """Outcome of run_sync: the output workbook and the metrics of the run."""
+
+    output_file: str
+    metrics: SyncMetrics
+    metrics_file: Optional[str] = None  # JSON/Prometheus sidecar, if requested
 
 
 def run_sync(
@@ -23,87 +84,608 @@ def run_sync(
     unique_id_tgt: str,
     column_mapping: dict,
     output_dir: str = OUTPUT_DIR,
-):
+    write_mode: str = TGT_WRITE_MODE,
+    engine: str = SYNC_ENGINE,
+    incremental: bool = INCREMENTAL_SYNC,
+    parse_cache: bool = PARSE_CACHE,
+    parallel_read: bool = PARALLEL_READ,
+    metrics_sidecar: Optional[str] = METRICS_SIDECAR,
+    profile: Optional[str] = PROFILE_MODE,
+    streaming: bool = STREAMING_SYNC,
+    prefixed_ids_only: bool = SYNC_PREFIXED_IDS_ONLY,
+) -> SyncResult:
     """
     End-to-end synchronization between SOT and TGT XLSX files.
     Keeps main.py minimal by handling all orchestration logic here.
+    Sheet names, ID and mapped columns are first checked against the header
+    rows alone (see preflight()), so config mistakes raise ValueError before
+    either workbook is loaded.
+
+    write_mode selects the TGT writer: "openpyxl" (full load/save) or
+    "patch" (XML-level rewrite of the changed cells in the TGT sheet only;
+    the other sheets and parts are copied without being parsed).
+    engine selects the comparison: "python" (per cell), "vectorized" (NumPy)
+    or "sort_merge" (external sort-merge join, see _run_sync_sort_merge(); as
+    with streaming, incremental, parse_cache and parallel_read do not apply).
+    incremental keeps a sync state in output_dir: if SOT and TGT are unchanged
+    since the last run, its output is returned without parsing anything;
+    otherwise only the records whose fingerprints moved are re-synced.
+    parse_cache reuses parsed SOT/TGT sheets (keyed by file content) from
+    output_dir, so unchanged inputs are not parsed again.
+    parallel_read parses SOT and TGT at the same time in two worker processes.
+    streaming runs the generator pipeline instead (see _run_sync_streaming()):
+    memory is bounded by an index of the mapped SOT values, and engine,
+    incremental, parse_cache and parallel_read do not apply.
+    prefixed_ids_only skips SOT records whose ID lacks UNIQUE_ID_PREFIX while
+    the SOT is read, so they are not synced at all (by default they are
+    synced and only left out of the report). The prefix and orphan status
+    filters are compiled once (see RowFilter) and shared by every stage.
+
+    Returns a SyncResult: the output path plus per-stage timings, peak-memory
+    deltas and counters (see SyncMetrics). metrics_sidecar ("json" or
+    "prometheus") also writes them next to the output workbook; profile
+    ("cprofile" or "tracemalloc") saves a profile of the run there too.
     """
+    if write_mode not in ("openpyxl", "patch"):
+        raise ValueError(f"Unknown TGT write mode: {write_mode}")
+    if engine not in ("python", "vectorized", "sort_merge"):
+        raise ValueError(f"Unknown sync engine: {engine}")
+    if metrics_sidecar not in SIDECAR_FORMATS:
+        raise ValueError(f"Unknown metrics sidecar format: {metrics_sidecar}")
+    if profile not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {profile}")
+
+    row_filter = compile_row_filter()
+    sot_filter = row_filter.id_filter(unique_id_sot) if prefixed_ids_only else None
+    metrics = SyncMetrics(profile=profile)
+    with metrics.capture():
+        with metrics.stage("preflight"):
+            preflight(
+                sot_path,
+                tgt_path,
+                sot_sheet_name,
+                tgt_sheet_name,
+                unique_id_sot,
+                unique_id_tgt,
+                column_mapping,
+            ).raise_for_errors()
+        if engine == "sort_merge":
+            output_file = _run_sync_sort_merge(
+                sot_path,
+                tgt_path,
+                sot_sheet_name,
+                tgt_sheet_name,
+                unique_id_sot,
+                unique_id_tgt,
+                column_mapping,
+                output_dir,
+                write_mode,
+                row_filter,
+                sot_filter,
+                metrics,
+            )
+        elif streaming:
+            output_file = _run_sync_streaming(
+                sot_path,
+                tgt_path,
+                sot_sheet_name,
+                tgt_sheet_name,
+                unique_id_sot,
+                unique_id_tgt,
+                column_mapping,
+                output_dir,
+                write_mode,
+                row_filter,
+                sot_filter,
+                metrics,
+            )
+        else:
+            output_file = _run_sync(
+                sot_path,
+                tgt_path,
+                sot_sheet_name,
+                tgt_sheet_name,
+                unique_id_sot,
+                unique_id_tgt,
+                column_mapping,
+                output_dir,
+                write_mode,
+                engine,
+                incremental,
+                parse_cache,
+                parallel_read,
+                row_filter,
+                sot_filter,
+                metrics,
+            )
+    metrics.log_summary()
+
+    result = SyncResult(output_file=output_file, metrics=metrics)
+    metrics.save_profile(output_file)
+    if metrics_sidecar:
+        result.metrics_file = metrics.write_sidecar(output_file, metrics_sidecar)
+    return result
+
+
+def _run_sync(
+    sot_path: str,
+    tgt_path: str,
+    sot_sheet_name: str,
+    tgt_sheet_name: str,
+    unique_id_sot: str,
+    unique_id_tgt: str,
+    column_mapping: dict,
+    output_dir: str,
+    write_mode: str,
+    engine: str,
+    incremental: bool,
+    parse_cache: bool,
+    parallel_read: bool,
+    row_filter: RowFilter,
+    sot_filter,
+    metrics: SyncMetrics,
+) -> str:
+    """The run_sync pipeline; every step is timed in metrics. Returns the output path."""
     logger.info("=== XLSX Delta Sync Starting ===")
 
-    # Step 1: Read SOT (data only)
-    sot_headers, sot_rows = read_sot_xlsx(sot_path, sot_sheet_name)
+    # Step 0: Incremental sync — compare the inputs with the last successful run
+    if incremental:
+        with metrics.stage("state_check"):
+            state_path = Path(output_dir) / SYNC_STATE_FILENAME
+            state_key = state_entry_key(sot_path, sot_sheet_name, tgt_sheet_name)
+            state_mapping = mapping_key(
+                sot_sheet_name,
+                tgt_sheet_name,
+                unique_id_sot,
+                unique_id_tgt,
+                column_mapping,
+                sot_id_prefix=row_filter.id_prefix if sot_filter else None,
+            )
+            state = load_sync_state(state_path, state_key, state_mapping)
+            previous = state or {}
+            sot_sig = file_signature(sot_path, [previous.get("sot")])
+            tgt_sig = file_signature(
+                tgt_path, [previous.get("tgt"), previous.get("output")]
+            )
+            previous_output = reusable_output(state, sot_sig, tgt_sig)
+            if previous_output:
+                logger.info(
+                    "Incremental sync: SOT and TGT unchanged since the last run — "
+                    f"sync SKIPPED, returning the previous output {previous_output} "
+                    "(no new workbook or report written)"
+                )
+                logger.info("=== Sync Complete ===")
+                return previous_output
+
+    # Parsed sheets are reused across runs while the input files are unchanged
+    cache = ParseCache(Path(output_dir) / PARSE_CACHE_DIRNAME) if parse_cache else None
+
+    # Steps 1-2: Read SOT and TGT (data only), each validated in the same pass:
+    # mapped/ID columns are checked before any row is read, missing/duplicate
+    # IDs row by row. Row fingerprints of the mapped columns let unchanged
+    # records skip comparison. TGT formatting is only loaded if something changes.
+    # Only the ID and mapped SOT columns are parsed. TGT is read whole: the
+    # sentinel text is looked for in every column of a record.
+    sot_read = (
+        read_sot_xlsx,
+        sot_path,
+        sot_sheet_name,
+        dict(
+            columns=sot_projection(column_mapping, unique_id_sot),
+            where=sot_filter,
+            fingerprint_columns=list(column_mapping.keys()),
+            validator=DatasetValidator(
+                "SOT", unique_id_sot, list(column_mapping.keys())
+            ),
+        ),
+    )
+    tgt_read = (
+        read_tgt_values,
+        tgt_path,
+        tgt_sheet_name,
+        dict(
+            fingerprint_columns=list(column_mapping.values()),
+            validator=DatasetValidator(
+                "TGT", unique_id_tgt, list(column_mapping.values())
+            ),
+        ),
+    )
+    if parallel_read:
+        # independent CPU-bound parses: one worker process each
+        with metrics.stage("read"):
+            (sot_headers, sot_rows), (tgt_headers, tgt_rows) = read_sheets_parallel(
+                [sot_read, tgt_read], cache
+            )
+    else:
+        with metrics.stage("read_sot"):
+            reader, path, sheet, kwargs = sot_read
+            sot_headers, sot_rows = read_sheet(cache, reader, path, sheet, **kwargs)
+        with metrics.stage("read_tgt"):
+            reader, path, sheet, kwargs = tgt_read
+            tgt_headers, tgt_rows = read_sheet(cache, reader, path, sheet, **kwargs)
     logger.info(
         f"SOT loaded with {len(sot_rows)} records and {len(sot_headers)} columns"
     )
-
-    # Step 2: Read TGT (with formatting)
-    wb, ws = read_tgt_xlsx(tgt_path, tgt_sheet_name)
-    tgt_headers = [
-        c for c in next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
-    ]
-    tgt_rows = [
-        dict(zip(tgt_headers, row)) for row in ws.iter_rows(min_row=2, values_only=True)
-    ]
+    if cache:
+        cache.log_stats()
     logger.info(
         f"TGT loaded with {len(tgt_rows)} records and {len(tgt_headers)} columns"
     )
 
-    # Validation: Headers in config.py must exist in SOT and TGT
-    try:
-        # Headers consistency check (optional)
-        ensure_consistent_headers(sot_rows, "SOT")
-        ensure_consistent_headers(tgt_rows, "TGT")
+    # Step 3: Perform sync logic (incremental: only records changed since last run)
+    with metrics.stage("sync"):
+        changed_rows = sot_rows
+        if incremental:
+            sot_fingerprints = id_fingerprints(
+                sot_rows, unique_id_sot, list(column_mapping.keys())
+            )
+            tgt_fingerprints = id_fingerprints(
+                tgt_rows, unique_id_tgt, list(column_mapping.values())
+            )
+            if state:
+                sot_ids = [rec_id for (rec_id,) in project(sot_rows, [unique_id_sot])]
+                positions = changed_sot_positions(
+                    state, sot_fingerprints, tgt_fingerprints, sot_ids
+                )
+                logger.info(
+                    f"Incremental sync: {len(positions)} of {len(sot_rows)} SOT records "
+                    "changed since last sync"
+                )
+                changed_rows = sot_rows.subset(positions)
 
-        # Column mapping validation - mapped columns on both left and right hand side must exist in the XLSX files
-        mapping_errors = validate_column_mapping(sot_rows, tgt_rows, column_mapping)
-        if mapping_errors:
-            raise ValueError(
-                "Column mapping validation failed:\n"
-                + "\n".join(f"- {err}" for err in mapping_errors)
+        plan = compile_mapping(
+            column_mapping,
+            unique_id_sot,
+            unique_id_tgt,
+            sot_headers,
+            tgt_headers,
+            sot_row_columns=sot_rows.headers,
+        )
+        sync = sync_sot_to_tgt_vectorized if engine == "vectorized" else sync_sot_to_tgt
+        change_set = sync(
+            changed_rows,
+            tgt_rows,
+            unique_id_sot,
+            unique_id_tgt,
+            column_mapping,
+            tgt_headers=tgt_headers,
+            plan=plan,
+        )
+    record_change_counts(metrics, change_set)
+
+    # Step 4: Write updated TGT preserving format (only the changed cells)
+    output_file = write_output(
+        change_set, tgt_path, tgt_sheet_name, output_dir, write_mode, metrics
+    )
+
+    # Steps 5-6: Diff report and orphaned records, in the same log
+    write_reports(
+        change_set,
+        sot_rows,
+        tgt_rows,
+        unique_id_sot,
+        unique_id_tgt,
+        column_mapping,
+        output_dir,
+        metrics,
+        row_filter=row_filter,
+    )
+
+    # Step 7: Remember this run for the next incremental sync
+    if incremental:
+        with metrics.stage("save_state"):
+            save_sync_state(
+                state_path,
+                state_key,
+                build_state_entry(
+                    state_mapping,
+                    sot_sig,
+                    tgt_sig,
+                    file_signature(output_file),
+                    sot_fingerprints,
+                    written_fingerprints(
+                        tgt_fingerprints, change_set, list(column_mapping.values())
+                    ),
+                ),
             )
 
-        # Check for duplicate unique IDs in SOT and TGT
-        ensure_no_duplicate_ids(sot_rows, unique_id_sot, "SOT")
-        ensure_no_duplicate_ids(tgt_rows, unique_id_tgt, "TGT")
+    logger.info("=== Sync Complete ===")
+    return output_file
 
-    except Exception as e:
-        logger.error(f"Validation failed: {e}")
-        raise
 
-    original_tgt_rows = copy.deepcopy(tgt_rows)
+def _run_sync_streaming(
+    sot_path: str,
+    tgt_path: str,
+    sot_sheet_name: str,
+    tgt_sheet_name: str,
+    unique_id_sot: str,
+    unique_id_tgt: str,
+    column_mapping: dict,
+    output_dir: str,
+    write_mode: str,
+    row_filter: RowFilter,
+    sot_filter,
+    metrics: SyncMetrics,
+) -> str:
+    """
+    The run_sync pipeline built from generators. SOT rows are validated and
+    indexed (ID -> mapped values) as they are parsed. TGT rows are then
+    parsed, validated and matched one at a time; each change goes straight to
+    the report and, in "patch" mode, to the sheet writer, which patches the
+    TGT XML in step with the reader. Apart from the SOT index only the current
+    row is held ("openpyxl" mode also keeps the changed cells until the
+    workbook is written). Updated records are reported in TGT sheet order.
+    """
+    logger.info("=== XLSX Delta Sync Starting (streaming) ===")
 
-    # Step 3: Perform sync logic
-    updated_rows = sync_sot_to_tgt(
-        sot_rows, tgt_rows, unique_id_sot, unique_id_tgt, column_mapping
+    with metrics.stage("index_sot"):
+        sot_validator = DatasetValidator(
+            "SOT", unique_id_sot, list(column_mapping.keys())
+        )
+        sot_columns = sot_projection(column_mapping, unique_id_sot)
+        sot_headers, sot_rows = stream_sot_rows(
+            sot_path,
+            sot_sheet_name,
+            validator=sot_validator,
+            columns=sot_columns,
+            where=sot_filter,
+        )
+        # both header rows are needed to compile the mapping; TGT rows are
+        # only read once the SOT is indexed
+        tgt_validator = DatasetValidator(
+            "TGT", unique_id_tgt, list(column_mapping.values())
+        )
+        tgt_headers, tgt_rows = stream_tgt_rows(
+            tgt_path, tgt_sheet_name, validator=tgt_validator
+        )
+        plan = compile_mapping(
+            column_mapping,
+            unique_id_sot,
+            unique_id_tgt,
+            sot_headers,
+            tgt_headers,
+            sot_row_columns=projected_columns(sot_headers, sot_columns),
+        )
+        sot_index = index_sot_rows(sot_rows, plan)
+    logger.info(
+        f"SOT indexed: {sot_validator.row_count} records, {len(sot_headers)} columns"
     )
 
-    # Step 4: Write updated TGT preserving format
-    output_file = write_tgt_xlsx(wb, ws, updated_rows, tgt_path, output_dir)
+    with metrics.stage("sync_write"):
+        report = DiffReportWriter(
+            datetime.now().strftime("%Y%m%d_%H%M"),
+            column_mapping,
+            output_dir,
+            row_filter=row_filter,
+        )
+        updates = stream_row_updates(
+            sot_index, tgt_rows, plan, report, metrics.counters
+        )
+        if write_mode == "patch":
+            output_file, _ = patch_tgt_xlsx_streaming(
+                tgt_path, tgt_sheet_name, updates, output_dir
+            )
+        else:
+            cell_updates = dict(updates)
+            if cell_updates:
+                wb, ws = read_tgt_xlsx(tgt_path, tgt_sheet_name)
+                output_file = write_tgt_xlsx(wb, ws, cell_updates, tgt_path, output_dir)
+            else:
+                output_file = str(build_output_path(tgt_path, output_dir))
+                shutil.copyfile(tgt_path, output_file)
+        report.close()
+    logger.info(
+        f"TGT streamed: {tgt_validator.row_count} records, "
+        f"{metrics.counters['cells_changed']} cells updated, "
+        f"{metrics.counters['rows_appended']} rows appended"
+    )
+    metrics.counters["bytes_written"] = os.path.getsize(output_file)
     logger.success(f"Updated TGT written to: {output_file}")
+    logger.info("=== Sync Complete ===")
+    return output_file
+
+
+def _run_sync_sort_merge(
+    sot_path: str,
+    tgt_path: str,
+    sot_sheet_name: str,
+    tgt_sheet_name: str,
+    unique_id_sot: str,
+    unique_id_tgt: str,
+    column_mapping: dict,
+    output_dir: str,
+    write_mode: str,
+    row_filter: RowFilter,
+    sot_filter,
+    metrics: SyncMetrics,
+) -> str:
+    """
+    The run_sync pipeline with the external sort-merge join: SOT and TGT are
+    streamed into sorted runs on disk (ID + mapped values only), joined by ID
+    in one pass, and the changes are written and reported from sorted spills.
+    Memory is bounded by SORT_MERGE_RUN_ROWS per sorter, whatever the sheet
+    sizes; output and report are the same as with the hash-join engines.
+    Duplicate IDs are found during the join, so they are reported only after
+    both sheets have been read (but before anything is written).
+    """
+    logger.info("=== XLSX Delta Sync Starting (sort-merge) ===")
+
+    with ExternalSorter() as sot_sorted, ExternalSorter() as tgt_sorted:
+        with metrics.stage("spill_sot"):
+            sot_validator = DatasetValidator(
+                "SOT", unique_id_sot, list(column_mapping), track_duplicates=False
+            )
+            sot_columns = sot_projection(column_mapping, unique_id_sot)
+            sot_headers, sot_rows = stream_sot_rows(
+                sot_path,
+                sot_sheet_name,
+                validator=sot_validator,
+                columns=sot_columns,
+                where=sot_filter,
+            )
+            # both header rows are needed to compile the mapping; TGT rows are
+            # only read once the SOT is spilled
+            tgt_validator = DatasetValidator(
+                "TGT",
+                unique_id_tgt,
+                list(column_mapping.values()),
+                track_duplicates=False,
+            )
+            tgt_headers, tgt_rows = stream_tgt_rows(
+                tgt_path, tgt_sheet_name, validator=tgt_validator
+            )
+            plan = compile_mapping(
+                column_mapping,
+                unique_id_sot,
+                unique_id_tgt,
+                sot_headers,
+                tgt_headers,
+                sot_row_columns=projected_columns(sot_headers, sot_columns),
+            )
+            spill_sot_rows(sot_rows, plan, sot_sorted)
+        logger.info(f"SOT spilled: {sot_validator.row_count} records")
+
+        with metrics.stage("spill_tgt"):
+            last_row = spill_tgt_rows(tgt_rows, plan, tgt_sorted, row_filter)
+        logger.info(f"TGT spilled: {tgt_validator.row_count} records")
+
+        with metrics.stage("merge_join"):
+            changes = merge_changes(
+                sot_sorted, tgt_sorted, plan, last_row, metrics.counters
+            )
 
-    # Step 5: Generate diff report comparing SOT vs updated TGT
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
     try:
-        generate_diff_report(
-            timestamp=timestamp,
-            old_rows=original_tgt_rows,
-            new_rows=updated_rows,
-            unique_id_col=unique_id_tgt,
-            column_mapping=column_mapping,
-            output_dir=output_dir,
+        sot_validator.report_duplicates(changes.sot_duplicates)
+        tgt_validator.report_duplicates(changes.tgt_duplicates)
+        logger.info(
+            f"Change set: {metrics.counters['cells_changed']} cells updated, "
+            f"{metrics.counters['rows_appended']} rows appended"
         )
-    except Exception as e:
-        logger.warning(f"Diff report generation failed: {e}")
-
-    # Step 6: Orphaned records appended to same diff log
-    generate_orphan_report_to_log(
-        timestamp=timestamp,
-        sot_rows=sot_rows,
-        tgt_rows=updated_rows,
-        unique_id_sot=unique_id_sot,
-        unique_id_tgt=unique_id_tgt,
-        column_mapping=column_mapping,
-    )
+
+        with metrics.stage("write"):
+            if changes.is_empty():
+                output_file = str(build_output_path(tgt_path, output_dir))
+                shutil.copyfile(tgt_path, output_file)
+                logger.info("No changes detected — TGT copied unchanged")
+            elif write_mode == "patch":
+                output_file, _ = patch_tgt_xlsx_streaming(
+                    tgt_path, tgt_sheet_name, changes.row_updates(), output_dir
+                )
+            else:
+                wb, ws = read_tgt_xlsx(tgt_path, tgt_sheet_name)
+                output_file = write_tgt_xlsx(
+                    wb, ws, dict(changes.row_updates()), tgt_path, output_dir
+                )
+        metrics.counters["bytes_written"] = os.path.getsize(output_file)
+        logger.success(f"Updated TGT written to: {output_file}")
+
+        with metrics.stage("diff"):
+            report = DiffReportWriter(
+                datetime.now().strftime("%Y%m%d_%H%M"),
+                column_mapping,
+                output_dir,
+                row_filter=row_filter,
+            )
+            changes.write_report(report)
+            report.close()
+        metrics.counters["orphans_found"] = report.orphans_found
+    finally:
+        changes.close()
 
     logger.info("=== Sync Complete ===")
     return output_file
+
+
+def read_sheet(cache, reader, file_path: str, sheet_name: str, **kwargs):
+    """Call a sheet reader, through the parse cache if one is enabled."""
+    if cache is None:
+        return reader(file_path, sheet_name, **kwargs)
+    return cache.read(reader, file_path, sheet_name, **kwargs)
+
+
+def record_change_counts(metrics: SyncMetrics, change_set) -> None:
+    metrics.counters["cells_compared"] = change_set.cells_compared
+    metrics.counters["cells_changed"] = len(change_set.cell_changes)
+    metrics.counters["rows_appended"] = len(change_set.appended_rows)
+    logger.info(
+        f"Change set: {len(change_set.cell_changes)} cells updated, "
+        f"{len(change_set.appended_rows)} rows appended"
+    )
+
+
+def write_output(
+    change_set,
+    tgt_path: str,
+    tgt_sheet_name: str,
+    output_dir: str,
+    write_mode: str,
+    metrics: SyncMetrics,
+) -> str:
+    """Write the updated TGT (only the changed cells) and return its path."""
+    with metrics.stage("write"):
+        cell_updates = change_set.cell_updates()
+        if change_set.is_empty():
+            # Nothing to change: the original file is already the right output
+            output_file = str(build_output_path(tgt_path, output_dir))
+            shutil.copyfile(tgt_path, output_file)
+            logger.info("No changes detected — TGT copied unchanged")
+        elif write_mode == "patch":
+            output_file = patch_tgt_xlsx(
+                tgt_path, tgt_sheet_name, cell_updates, output_dir
+            )
+        else:
+            wb, ws = read_tgt_xlsx(tgt_path, tgt_sheet_name)
+            output_file = write_tgt_xlsx(wb, ws, cell_updates, tgt_path, output_dir)
+    metrics.counters["bytes_written"] = os.path.getsize(output_file)
+    logger.success(f"Updated TGT written to: {output_file}")
+    return output_file
+
+
+def write_reports(
+    change_set,
+    sot_rows,
+    tgt_rows,
+    unique_id_sot: str,
+    unique_id_tgt: str,
+    column_mapping: dict,
+    output_dir: str,
+    metrics: SyncMetrics,
+    log_path: Optional[str] = None,
+    sot_ids: Optional[set] = None,
+    row_filter: Optional[RowFilter] = None,
+) -> str:
+    """
+    Diff report from the change set (old values recorded by the engine), then
+    the orphaned records appended to the same log (config.LOG_PATH unless
+    log_path is given), both filtered by row_filter (default: compiled from
+    config). Returns the log path.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+    report_file = log_path
+    with metrics.stage("diff"):
+        try:
+            report_file = generate_diff_report_from_change_set(
+                timestamp=timestamp,
+                change_set=change_set,
+                column_mapping=column_mapping,
+                output_dir=output_dir,
+                log_path=log_path,
+                row_filter=row_filter,
+            )
+        except Exception as e:
+            logger.warning(f"Diff report generation failed: {e}")
+
+    # (orphans are never touched by the sync, so the unmodified TGT rows are exact)
+    with metrics.stage("orphans"):
+        metrics.counters["orphans_found"] = generate_orphan_report_to_log(
+            timestamp=timestamp,
+            sot_rows=sot_rows,
+            tgt_rows=tgt_rows,
+            unique_id_sot=unique_id_sot,
+            unique_id_tgt=unique_id_tgt,
+            column_mapping=column_mapping,
+            log_path=log_path,
+            sot_ids=sot_ids,
+            row_filter=row_filter,
+        )
+    return report_file
@@ -0,0 +1,359 @@
+"""
+Benchmark the run_sync stages on synthetic SOT/TGT pairs.
+
+    python -m benchmarks.run_benchmarks --rows 10000 100000 1000000
+    python -m benchmarks.run_benchmarks --rows 10000 --compare old.json
+    python -m benchmarks.run_benchmarks --rows 100000 --backend openpyxl native
+
+Every size runs in a fresh process. Per stage it reports wall time and peak
+RSS and, in a second traced pass (tracemalloc slows Python down, so the
+timed pass runs without it), the peak and net Python allocations. Results
+are saved as JSON so runs can be compared across commits.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import SYNC_ENGINE, TGT_WRITE_MODE, XLSX_READ_BACKEND  # noqa: E402
+from benchmarks.synthetic import (  # noqa: E402
+    SOT_SHEETNAME,
+    SOT_UNIQUE_ID,
+    TGT_SHEETNAME,
+    TGT_UNIQUE_ID,
+    SyntheticPair,
+    generate_pair,
+)
+
+BENCH_DIR = Path(__file__).resolve().parent
+STAGES = ["read_sot", "read_tgt", "validate", "sync", "write", "diff", "orphans"]
+_MB = 1024 * 1024
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (Linux /proc), or the peak elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class StageMeter:
+    """Records wall time, peak RSS and (if tracing) allocations per stage."""
+
+    def __init__(self, trace_allocations: bool = False, interval: float = 0.005):
+        self.trace_allocations = trace_allocations
+        self.interval = interval
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name: str):
+        peak = [_rss_bytes()]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(self.interval):
+                peak[0] = max(peak[0], _rss_bytes())
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            done.set()
+            sampler.join()
+            stage = {
+                "wall_s": round(wall, 4),
+                "peak_rss_mb": round(max(peak[0], _rss_bytes()) / _MB, 1),
+            }
+            if self.trace_allocations:
+                current, traced_peak = tracemalloc.get_traced_memory()
+                stage["alloc_peak_mb"] = round((traced_peak - traced_before) / _MB, 1)
+                stage["alloc_net_mb"] = round((current - traced_before) / _MB, 1)
+            self.stages[name] = stage
+
+
+def run_pipeline(
+    pair: SyntheticPair,
+    output_dir: str,
+    write_mode: str,
+    engine: str,
+    meter,
+    backend: str = XLSX_READ_BACKEND,
+) -> None:
+    """The run_sync stages, in order, each measured separately."""
+    from app.data_io.xlsx_io import (
+        build_output_path,
+        read_sot_xlsx,
+        read_tgt_values,
+        read_tgt_xlsx,
+        write_tgt_xlsx,
+    )
+    from app.data_io.xlsx_patch import patch_tgt_xlsx
+    from app.data_sync.diff_report import generate_diff_report_from_change_set
+    from app.data_sync.orphan_detection import generate_orphan_report_to_log
+    from app.data_sync.sync_engine import sync_sot_to_tgt, sync_sot_to_tgt_vectorized
+    from app.validation.dataset_validation import DatasetValidator
+
+    mapping = pair.column_mapping
+
+    # Validation runs inside the reads in run_sync; here it is a separate
+    # stage so its cost can be seen on its own.
+    with meter("read_sot"):
+        _, sot_rows = read_sot_xlsx(
+            pair.sot_path,
+            SOT_SHEETNAME,
+            fingerprint_columns=list(mapping.keys()),
+            backend=backend,
+        )
+    with meter("read_tgt"):
+        tgt_headers, tgt_rows = read_tgt_values(
+            pair.tgt_path,
+            TGT_SHEETNAME,
+            fingerprint_columns=list(mapping.values()),
+            backend=backend,
+        )
+    with meter("validate"):
+        DatasetValidator("SOT", SOT_UNIQUE_ID, list(mapping.keys())).validate(sot_rows)
+        DatasetValidator("TGT", TGT_UNIQUE_ID, list(mapping.values())).validate(
+            tgt_rows
+        )
+    with meter("sync"):
+        sync = sync_sot_to_tgt_vectorized if engine == "vectorized" else sync_sot_to_tgt
+        change_set = sync(
+            sot_rows,
+            tgt_rows,
+            SOT_UNIQUE_ID,
+            TGT_UNIQUE_ID,
+            mapping,
+            tgt_headers=tgt_headers,
+        )
+    with meter("write"):
+        cell_updates = change_set.cell_updates()
+        if change_set.is_empty():
+            shutil.copyfile(pair.tgt_path, build_output_path(pair.tgt_path, output_dir))
+        elif write_mode == "patch":
+            patch_tgt_xlsx(pair.tgt_path, TGT_SHEETNAME, cell_updates, output_dir)
+        else:
+            wb, ws = read_tgt_xlsx(pair.tgt_path, TGT_SHEETNAME)
+            write_tgt_xlsx(wb, ws, cell_updates, pair.tgt_path, output_dir)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+    with meter("diff"), contextlib.redirect_stdout(io.StringIO()):
+        generate_diff_report_from_change_set(
+            timestamp=timestamp,
+            change_set=change_set,
+            column_mapping=mapping,
+            output_dir=output_dir,
+        )
+    with meter("orphans"):
+        generate_orphan_report_to_log(
+            timestamp=timestamp,
+            sot_rows=sot_rows,
+            tgt_rows=tgt_rows,
+            unique_id_sot=SOT_UNIQUE_ID,
+            unique_id_tgt=TGT_UNIQUE_ID,
+            column_mapping=mapping,
+        )
+
+
+def bench_one(
+    pair: SyntheticPair,
+    write_mode: str,
+    engine: str,
+    allocations: bool,
+    backend: str = XLSX_READ_BACKEND,
+):
+    """Benchmark one pair in the current process; returns the result record."""
+    from loguru import logger
+
+    # keep the cost of formatting log lines, without flooding the console
+    logger.remove()
+    logger.add(os.devnull, level="INFO")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)  # reports go to ./output (config.LOG_PATH)
+        meter = StageMeter()
+        run_pipeline(pair, "output", write_mode, engine, meter, backend)
+        stages = meter.stages
+
+        if allocations:
+            shutil.rmtree("output")
+            traced = StageMeter(trace_allocations=True)
+            tracemalloc.start()
+            try:
+                run_pipeline(pair, "output", write_mode, engine, traced, backend)
+            finally:
+                tracemalloc.stop()
+            for name, stage in traced.stages.items():
+                stages[name]["alloc_peak_mb"] = stage["alloc_peak_mb"]
+                stages[name]["alloc_net_mb"] = stage["alloc_net_mb"]
+
+    return {
+        "params": pair.params,
+        "write_mode": write_mode,
+        "engine": engine,
+        "backend": backend,
+        "stages": stages,
+        "total_wall_s": round(sum(s["wall_s"] for s in stages.values()), 4),
+        "peak_rss_mb": max(s["peak_rss_mb"] for s in stages.values()),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[dict], baseline: Optional[dict] = None) -> None:
+    base = {}
+    for record in (baseline or {}).get("results", []):
+        base[record["params"]["rows"], record.get("backend")] = record["stages"]
+
+    for record in results:
+        rows = record["params"]["rows"]
+        backend = record.get("backend")
+        print(
+            f"\n=== {rows:,} rows ({record['write_mode']}, {record['engine']}, "
+            f"{backend} reader) ==="
+        )
+        print(f"{'stage':<10}{'wall s':>10}{'peak RSS MB':>13}{'alloc MB':>10}")
+        for name, stage in record["stages"].items():
+            alloc = stage.get("alloc_peak_mb")
+            line = (
+                f"{name:<10}{stage['wall_s']:>10.3f}{stage['peak_rss_mb']:>13.1f}"
+                + (f"{alloc:>10.1f}" if alloc is not None else f"{'-':>10}")
+            )
+            # results saved before --backend existed carry no backend
+            old = (base.get((rows, backend)) or base.get((rows, None), {})).get(name)
+            if old and old["wall_s"]:
+                line += f"   x{stage['wall_s'] / old['wall_s']:.2f} vs baseline"
+            print(line)
+        print(
+            f"{'total':<10}{record['total_wall_s']:>10.3f}{record['peak_rss_mb']:>13.1f}"
+        )
+
+
+def main(argv=None) -> str:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--change-ratio", type=float, default=0.05)
+    parser.add_argument("--add-ratio", type=float, default=0.01)
+    parser.add_argument("--orphan-ratio", type=float, default=0.01)
+    parser.add_argument("--style-density", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--write-mode", choices=["openpyxl", "patch"], default=TGT_WRITE_MODE
+    )
+    parser.add_argument(
+        "--engine", choices=["python", "vectorized"], default=SYNC_ENGINE
+    )
+    parser.add_argument(
+        "--backend",
+        nargs="+",
+        choices=["native", "openpyxl"],
+        default=[XLSX_READ_BACKEND],
+        help="XLSX read backend(s); several run side by side for comparison",
+    )
+    parser.add_argument(
+        "--allocations",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="add a tracemalloc pass for per-stage allocations",
+    )
+    parser.add_argument("--data-dir", default=str(BENCH_DIR / "data"))
+    parser.add_argument("--output", help="JSON results file")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    spawn = multiprocessing.get_context("spawn")
+    for rows in args.rows:
+        pair = generate_pair(
+            args.data_dir,
+            rows=rows,
+            columns=args.columns,
+            change_ratio=args.change_ratio,
+            add_ratio=args.add_ratio,
+            orphan_ratio=args.orphan_ratio,
+            style_density=args.style_density,
+            seed=args.seed,
+        )
+        for backend in args.backend:
+            # a fresh process per run keeps RSS figures independent
+            with spawn.Pool(1) as pool:
+                results.append(
+                    pool.apply(
+                        bench_one,
+                        (
+                            pair,
+                            args.write_mode,
+                            args.engine,
+                            args.allocations,
+                            backend,
+                        ),
+                    )
+                )
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    output = Path(
+        args.output
+        or BENCH_DIR
+        / "results"
+        / f"bench_{commit or 'nogit'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+    print_results(results, baseline)
+    print(f"\nResults saved to: {output}")
+    return str(output)
+
+
+if __name__ == "__main__":
+    main()
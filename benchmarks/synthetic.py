@@ -0,0 +1,135 @@
+"""
+Deterministic synthetic SOT/TGT workbook pairs for benchmarking.
+
+The SOT sheet and the TGT sheet share the layout of the sample files
+(REC ID / Record ID, Status, Owner, ...), plus extra mapped text columns up
+to the requested column count.
+"""
+
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+
+SOT_SHEETNAME = "SOT_Data"
+TGT_SHEETNAME = "Sheet1"
+SOT_UNIQUE_ID = "REC ID"
+TGT_UNIQUE_ID = "Record ID"
+
+_STATUSES = ["Active", "Draft", "Under Review", "Closed", "Retired"]
+_OWNERS = [f"Owner {i}" for i in range(40)]
+_FILLS = [
+    PatternFill(start_color=color, end_color=color, fill_type="solid")
+    for color in ("FFFF00", "C6EFCE", "FFC7CE", "BDD7EE")
+]
+
+
+@dataclass
+class SyntheticPair:
+    sot_path: str
+    tgt_path: str
+    column_mapping: Dict[str, str]
+    params: Dict[str, object] = field(default_factory=dict)
+
+
+def generate_pair(
+    out_dir: str,
+    rows: int = 10_000,
+    columns: int = 10,
+    change_ratio: float = 0.05,
+    add_ratio: float = 0.01,
+    orphan_ratio: float = 0.01,
+    style_density: float = 0.1,
+    seed: int = 42,
+) -> SyntheticPair:
+    """
+    Write a SOT/TGT pair to out_dir and return its paths and column mapping.
+
+    rows:          SOT records
+    columns:       mapped columns (Status and Owner included, min 2)
+    change_ratio:  share of matched records with one mapped cell changed in TGT
+    add_ratio:     share of SOT records missing from TGT (appended by the sync)
+    orphan_ratio:  extra TGT-only records, relative to rows
+    style_density: share of TGT cells with a fill
+
+    The same arguments always produce the same workbooks, and files already
+    generated with these arguments are reused.
+    """
+    params = dict(
+        rows=rows,
+        columns=columns,
+        change_ratio=change_ratio,
+        add_ratio=add_ratio,
+        orphan_ratio=orphan_ratio,
+        style_density=style_density,
+        seed=seed,
+    )
+    stem = "_".join(f"{k}{v}" for k, v in params.items())
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sot_path = out_dir / f"sot_{stem}.xlsx"
+    tgt_path = out_dir / f"tgt_{stem}.xlsx"
+
+    text_columns = [f"Field {i}" for i in range(1, max(columns, 2) - 1)]
+    column_mapping = {"Status": "Status", "Owner": "Owner"}
+    column_mapping.update({f"SOT {c}": c for c in text_columns})
+    pair = SyntheticPair(str(sot_path), str(tgt_path), column_mapping, params)
+    if sot_path.exists() and tgt_path.exists():
+        return pair
+
+    rnd = random.Random(seed)
+    sot_headers = [SOT_UNIQUE_ID, *column_mapping, "Unmapped Notes"]
+    tgt_headers = [TGT_UNIQUE_ID, *column_mapping.values(), "Comments"]
+    tgt_fields = list(column_mapping.values())
+
+    sot_wb = Workbook(write_only=True)
+    sot_ws = sot_wb.create_sheet(SOT_SHEETNAME)
+    tgt_wb = Workbook(write_only=True)
+    tgt_ws = tgt_wb.create_sheet(TGT_SHEETNAME)
+    sot_ws.append(sot_headers)
+    tgt_ws.append(tgt_headers)
+
+    def tgt_row(values):
+        if not style_density:
+            return values
+        row = []
+        for value in values:
+            if rnd.random() < style_density:
+                cell = WriteOnlyCell(tgt_ws, value=value)
+                cell.fill = rnd.choice(_FILLS)
+                row.append(cell)
+            else:
+                row.append(value)
+        return row
+
+    for i in range(rows):
+        rec_id = f"REC-{i:07d}"
+        values = [
+            rnd.choice(_STATUSES),
+            rnd.choice(_OWNERS),
+            *(f"{c} value {rnd.randrange(10_000)}" for c in text_columns),
+        ]
+        sot_ws.append([rec_id, *values, "not synced"])
+
+        if rnd.random() < add_ratio:
+            continue  # new in SOT
+        if rnd.random() < change_ratio:
+            col = rnd.randrange(len(values))
+            values[col] = f"stale {tgt_fields[col]}"
+        tgt_ws.append(tgt_row([rec_id, *values, ""]))
+
+    for i in range(int(rows * orphan_ratio)):
+        values = [
+            "Active",
+            rnd.choice(_OWNERS),
+            *(f"{c} orphan {i}" for c in text_columns),
+        ]
+        tgt_ws.append(tgt_row([f"REC-9{i:07d}", *values, "orphan"]))
+
+    sot_wb.save(sot_path)
+    tgt_wb.save(tgt_path)
+    return pair
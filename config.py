@@ -2,6 +2,79 @@
 OUTPUT_DIR = "output"
 LOG_PATH = f"{OUTPUT_DIR}/sync_diff_{{timestamp}}.log"
 
+# Streaming pipeline: SOT is indexed as it is read (mapped columns only), TGT rows
+# are matched as they are read and changes go straight to the patch writer and
+# the report, so memory is bounded by the SOT index, not the sheet sizes. The
+# incremental sync, parse cache and parallel read need whole tables and are
+# not used in this mode.
+STREAMING_SYNC = False
+
+# How the updated TGT is written:
+#   "openpyxl" - load and re-save the whole workbook (every sheet, chart and pivot
+#                cache is parsed and re-serialized)
+#   "patch"    - parse and rewrite only the TGT sheet part; every other part is
+#                copied still compressed, byte for byte
+TGT_WRITE_MODE = "patch"
+
+# How matched records are compared:
+#   "python"     - per-cell comparison
+#   "vectorized" - column-wise NumPy batches (needs numpy; falls back to "python")
+#   "sort_merge" - external sort-merge join: both sheets are streamed into sorted
+#                  runs on disk and joined by ID in one pass, so memory stays bounded
+#                  for sheets larger than RAM (incremental sync, parse cache and
+#                  parallel read are not used)
+SYNC_ENGINE = "python"
+
+# Sort-merge engine: (key, row) pairs held in memory per sorter before a sorted run
+# is written to a temporary directory
+SORT_MERGE_RUN_ROWS = 200_000
+
+# Incremental sync (off by default): keep per-record fingerprints and input hashes of the last
+# successful run in <output_dir>/SYNC_STATE_FILENAME. Unchanged inputs are not
+# re-parsed and only records that moved since then are re-synced.
+INCREMENTAL_SYNC = False
+SYNC_STATE_FILENAME = ".sync_state.json"
+
+# Parsed SOT/TGT sheets are cached in <output_dir>/PARSE_CACHE_DIRNAME, keyed by
+# file content hash and sheet name; least recently used entries are evicted
+# beyond PARSE_CACHE_MAX_BYTES.
+PARSE_CACHE = True
+PARSE_CACHE_DIRNAME = ".parse_cache"
+PARSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Parse SOT and TGT concurrently, one worker process each (False: one after the other)
+PARALLEL_READ = True
+
+# How SOT/TGT values are read:
+#   "native"   - parse the sheet XML directly (falls back to openpyxl if needed)
+#   "openpyxl" - openpyxl read-only workbook
+XLSX_READ_BACKEND = "native"
+
+# The native reader keeps a sharedStrings part of at least this many bytes
+# (uncompressed) in a memory-mapped spill file instead of Python strings; a
+# string is then decoded only when a value using it is read (None: never spill)
+SHARED_STRINGS_SPILL_MIN_BYTES = 256 * 1024 * 1024
+
+# Sheets whose XML is at least CHUNKED_PARSE_MIN_BYTES (uncompressed) are cut into
+# chunks of about CHUNKED_PARSE_CHUNK_BYTES at row boundaries and parsed on all CPUs
+CHUNKED_PARSE_MIN_BYTES = 64 * 1024 * 1024
+CHUNKED_PARSE_CHUNK_BYTES = 8 * 1024 * 1024
+
+# run_sync metrics (per-stage timings, peak-memory deltas, counters):
+#   METRICS_SIDECAR: None, "json" or "prometheus" - also write them next to the output
+#   PROFILE_MODE:    None, "cprofile" or "tracemalloc" - save a profile of the run there
+METRICS_SIDECAR = None
+PROFILE_MODE = None
+
+# run_sync_batch: worker processes syncing targets concurrently (None = one per CPU)
+BATCH_MAX_WORKERS = None
+
+# run_sync_sheets: worker processes syncing sheet pairs concurrently (None = one per CPU)
+SHEETS_MAX_WORKERS = None
+
+# Columns with few distinct values; stored once per value in memory (SOT and TGT)
+INTERNED_COLUMNS = ["Status", "Owner", "Severity", "Test Method"]
+
 # Mappings (MANDATORY)
 SOT_SHEETNAME = "SOT_Data"
 TGT_SHEETNAME = "Sheet1"
@@ -30,3 +103,10 @@ ORPHANS_DETECTION_IGNORE_STATUS = [
     "Closed",
     "Retired",
 ]
+
+# Skip SOT records whose unique ID does not start with UNIQUE_ID_PREFIX while the
+# sheet is read: the ID cell is checked first and the rest of a skipped row is not
+# converted. Such records are then neither updated in nor added to TGT (by default
+# they are synced and only left out of the report). TGT is always read whole, as
+# new records go below its last row.
+SYNC_PREFIXED_IDS_ONLY = False
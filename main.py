@@ -1,4 +1,8 @@
+import argparse
+import sys
+
 from config import SOT_TO_TGT_COLUMN_MAPPING, SOT_SHEETNAME, TGT_SHEETNAME
+from app.validation.preflight import preflight
 from app.xlsx_sync import run_sync
 
 if __name__ == "__main__":
@@ -8,6 +12,30 @@ if __name__ == "__main__":
     UNIQUE_ID_TGT = "Record ID"
     COLUMN_MAPPING = SOT_TO_TGT_COLUMN_MAPPING
 
+    parser = argparse.ArgumentParser(description="Sync SOT records into TGT.")
+    parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="only check sheet names and mapped columns against the header rows",
+    )
+    args = parser.parse_args()
+
+    if args.preflight:
+        result = preflight(
+            SOT_PATH,
+            TGT_PATH,
+            SOT_SHEETNAME,
+            TGT_SHEETNAME,
+            UNIQUE_ID_SOT,
+            UNIQUE_ID_TGT,
+            COLUMN_MAPPING,
+        )
+        for error in result.errors:
+            print(f"✗ {error}")
+        if result.ok:
+            print("✅ Preflight passed: sheets and mapped columns found.")
+        sys.exit(0 if result.ok else 1)
+
     run_sync(
         sot_path=SOT_PATH,
         tgt_path=TGT_PATH,
@@ -0,0 +1,67 @@
+from benchmarks.run_benchmarks import STAGES, StageMeter, run_pipeline
+from benchmarks.synthetic import (
+    SOT_SHEETNAME,
+    SOT_UNIQUE_ID,
+    TGT_SHEETNAME,
+    TGT_UNIQUE_ID,
+    generate_pair,
+)
+from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_values
+from app.data_sync.sync_engine import sync_sot_to_tgt
+
+
+def test_generated_pair_follows_the_knobs(tmp_path):
+    # --- Arrange ---
+    pair = generate_pair(
+        tmp_path,
+        rows=500,
+        columns=6,
+        change_ratio=0.2,
+        add_ratio=0.1,
+        orphan_ratio=0.05,
+        style_density=0.5,
+    )
+
+    # --- Act ---
+    sot_headers, sot = read_sot_xlsx(pair.sot_path, SOT_SHEETNAME)
+    _, tgt = read_tgt_values(pair.tgt_path, TGT_SHEETNAME)
+    change_set = sync_sot_to_tgt(
+        sot, tgt, SOT_UNIQUE_ID, TGT_UNIQUE_ID, pair.column_mapping
+    )
+
+    # --- Assert ---
+    assert len(pair.column_mapping) == 6
+    assert set(pair.column_mapping) <= set(sot_headers)
+    assert len(sot) == 500
+
+    added = len(change_set.appended_rows)
+    assert 25 <= added <= 75
+    assert len(tgt) == 500 - added + 25  # 25 orphans
+    updated = len(list(change_set.updated_records()))
+    assert 50 <= updated <= 130
+
+
+def test_generation_is_deterministic_and_reused(tmp_path):
+    first = generate_pair(tmp_path / "a", rows=50, seed=7)
+    second = generate_pair(tmp_path / "b", rows=50, seed=7)
+    _, a = read_tgt_values(first.tgt_path, TGT_SHEETNAME)
+    _, b = read_tgt_values(second.tgt_path, TGT_SHEETNAME)
+
+    assert [dict(r) for r in a] == [dict(r) for r in b]
+
+    mtime = (tmp_path / "a" / first.tgt_path.split("/")[-1]).stat().st_mtime_ns
+    generate_pair(tmp_path / "a", rows=50, seed=7)
+    assert (tmp_path / "a" / first.tgt_path.split("/")[-1]).stat().st_mtime_ns == mtime
+
+
+def test_pipeline_measures_every_stage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pair = generate_pair(tmp_path / "data", rows=100)
+    meter = StageMeter()
+
+    run_pipeline(pair, "output", "patch", "python", meter)
+
+    assert list(meter.stages) == STAGES
+    for stage in meter.stages.values():
+        assert stage["wall_s"] >= 0
+        assert stage["peak_rss_mb"] > 0
@@ -0,0 +1,67 @@
+import pytest
+
+from app.data_io.parallel_read import read_sheets_parallel
+from app.data_io.parse_cache import ParseCache
+from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_values
+from app.validation.dataset_validation import DatasetValidator
+
+SOT_PATH = "tests/sample_input_files/SOT_sample.xlsx"
+TGT_PATH = "tests/sample_input_files/TGT_sample.xlsx"
+
+
+@pytest.fixture(autouse=True)
+def two_cpus(monkeypatch):
+    # exercise the worker processes even on a single-CPU machine
+    monkeypatch.setattr("app.data_io.parallel_read.available_cpus", lambda: 2)
+
+
+def _rows(table):
+    return [dict(r) for r in table], list(table.row_numbers), table.fingerprints
+
+
+def test_parallel_reads_match_serial_reads():
+    # --- Arrange ---
+    reads = [
+        (read_sot_xlsx, SOT_PATH, "SOT_Data", {"fingerprint_columns": ["Status"]}),
+        (read_tgt_values, TGT_PATH, "Sheet1", {}),
+    ]
+
+    # --- Act ---
+    results = read_sheets_parallel(reads)
+
+    # --- Assert ---
+    for (reader, path, sheet, kwargs), (headers, rows) in zip(reads, results):
+        expected_headers, expected_rows = reader(path, sheet, **kwargs)
+        assert headers == expected_headers
+        assert _rows(rows) == _rows(expected_rows)
+
+
+def test_parallel_reads_share_the_parse_cache(tmp_path):
+    # --- Arrange ---
+    cache = ParseCache(tmp_path / "cache")
+    reads = [
+        (read_sot_xlsx, SOT_PATH, "SOT_Data", {}),
+        (read_tgt_values, TGT_PATH, "Sheet1", {}),
+    ]
+
+    # --- Act ---
+    read_sheets_parallel(reads, cache)
+    read_sheets_parallel(reads, cache)
+
+    # --- Assert ---
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_worker_errors_are_raised():
+    reads = [
+        (read_sot_xlsx, SOT_PATH, "SOT_Data", {}),
+        (
+            read_tgt_values,
+            TGT_PATH,
+            "Sheet1",
+            {"validator": DatasetValidator("TGT", "Record ID", ["Missing Column"])},
+        ),
+    ]
+
+    with pytest.raises(ValueError, match="'Missing Column' not found"):
+        read_sheets_parallel(reads)
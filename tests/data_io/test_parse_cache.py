@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.data_io.parse_cache import ParseCache, file_sha256
+from app.data_io.xlsx_io import read_tgt_values
+from app.validation.dataset_validation import DatasetValidator
+
+
+@pytest.fixture
+def tgt_path():
+    return "tests/sample_input_files/TGT_sample.xlsx"
+
+
+def test_warm_read_does_not_parse(tmp_path, tgt_path, monkeypatch):
+    # --- Arrange ---
+    cache = ParseCache(tmp_path / "cache")
+    headers, rows = cache.read(read_tgt_values, tgt_path, "Sheet1")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("workbook parsed on a cache hit")
+
+    monkeypatch.setattr("app.data_io.xlsx_io.load_workbook", fail)
+
+    # --- Act ---
+    cached_headers, cached_rows = cache.read(read_tgt_values, tgt_path, "Sheet1")
+
+    # --- Assert ---
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cached_headers == headers
+    assert [dict(r) for r in cached_rows] == [dict(r) for r in rows]
+    assert list(cached_rows.row_numbers) == list(rows.row_numbers)
+
+
+def test_cache_hits_are_validated_too(tmp_path, tgt_path):
+    cache = ParseCache(tmp_path / "cache")
+    cache.read(read_tgt_values, tgt_path, "Sheet1")
+
+    validator = DatasetValidator("TGT", "Record ID", ["Missing Column"])
+    with pytest.raises(ValueError, match="'Missing Column' not found"):
+        cache.read(read_tgt_values, tgt_path, "Sheet1", validator=validator)
+    assert cache.hits == 1
+
+
+def test_key_covers_content_sheet_and_arguments(tmp_path):
+    calls = []
+
+    def reader(file_path, sheet_name, **kwargs):
+        calls.append((sheet_name, kwargs))
+        return sheet_name
+
+    src = tmp_path / "book.xlsx"
+    src.write_bytes(b"v1")
+    cache = ParseCache(tmp_path / "cache")
+
+    cache.read(reader, str(src), "A")
+    cache.read(reader, str(src), "A")
+    cache.read(reader, str(src), "B")
+    cache.read(reader, str(src), "A", fingerprint_columns=["Owner"])
+    src.write_bytes(b"v2")  # new content, new key
+    cache.read(reader, str(src), "A")
+
+    assert len(calls) == 4
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ParseCache(tmp_path / "cache", max_bytes=2500)
+    payload = lambda file_path, sheet_name: "x" * 1000
+    src = tmp_path / "book.xlsx"
+    src.write_bytes(b"content")
+
+    for sheet in ["A", "B"]:
+        cache.read(payload, str(src), sheet)
+    entries = sorted(cache.cache_dir.glob("*.pickle"), key=os.path.getmtime)
+    os.utime(entries[0], ns=(0, 1))  # A: oldest...
+    os.utime(entries[1], ns=(0, 2))
+    cache.read(payload, str(src), "A")  # ...until it is used again
+    cache.read(payload, str(src), "C")  # over the limit: B goes
+
+    cache.hits = cache.misses = 0
+    cache.read(payload, str(src), "A")
+    cache.read(payload, str(src), "C")
+    cache.read(payload, str(src), "B")
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_file_sha256_follows_content(tmp_path):
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"one")
+    first = file_sha256(str(src))
+
+    src.write_bytes(b"two")
+    os.utime(src, ns=(0, 123))
+
+    assert file_sha256(str(src)) != first
+
+
+_KEY_SCRIPT = """
+from app.data_io.parse_cache import ParseCache
+from app.data_io.xlsx_io import read_sot_xlsx
+from app.data_sync.row_filter import compile_row_filter
+
+row_filter = compile_row_filter("REC-", ["Closed", "Retired", "Draft", "Void"])
+kwargs = {"columns": ["REC ID", "Status"], "where": row_filter.id_filter("REC ID")}
+print(ParseCache("unused")._key(
+    read_sot_xlsx, "tests/sample_input_files/SOT_sample.xlsx", "SOT_Data", kwargs
+))
+"""
+
+
+def test_filtered_read_key_is_stable_across_processes():
+    # --- Act ---
+    keys = [
+        subprocess.run(
+            [sys.executable, "-c", _KEY_SCRIPT],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        for seed in ("1", "2")
+    ]
+
+    # --- Assert ---
+    assert keys[0] and keys[0] == keys[1]
+
+
+def test_key_rejects_callables_without_cache_key(tmp_path):
+    # --- Arrange ---
+    src = tmp_path / "book.xlsx"
+    src.write_bytes(b"v1")
+    cache = ParseCache(tmp_path / "cache")
+
+    # --- Act / Assert ---
+    with pytest.raises(TypeError, match="no cache_key"):
+        cache.read(lambda *a, **k: None, str(src), "A", where=("ID", str.isdigit))
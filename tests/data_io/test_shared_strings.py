@@ -0,0 +1,174 @@
+import gc
+import os
+import pickle
+import zipfile
+from xml.sax.saxutils import escape
+
+import pytest
+from openpyxl import Workbook
+
+from app.data_io.shared_strings import SpilledStrings, read_shared_strings
+from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_values
+from app.validation.dataset_validation import DatasetValidator
+
+SOT_PATH = "tests/sample_input_files/SOT_sample.xlsx"
+TGT_PATH = "tests/sample_input_files/TGT_sample.xlsx"
+SST_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+)
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+SST_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+)
+
+
+def _snapshot(result):
+    headers, table = result
+    return (
+        headers,
+        [dict(r) for r in table],
+        list(table.row_numbers),
+        table.fingerprints,
+    )
+
+
+def _cell(ref, value, strings):
+    if isinstance(value, str):
+        strings.setdefault(value, len(strings))
+        return f'<c r="{ref}" t="s"><v>{strings[value]}</v></c>'
+    return f'<c r="{ref}"><v>{value}</v></c>'
+
+
+@pytest.fixture
+def text_workbook(tmp_path):
+    """Shared strings: long, padded, blank, repeated, non-ASCII; and numbers."""
+    rows = [["REC ID", "Status", "Description", "Procedure"]]
+    for i in range(1, 40):
+        rows.append(
+            [
+                f"REC-{i:04d}",
+                " Active " if i % 2 else "Draft",
+                f"  Description {i} – ünïcode {'x' * i}  " if i % 5 else "   ",
+                i * 3 if i % 4 else f"Step {i}\nnext line",
+            ]
+        )
+    rows.append(["", "   ", "  ", ""])  # blank row
+    strings = {}
+    sheet_rows = "".join(
+        f'<row r="{n}">'
+        + "".join(_cell(f"{col}{n}", v, strings) for col, v in zip("ABCD", row))
+        + "</row>"
+        for n, row in enumerate(rows, start=1)
+    )
+    sheet = (
+        f'<worksheet xmlns="{MAIN_NS}"><sheetData>{sheet_rows}</sheetData></worksheet>'
+    )
+    shared = (
+        f'<sst xmlns="{MAIN_NS}">'
+        + "".join(f'<si><t xml:space="preserve">{escape(s)}</t></si>' for s in strings)
+        + "</sst>"
+    )
+
+    base, path = tmp_path / "base.xlsx", tmp_path / "text.xlsx"
+    wb = Workbook()
+    wb.active.title = "Data"
+    wb.save(base)
+    with zipfile.ZipFile(base) as src, zipfile.ZipFile(path, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = sheet.encode("utf-8")
+            elif item.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace(
+                    b"</Relationships>",
+                    f'<Relationship Id="rIdS" Type="{SST_REL}" '
+                    'Target="sharedStrings.xml"/></Relationships>'.encode(),
+                )
+            elif item.filename == "[Content_Types].xml":
+                data = data.replace(
+                    b"</Types>",
+                    f'<Override PartName="/xl/sharedStrings.xml" ContentType="{SST_TYPE}"/>'
+                    "</Types>".encode(),
+                )
+            dst.writestr(item, data)
+        dst.writestr("xl/sharedStrings.xml", shared.encode("utf-8"))
+    return str(path)
+
+
+@pytest.mark.parametrize("strip", [False, True])
+def test_spilled_strings_match_the_loaded_table(strip):
+    # --- Arrange ---
+    with zipfile.ZipFile(SOT_PATH) as archive:
+        with archive.open("xl/sharedStrings.xml") as src:
+            expected = read_shared_strings(src)
+        with archive.open("xl/sharedStrings.xml") as src:
+            spilled = SpilledStrings.from_xml(src, strip=strip)
+
+    # --- Act ---
+    values = list(spilled)
+    attached = pickle.loads(pickle.dumps(spilled))
+
+    # --- Assert ---
+    assert values == [s.strip() if strip else s for s in expected]
+    assert list(attached) == values
+    assert [spilled.ref(i).blank for i in range(len(spilled))] == [
+        not s.strip() for s in expected
+    ]
+
+
+def test_spill_file_is_removed_with_its_table():
+    # --- Arrange ---
+    with zipfile.ZipFile(TGT_PATH) as archive:
+        with archive.open("xl/sharedStrings.xml") as src:
+            spilled = SpilledStrings.from_xml(src)
+    path = spilled.path
+
+    # --- Act ---
+    del spilled
+    gc.collect()
+
+    # --- Assert ---
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("parse_workers", [1, 2])
+@pytest.mark.parametrize("reader", [read_sot_xlsx, read_tgt_values])
+@pytest.mark.parametrize("path", ["text", SOT_PATH, TGT_PATH])
+def test_spilled_read_matches_in_memory_read(
+    text_workbook, reader, path, parse_workers
+):
+    # --- Arrange ---
+    path = text_workbook if path == "text" else path
+    sheet = {SOT_PATH: "SOT_Data", TGT_PATH: "Sheet1"}.get(path, "Data")
+
+    # --- Act ---
+    reference = reader(path, sheet, parse_workers=1, backend="openpyxl")
+    loaded = reader(path, sheet, parse_workers=1, spill_strings=False)
+    # parse_workers=2: chunk workers read the spill file of this process
+    spilled = reader(path, sheet, parse_workers=parse_workers, spill_strings=True)
+
+    # --- Assert ---
+    assert _snapshot(loaded) == _snapshot(reference)
+    assert _snapshot(spilled) == _snapshot(reference)
+    assert _snapshot(pickle.loads(pickle.dumps(spilled))) == _snapshot(reference)
+
+
+def test_only_unread_columns_stay_spilled(text_workbook):
+    # --- Act ---
+    _, table = read_sot_xlsx(
+        text_workbook,
+        "Data",
+        fingerprint_columns=["Description"],
+        validator=DatasetValidator("SOT", "REC ID", ["Description"]),
+        spill_strings=True,
+    )
+
+    # --- Assert ---
+    spilled = {
+        h
+        for h, column in zip(table.headers, table._columns)
+        if type(column).__name__ == "_SpilledColumn"
+    }
+    assert spilled == {"Procedure"}
+    assert table[3]["Procedure"] == "Step 4\nnext line"
+    assert table[0]["Procedure"] == "3"
@@ -0,0 +1,144 @@
+import zipfile
+
+import pytest
+from openpyxl import Workbook
+
+from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_values
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # many chunks even for small sheets
+    monkeypatch.setattr("app.data_io.sheet_chunks.CHUNKED_PARSE_CHUNK_BYTES", 300)
+
+
+def _snapshot(result):
+    headers, table = result
+    return (
+        headers,
+        [dict(r) for r in table],
+        list(table.row_numbers),
+        table.fingerprints,
+    )
+
+
+def _inline(p, ref, text):
+    return f'<{p}c r="{ref}" t="inlineStr"><{p}is><{p}t>{text}</{p}t></{p}is></{p}c>'
+
+
+def _sheet_xml(p: str) -> str:
+    """Rows with and without r="", gaps, a row going backwards, blank rows,
+    numbers and a shared formula, behind a stale <dimension>."""
+    xmlns = f'xmlns:{p[:-1]}="{MAIN_NS}"' if p else f'xmlns="{MAIN_NS}"'
+    rows = [
+        f'<{p}row r="1">'
+        + "".join(
+            _inline(p, f"{col}1", name)
+            for col, name in zip("ABCD", ["REC ID", "Status", "Amount", "Double"])
+        )
+        + f"</{p}row>"
+    ]
+    for n in range(2, 41):
+        if n % 7 == 0:
+            continue  # gap
+        if n == 12:
+            rows.append(f'<{p}row r="12">{_inline(p, "B12", "  ")}</{p}row>')  # blank
+            continue
+        if n == 20:
+            rows.append(f'<{p}row r="9">{_inline(p, "A9", "REC-BACK")}</{p}row>')
+        attrs = f' r="{n}"' if n % 3 else ""  # some rows unnumbered
+        formula = (
+            f'<{p}f t="shared" ref="D2:D40" si="0">C2*2</{p}f>'
+            if n == 2
+            else f'<{p}f t="shared" si="0"/>'
+        )
+        rows.append(
+            f"<{p}row{attrs}>"
+            + _inline(p, f"A{n}", f"REC-{n:04d}")
+            + _inline(p, f"B{n}", " Active " if n % 2 else "Draft")
+            + f'<{p}c r="C{n}"><{p}v>{n * 1.5}</{p}v></{p}c>'
+            + f'<{p}c r="D{n}">{formula}<{p}v>{n * 3.0}</{p}v></{p}c>'
+            + f"</{p}row>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f"<{p}worksheet {xmlns}>"
+        f'<{p}dimension ref="A1:D30"/>'
+        f"<{p}sheetData>{''.join(rows)}</{p}sheetData>"
+        f"</{p}worksheet>"
+    )
+
+
+def _workbook_with_sheet(tmp_path, sheet_xml: str) -> str:
+    base, path = tmp_path / "base.xlsx", tmp_path / "crafted.xlsx"
+    wb = Workbook()
+    wb.active["A1"] = "placeholder"
+    wb.save(base)
+    with zipfile.ZipFile(base) as src, zipfile.ZipFile(path, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = sheet_xml.encode("utf-8")
+            dst.writestr(item, data)
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "path, sheet",
+    [
+        ("tests/sample_input_files/SOT_sample.xlsx", "SOT_Data"),
+        ("tests/sample_input_files/TGT_sample.xlsx", "Sheet1"),
+    ],
+)
+@pytest.mark.parametrize("reader", [read_sot_xlsx, read_tgt_values])
+def test_chunked_read_matches_streaming_read(reader, path, sheet):
+    # --- Act ---
+    streamed = reader(path, sheet, fingerprint_columns=[], parse_workers=1)
+    chunked = reader(path, sheet, fingerprint_columns=[], parse_workers=2)
+
+    # --- Assert ---
+    assert _snapshot(chunked) == _snapshot(streamed)
+
+
+@pytest.mark.parametrize("backend", ["openpyxl", "native"])
+@pytest.mark.parametrize("prefix", ["", "x:"])
+@pytest.mark.parametrize("reader", [read_sot_xlsx, read_tgt_values])
+def test_chunked_read_matches_streaming_read_on_irregular_sheet(
+    tmp_path, reader, prefix, backend
+):
+    # --- Arrange ---
+    path = _workbook_with_sheet(tmp_path, _sheet_xml(prefix))
+
+    # --- Act ---
+    reference = reader(path, "Sheet", parse_workers=1, backend="openpyxl")
+    streamed = reader(path, "Sheet", parse_workers=1, backend=backend)
+    chunked = reader(path, "Sheet", parse_workers=3, backend=backend)
+
+    # --- Assert ---
+    assert _snapshot(streamed) == _snapshot(reference)
+    assert _snapshot(chunked) == _snapshot(reference)
+    assert len(streamed[1]) > 10
+
+
+def test_sheet_is_cut_at_row_tags(tmp_path, monkeypatch):
+    # --- Arrange ---
+    from app.data_io import sheet_chunks
+
+    path = _workbook_with_sheet(tmp_path, _sheet_xml("x:"))
+    chunks = []
+    split_rows = sheet_chunks.split_sheet_xml
+    monkeypatch.setattr(
+        sheet_chunks,
+        "split_sheet_xml",
+        lambda src, size: (chunks.append(c) or c for c in split_rows(src, size)),
+    )
+
+    # --- Act ---
+    read_tgt_values(path, "Sheet", parse_workers=2)
+
+    # --- Assert ---
+    assert len(chunks) > 5
+    for chunk in chunks[1:]:
+        assert chunk.split(b"<x:sheetData>", 1)[1].startswith(b"<x:row")
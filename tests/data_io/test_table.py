@@ -0,0 +1,122 @@
+import pickle
+from collections.abc import Mapping
+
+import pytest
+
+from app.data_io.fingerprint import fingerprints_of, row_fingerprint
+from app.data_io.table import Table, headers_of, project
+
+
+@pytest.fixture
+def table():
+    return Table.from_rows(
+        ["REC ID", "Status", "Owner"],
+        [
+            ["REC-001", "Active", "Alice"],
+            ["REC-002", "Active", "Bob"],
+            ["REC-003", "Closed"],  # short row is padded
+        ],
+        interned=["Status"],
+    )
+
+
+def test_rows_behave_like_dicts(table):
+    assert len(table) == 3
+    row = table[1]
+
+    assert isinstance(row, Mapping)
+    assert row["Owner"] == "Bob"
+    assert row.get("Missing") is None
+    assert row.get("Missing", "") == ""
+    assert list(row.keys()) == ["REC ID", "Status", "Owner"]
+    assert row == {"REC ID": "REC-002", "Status": "Active", "Owner": "Bob"}
+    assert table[-1]["Owner"] == ""
+
+    with pytest.raises(KeyError):
+        row["Missing"]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_interned_column_stores_each_value_once(table):
+    status = table._columns[table.index["Status"]]
+
+    assert status.values == ["Active", "Closed"]
+    assert list(status.codes) == [0, 0, 1]
+    assert table.column("Status") == ["Active", "Active", "Closed"]
+
+
+def test_row_numbers_default_to_sheet_rows():
+    t = Table(["ID"])
+    t.append(["A"])
+    t.append(["B"], row_number=7)
+    t.append(["C"])
+
+    assert list(t.row_numbers) == [2, 7, 8]
+    assert t[1].row_number == 7
+
+
+def test_project_table_and_dicts(table):
+    assert list(project(table, ["REC ID", "Owner"])) == [
+        ("REC-001", "Alice"),
+        ("REC-002", "Bob"),
+        ("REC-003", ""),
+    ]
+
+    dict_rows = [{"REC ID": "REC-001"}, {}]
+    assert list(project(dict_rows, ["REC ID"])) == [("REC-001",), (None,)]
+
+    assert headers_of(table) == ["REC ID", "Status", "Owner"]
+    assert headers_of(dict_rows) == ["REC ID"]
+    assert headers_of([]) == []
+
+
+def test_duplicate_headers_rejected():
+    with pytest.raises(ValueError, match="unique"):
+        Table(["A", "A"])
+
+
+def test_table_round_trips_through_pickle(table):
+    clone = pickle.loads(pickle.dumps(table))
+
+    assert [dict(r) for r in clone] == [dict(r) for r in table]
+    assert list(clone.row_numbers) == list(table.row_numbers)
+
+
+def test_fingerprints_computed_on_append(table):
+    table.add_fingerprints(["Status", "Owner"])
+    table.append(["REC-004", " Active ", "Bob  "])
+
+    assert table.fingerprints[1] == table.fingerprints[3]  # values are stripped
+    assert table.fingerprints[0] != table.fingerprints[1]
+    assert table.fingerprints[2] == row_fingerprint(["Closed", None])
+
+    assert fingerprints_of(table, ["Status", "Owner"]) is table.fingerprints
+    assert fingerprints_of(table, ["Owner", "Status"]) is None  # order matters
+    assert fingerprints_of([{"Status": "Active"}], ["Status"]) is None
+
+
+def test_fingerprint_separates_values():
+    assert row_fingerprint(["ab", "c"]) != row_fingerprint(["a", "bc"])
+    assert row_fingerprint(["", ""]) != row_fingerprint([""])
+
+
+def test_fingerprint_of_a_generator_matches_the_list():
+    values = ["a", None, " b "]
+
+    assert row_fingerprint(v for v in values) == row_fingerprint(values)
+    assert row_fingerprint(v for v in values) == row_fingerprint(["a", "", "b"])
+
+
+def test_subset_keeps_row_numbers_and_fingerprints(table):
+    table.add_fingerprints(["Owner"])
+
+    sub = table.subset([2, 0])
+
+    assert [r["REC ID"] for r in sub] == ["REC-003", "REC-001"]
+    assert list(sub.row_numbers) == [4, 2]
+    assert sub.fingerprints_for(["Owner"]) == [
+        table.fingerprints[2],
+        table.fingerprints[0],
+    ]
+    assert sub._columns[1].values == ["Closed", "Active"]  # still interned
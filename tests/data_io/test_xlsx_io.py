@@ -1,9 +1,17 @@
+import re
+import zipfile
+from collections.abc import Mapping
+
 import pytest
 from openpyxl.styles import PatternFill
 from openpyxl import Workbook, load_workbook
 
-from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_xlsx
+from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_xlsx, read_tgt_values
 from app.data_io.xlsx_io import read_tgt_xlsx, write_tgt_xlsx
+from app.data_io.xlsx_io import stream_sot_rows, stream_tgt_rows
+from app.validation.dataset_validation import DatasetValidator
+from app.data_io.table import Table
+from app.data_io.fingerprint import row_fingerprint
 
 
 @pytest.fixture
@@ -21,9 +29,10 @@ def test_read_sot_xlsx_valid(sot_path):
 
     # sanity checks
     assert isinstance(headers, list)
-    assert isinstance(rows, list)
+    assert isinstance(rows, Table)
     assert len(headers) > 0
-    assert all(isinstance(r, dict) for r in rows)
+    assert all(isinstance(r, Mapping) for r in rows)
+    assert rows.headers == headers
 
     # required columns exist
     assert "REC ID" in headers
@@ -43,6 +52,67 @@ def test_read_tgt_xlsx_valid(tgt_path):
     assert "Record Name" in first_row
 
 
+def test_read_tgt_values_matches_styled_workbook(tgt_path):
+    headers, rows = read_tgt_values(tgt_path, sheet_name="Sheet1")
+
+    wb, ws = read_tgt_xlsx(tgt_path, sheet_name="Sheet1")
+    expected = [
+        {h: "" if v is None else str(v) for h, v in zip(headers, row)}
+        for row in ws.iter_rows(min_row=2, values_only=True)
+    ]
+
+    assert headers == [c.value for c in ws[1]]
+    assert isinstance(rows, Table)
+    assert [dict(r) for r in rows] == expected
+    assert list(rows.row_numbers) == list(range(2, ws.max_row + 1))
+
+
+def test_read_tgt_values_keeps_sheet_row_numbers(tmp_path):
+    path = tmp_path / "tgt.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    ws.append(["Record ID", None, "Owner"])
+    ws.append(["REC-001", "note", "Alice"])
+    ws.append([None, None, None])  # blank row: skipped, but row 4 keeps its number
+    ws.append(["REC-003", None, None])
+    wb.save(path)
+
+    headers, rows = read_tgt_values(str(path), sheet_name="Sheet1")
+
+    # headers keep sheet positions; the unnamed column is not stored
+    assert headers == ["Record ID", "", "Owner"]
+    assert rows.headers == ["Record ID", "Owner"]
+    assert len(rows) == 2
+    assert rows[0] == {"Record ID": "REC-001", "Owner": "Alice"}
+    assert rows[-1] == {"Record ID": "REC-003", "Owner": ""}
+    assert list(rows.row_numbers) == [2, 4]
+
+
+def test_readers_fingerprint_mapped_columns(sot_path, tgt_path):
+    _, sot = read_sot_xlsx(sot_path, "SOT_Data", fingerprint_columns=["REC Name"])
+    _, tgt = read_tgt_values(tgt_path, "Sheet1", fingerprint_columns=["Record Name"])
+
+    assert sot.fingerprints == [row_fingerprint([r["REC Name"]]) for r in sot]
+    assert tgt.fingerprints == [row_fingerprint([r["Record Name"]]) for r in tgt]
+
+    # a missing column only disables fingerprints; validation reports it later
+    _, tgt = read_tgt_values(tgt_path, "Sheet1", fingerprint_columns=["Nope"])
+    assert tgt.fingerprints is None
+
+
+def test_read_tgt_values_duplicate_headers(tmp_path):
+    path = tmp_path / "tgt_dup.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    ws.append(["Record ID", "Owner", "Owner"])
+    wb.save(path)
+
+    with pytest.raises(ValueError, match="duplicate column names"):
+        read_tgt_values(str(path), sheet_name="Sheet1")
+
+
 def test_read_sot_xlsx_duplicate_headers(tmp_path):
     # create temporary workbook with duplicate headers
     dup_file = tmp_path / "dup_headers.xlsx"
@@ -61,21 +131,15 @@ def test_write_tgt_xlsx_preserves_fill(tmp_path, tgt_path):
 
     wb, ws = read_tgt_xlsx(tgt_path, sheet_name="Sheet1")
     orig_fill = ws.cell(row=2, column=1).fill
+    orig_values = [[c.value for c in row] for row in ws.iter_rows()]
 
     headers = [c.value for c in next(ws.iter_rows(min_row=1, max_row=1))]
-    updated_rows = []
-    for r_idx, row in enumerate(
-        ws.iter_rows(min_row=2, max_row=ws.max_row, values_only=True), start=2
-    ):
-        row_dict = dict(zip(headers, row))
-        if r_idx == 2:
-            row_dict["Record Name"] = "UPDATED VALUE"
-        updated_rows.append(row_dict)
+    name_col = headers.index("Record Name") + 1
 
     out_file = write_tgt_xlsx(
         wb,
         ws,
-        updated_rows,
+        {2: {name_col: "UPDATED VALUE"}},
         "TGT_sample.xlsx",
         tmp_path,
     )
@@ -84,13 +148,159 @@ def test_write_tgt_xlsx_preserves_fill(tmp_path, tgt_path):
     new_fill = ws_new.cell(row=2, column=1).fill
 
     # verify update applied
-    assert (
-        ws_new.cell(row=2, column=headers.index("Record Name") + 1).value
-        == "UPDATED VALUE"
-    )
+    assert ws_new.cell(row=2, column=name_col).value == "UPDATED VALUE"
+
+    # no other cell was touched
+    new_values = [[c.value for c in row] for row in ws_new.iter_rows()]
+    orig_values[1][name_col - 1] = "UPDATED VALUE"
+    assert new_values == orig_values
 
     # only compare fills if original had a defined pattern
     if orig_fill.patternType:
         assert isinstance(new_fill, PatternFill)
         assert new_fill.patternType == orig_fill.patternType
         assert new_fill.start_color.rgb == orig_fill.start_color.rgb
+
+
+def test_streamed_rows_match_tables(sot_path, tgt_path):
+    # --- Act ---
+    sot_headers, sot_rows = stream_sot_rows(sot_path, "SOT_Data")
+    tgt_headers, tgt_rows = stream_tgt_rows(tgt_path, "Sheet1")
+
+    # --- Assert ---
+    for (headers, rows), (expected_headers, table) in [
+        ((sot_headers, sot_rows), read_sot_xlsx(sot_path, "SOT_Data")),
+        ((tgt_headers, tgt_rows), read_tgt_values(tgt_path, "Sheet1")),
+    ]:
+        assert headers == expected_headers
+        assert list(rows) == [
+            (n, list(table.row_values(i))) for i, n in enumerate(table.row_numbers)
+        ]
+
+
+def test_streamed_rows_validate_header_before_rows(sot_path):
+    validator = DatasetValidator("SOT", "REC ID", ["Missing Column"])
+
+    with pytest.raises(ValueError, match="'Missing Column' not found"):
+        stream_sot_rows(sot_path, "SOT_Data", validator=validator)
+
+
+@pytest.mark.parametrize("backend", ["native", "openpyxl"])
+@pytest.mark.parametrize(
+    "reader, path, sheet, columns",
+    [
+        (
+            read_sot_xlsx,
+            "tests/sample_input_files/SOT_sample.xlsx",
+            "SOT_Data",
+            ["Status", "REC ID"],
+        ),
+        (
+            read_tgt_values,
+            "tests/sample_input_files/TGT_sample.xlsx",
+            "Sheet1",
+            ["Record ID", "Owner", "Nope"],
+        ),
+    ],
+)
+def test_projected_read_keeps_only_requested_columns(
+    reader, path, sheet, columns, backend
+):
+    # --- Act ---
+    full_headers, full = reader(path, sheet, backend=backend)
+    headers, projected = reader(path, sheet, backend=backend, columns=columns)
+
+    # --- Assert ---
+    assert headers == full_headers
+    kept = [h for h in full.headers if h in columns]
+    assert projected.headers == kept
+    expected = [
+        (n, values)
+        for n, values in zip(full.row_numbers, full.project(kept))
+        if any(v.strip() for v in values)
+    ]
+    assert list(zip(projected.row_numbers, projected.project(kept))) == expected
+
+
+def test_projected_native_read_skips_other_cells_undecoded(tmp_path):
+    # --- Arrange ---
+    # column B points past the end of the shared strings table: decoding it fails
+    path = tmp_path / "projected.xlsx"
+    wb = Workbook()
+    wb.active.append(["ID", "Broken", "Name"])
+    wb.active.append(["REC-1", "x", "Alice"])
+    wb.save(path)
+    with zipfile.ZipFile(path) as src:
+        parts = {item: src.read(item) for item in src.namelist()}
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    sheet = re.sub(r'<c r="B2"[^>]*>.*?</c>', '<c r="B2" t="s"><v>999</v></c>', sheet)
+    parts["xl/worksheets/sheet1.xml"] = sheet.encode()
+    with zipfile.ZipFile(path, "w") as dst:
+        for name, data in parts.items():
+            dst.writestr(name, data)
+
+    # --- Act ---
+    headers, table = read_sot_xlsx(
+        str(path), wb.active.title, backend="native", columns=["ID", "Name"]
+    )
+
+    # --- Assert ---
+    assert headers == ["ID", "Broken", "Name"]
+    assert [dict(r) for r in table] == [{"ID": "REC-1", "Name": "Alice"}]
+    with pytest.raises(IndexError):
+        read_sot_xlsx(str(path), wb.active.title, backend="native")
+
+
+@pytest.mark.parametrize(
+    "backend, spill_strings", [("native", None), ("native", True), ("openpyxl", None)]
+)
+def test_where_keeps_only_rows_passing_the_filter(sot_path, backend, spill_strings):
+    # --- Arrange ---
+    where = ("REC ID", lambda rec_id: rec_id in {"REC-0124", "REC-0130"})
+
+    # --- Act ---
+    _, table = read_sot_xlsx(
+        sot_path, "SOT_Data", backend=backend, spill_strings=spill_strings, where=where
+    )
+    _, rows = stream_sot_rows(sot_path, "SOT_Data", backend=backend, where=where)
+
+    # --- Assert ---
+    assert [v for (v,) in table.project(["REC ID"])] == ["REC-0124", "REC-0130"]
+    assert list(table.row_numbers) == [3, 9]
+    assert [(n, values[0]) for n, values in rows] == [(3, "REC-0124"), (9, "REC-0130")]
+
+
+def test_where_native_skips_the_rest_of_a_rejected_row(tmp_path):
+    # --- Arrange ---
+    # B3 points past the end of the shared strings table: decoding it fails
+    path = tmp_path / "filtered.xlsx"
+    wb = Workbook()
+    wb.active.append(["ID", "Name"])
+    wb.active.append(["REC-1", "Alice"])
+    wb.active.append(["OTHER-2", "x"])
+    wb.save(path)
+    with zipfile.ZipFile(path) as src:
+        parts = {item: src.read(item) for item in src.namelist()}
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    sheet = re.sub(r'<c r="B3"[^>]*>.*?</c>', '<c r="B3" t="s"><v>999</v></c>', sheet)
+    parts["xl/worksheets/sheet1.xml"] = sheet.encode()
+    with zipfile.ZipFile(path, "w") as dst:
+        for name, data in parts.items():
+            dst.writestr(name, data)
+
+    # --- Act ---
+    _, table = read_sot_xlsx(
+        str(path),
+        wb.active.title,
+        backend="native",
+        where=("ID", lambda rec_id: rec_id.startswith("REC-")),
+    )
+
+    # --- Assert ---
+    assert [dict(r) for r in table] == [{"ID": "REC-1", "Name": "Alice"}]
+
+
+def test_where_column_must_be_read(sot_path):
+    # --- Act / Assert ---
+    with pytest.raises(ValueError, match="Row filter column 'Owner'"):
+        read_sot_xlsx(sot_path, "SOT_Data", columns=["REC ID"], where=("Owner", bool))
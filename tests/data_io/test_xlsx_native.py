@@ -0,0 +1,122 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from openpyxl import Workbook
+
+from app.data_io.xlsx_io import read_sot_xlsx, read_tgt_values
+from app.data_io.xlsx_native import NativeWorkbook, UnsupportedWorkbook
+
+
+def _snapshot(result):
+    headers, table = result
+    return headers, [dict(r) for r in table], list(table.row_numbers)
+
+
+@pytest.fixture(params=[False, True], ids=["1900", "1904"])
+def typed_workbook(request, tmp_path):
+    """Every cell type openpyxl converts: numbers, dates, times, durations,
+    booleans, formulas, errors, padded and non-ASCII strings."""
+    wb = Workbook()
+    wb.epoch = datetime(1904, 1, 1) if request.param else datetime(1899, 12, 30)
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(["REC ID", " Name ", "Int", "Float", "Date", "Time", "Span", "Flag"])
+    for i in range(1, 30):
+        ws.append(
+            [
+                f"REC-{i:04d}",
+                f"  näme {i}  " if i % 2 else f"x005F_name {i}",
+                i * 1000,
+                i / 7,
+                datetime(2024, 1, i % 28 + 1, 12, 30) if i % 3 else date(1999, 12, 31),
+                time(i % 24, 15),
+                timedelta(hours=i, minutes=3),
+                i % 2 == 0,
+            ]
+        )
+    ws.append(["REC-FORMULA", "=B2&B3", "=C2*2", "#N/A", None, None, None, None])
+    ws["D40"] = "outside the header row"
+    ws.cell(row=45, column=1, value="REC-AFTER-GAP")
+    ws["G2"].number_format = "[h]:mm:ss"
+    path = tmp_path / "typed.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("reader", [read_sot_xlsx, read_tgt_values])
+def test_native_backend_matches_openpyxl(typed_workbook, reader):
+    # --- Act ---
+    native = reader(typed_workbook, "Data", backend="native")
+    reference = reader(typed_workbook, "Data", backend="openpyxl")
+
+    # --- Assert ---
+    assert _snapshot(native) == _snapshot(reference)
+    rows = native[1]
+    assert len(rows) == 32
+    assert rows[0]["Date"].startswith("2024-01-02") and rows[0]["Flag"] == "False"
+
+
+@pytest.mark.parametrize(
+    "reader, path, sheet",
+    [
+        (read_sot_xlsx, "tests/sample_input_files/SOT_sample.xlsx", "SOT_Data"),
+        (read_tgt_values, "tests/sample_input_files/TGT_sample.xlsx", "Sheet1"),
+    ],
+)
+def test_native_backend_matches_openpyxl_on_samples(reader, path, sheet):
+    native = reader(path, sheet, backend="native")
+    reference = reader(path, sheet, backend="openpyxl")
+
+    assert _snapshot(native) == _snapshot(reference)
+
+
+def test_unknown_sheet_raises_key_error():
+    wb = NativeWorkbook("tests/sample_input_files/TGT_sample.xlsx")
+    try:
+        assert wb.sheetnames == ["Sheet1"]
+        with pytest.raises(KeyError):
+            wb["Missing"]
+    finally:
+        wb.close()
+
+
+def test_unreadable_package_falls_back_to_openpyxl(monkeypatch):
+    # --- Arrange ---
+    def unsupported(*args, **kwargs):
+        raise UnsupportedWorkbook("test")
+
+    monkeypatch.setattr("app.data_io.xlsx_io.NativeWorkbook", unsupported)
+    path = "tests/sample_input_files/TGT_sample.xlsx"
+
+    # --- Act ---
+    result = read_tgt_values(path, "Sheet1", backend="native")
+
+    # --- Assert ---
+    assert _snapshot(result) == _snapshot(
+        read_tgt_values(path, "Sheet1", backend="openpyxl")
+    )
+
+
+def test_not_a_zip_is_unsupported(tmp_path):
+    path = tmp_path / "not.xlsx"
+    path.write_text("plain text")
+
+    with pytest.raises(UnsupportedWorkbook):
+        NativeWorkbook(str(path))
+
+
+def test_header_row_reads_only_the_strings_it_uses(typed_workbook):
+    # --- Arrange ---
+    wb = NativeWorkbook(typed_workbook, data_only=True, load_strings=False)
+    ws = wb["Data"]
+
+    # --- Act ---
+    header = ws.header_row()
+    deferred = wb._shared_strings is None
+    expected = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
+    wb.close()
+
+    # --- Assert ---
+    assert deferred
+    assert header == expected
+    assert header[:2] == ("REC ID", " Name ")
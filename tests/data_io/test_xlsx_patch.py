@@ -0,0 +1,305 @@
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from app.data_io.xlsx_patch import (
+    patch_tgt_xlsx,
+    patch_tgt_xlsx_streaming,
+    resolve_sheet_part,
+)
+
+
+@pytest.fixture
+def tgt_path():
+    return "tests/sample_input_files/TGT_sample.xlsx"
+
+
+def test_resolve_sheet_part(tgt_path):
+    with zipfile.ZipFile(tgt_path) as zf:
+        assert resolve_sheet_part(zf, "Sheet1") == "xl/worksheets/sheet1.xml"
+
+        with pytest.raises(KeyError):
+            resolve_sheet_part(zf, "Missing")
+
+
+def test_patch_updates_only_listed_cells(tmp_path, tgt_path):
+    orig_ws = load_workbook(tgt_path)["Sheet1"]
+    headers = [c.value for c in orig_ws[1]]
+    name_col = headers.index("Record Name") + 1
+
+    out_file = patch_tgt_xlsx(
+        tgt_path, "Sheet1", {2: {name_col: "UPDATED VALUE"}}, tmp_path
+    )
+    ws_new = load_workbook(out_file)["Sheet1"]
+
+    assert ws_new.cell(row=2, column=name_col).value == "UPDATED VALUE"
+
+    # every other cell is unchanged
+    for row in orig_ws.iter_rows():
+        for cell in row:
+            if (cell.row, cell.column) == (2, name_col):
+                continue
+            assert ws_new.cell(row=cell.row, column=cell.column).value == cell.value
+
+
+def test_patch_preserves_fill_and_other_parts(tmp_path, tgt_path):
+    orig_ws = load_workbook(tgt_path)["Sheet1"]
+    orig_fill = orig_ws.cell(row=1, column=1).fill
+
+    # overwrite a styled header cell to check its fill survives
+    out_file = patch_tgt_xlsx(tgt_path, "Sheet1", {1: {1: "Record ID"}}, tmp_path)
+    new_fill = load_workbook(out_file)["Sheet1"].cell(row=1, column=1).fill
+
+    assert new_fill.patternType == orig_fill.patternType
+    assert new_fill.fgColor.theme == orig_fill.fgColor.theme
+
+    with zipfile.ZipFile(tgt_path) as zin, zipfile.ZipFile(out_file) as zout:
+        assert zin.namelist() == zout.namelist()
+        for name in zin.namelist():
+            if name != "xl/worksheets/sheet1.xml":
+                assert zin.read(name) == zout.read(name), name
+
+
+def test_patch_copies_other_sheets_compressed(tmp_path):
+    # --- Arrange ---
+    src = tmp_path / "multi_sheet.xlsx"
+    wb = Workbook()
+    wb.active.title = "Pivot"
+    for r in range(1, 200):
+        wb["Pivot"].append([f"P{r}", r, r * 2.5])
+    wb.create_sheet("Target").append(["Record ID", "Name"])
+    wb["Target"].append(["REC-1", "old"])
+    wb.create_sheet("Notes").append(["kept as is"])
+    wb.save(src)
+
+    # --- Act ---
+    out_file = patch_tgt_xlsx(str(src), "Target", {2: {2: "new"}}, tmp_path / "out")
+
+    # --- Assert ---
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(out_file) as zout:
+        assert zout.testzip() is None
+        target = resolve_sheet_part(zin, "Target")
+        for info in zin.infolist():
+            if info.filename == target:
+                continue
+            copied = zout.getinfo(info.filename)
+            assert (copied.CRC, copied.compress_size, copied.compress_type) == (
+                info.CRC,
+                info.compress_size,
+                info.compress_type,
+            ), info.filename
+    out = load_workbook(out_file)
+    assert out["Target"]["B2"].value == "new"
+    assert out["Pivot"]["C199"].value == 199 * 2.5
+    assert out["Notes"]["A1"].value == "kept as is"
+
+
+def test_patch_appends_rows_and_grows_dimension(tmp_path, tgt_path):
+    orig_ws = load_workbook(tgt_path)["Sheet1"]
+    new_row = orig_ws.max_row + 1
+
+    out_file = patch_tgt_xlsx(
+        tgt_path,
+        "Sheet1",
+        {new_row: {1: "REC-NEW", 3: "  spaced <&> text  "}},
+        tmp_path,
+    )
+    ws_new = load_workbook(out_file)["Sheet1"]
+
+    assert ws_new.max_row == new_row
+    assert ws_new.cell(row=new_row, column=1).value == "REC-NEW"
+    assert ws_new.cell(row=new_row, column=2).value is None
+    assert ws_new.cell(row=new_row, column=3).value == "  spaced <&> text  "
+
+    with zipfile.ZipFile(out_file) as zf:
+        sheet_xml = zf.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert f'<dimension ref="A1:L{new_row}"/>' in sheet_xml
+
+
+def test_patch_fills_gaps_and_sparse_rows(tmp_path):
+    src = tmp_path / "sparse.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(["ID", "Name", "Owner"])
+    ws.append(["R-1", None, "Alice"])  # B2 missing in the XML
+    ws["A5"] = "R-5"  # rows 3-4 missing entirely
+    wb.save(src)
+
+    out_file = patch_tgt_xlsx(
+        str(src),
+        "Data",
+        {2: {2: "Name 1"}, 3: {1: "R-3"}, 5: {3: ""}, 6: {1: "R-6"}},
+        tmp_path / "out",
+    )
+    ws_new = load_workbook(out_file)["Data"]
+
+    assert [c.value for c in ws_new[2]] == ["R-1", "Name 1", "Alice"]
+    assert ws_new["A3"].value == "R-3"
+    assert ws_new["A5"].value == "R-5"
+    assert ws_new["C5"].value is None
+    assert ws_new["A6"].value == "R-6"
+
+
+def test_patch_drops_calc_chain_when_formula_overwritten(tmp_path):
+    src = tmp_path / "formula.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["ID", "Total"])
+    ws.append(["R-1", "=1+1"])
+    wb.save(src)
+
+    # openpyxl never writes a calcChain, so add one the way Excel would
+    patched_src = tmp_path / "formula_calc.xlsx"
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(patched_src, "w") as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename == "[Content_Types].xml":
+                data = data.replace(
+                    b"</Types>",
+                    b'<Override PartName="/xl/calcChain.xml" ContentType='
+                    b'"application/vnd.openxmlformats-officedocument.'
+                    b'spreadsheetml.calcChain+xml"/></Types>',
+                )
+            elif info.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace(
+                    b"</Relationships>",
+                    b'<Relationship Id="rId99" Type="http://schemas.openxmlformats.org/'
+                    b'officeDocument/2006/relationships/calcChain" '
+                    b'Target="calcChain.xml"/></Relationships>',
+                )
+            zout.writestr(info, data)
+        zout.writestr("xl/calcChain.xml", b'<calcChain><c r="B2" i="1"/></calcChain>')
+
+    out_file = patch_tgt_xlsx(str(patched_src), "Sheet", {2: {2: "2"}}, tmp_path)
+
+    with zipfile.ZipFile(out_file) as zf:
+        assert "xl/calcChain.xml" not in zf.namelist()
+        assert b"calcChain" not in zf.read("[Content_Types].xml")
+        assert b"calcChain" not in zf.read("xl/_rels/workbook.xml.rels")
+    assert load_workbook(out_file)["Sheet"]["B2"].value == "2"
+
+
+def test_streaming_patch_matches_patch(tmp_path, tgt_path):
+    # --- Arrange ---
+    new_row = load_workbook(tgt_path)["Sheet1"].max_row + 1
+    updates = {2: {2: "Name 1"}, 4: {3: "x", 5: ""}, new_row: {1: "REC-NEW"}}
+
+    # --- Act ---
+    expected = patch_tgt_xlsx(tgt_path, "Sheet1", updates, tmp_path / "dict")
+    streamed, rows = patch_tgt_xlsx_streaming(
+        tgt_path, "Sheet1", iter(sorted(updates.items())), tmp_path / "stream"
+    )
+
+    # --- Assert ---
+    assert rows == 3
+    with zipfile.ZipFile(expected) as a, zipfile.ZipFile(streamed) as b:
+        for name in a.namelist():
+            assert a.read(name) == b.read(name), name
+
+
+def test_streaming_patch_without_updates_copies_tgt(tmp_path, tgt_path):
+    # --- Act ---
+    out_file, rows = patch_tgt_xlsx_streaming(tgt_path, "Sheet1", iter(()), tmp_path)
+
+    # --- Assert ---
+    assert rows == 0
+    with open(out_file, "rb") as a, open(tgt_path, "rb") as b:
+        assert a.read() == b.read()
+
+
+@pytest.fixture
+def shared_formula_path(tmp_path):
+    """Sheet "Data": A1:A4 = 1..4, B1:B4 = A*2 as one shared formula (master B1)."""
+    src = tmp_path / "plain_formulas.xlsx"
+    wb = Workbook()
+    wb.active.title = "Data"
+    for r in range(1, 5):
+        wb.active.append([r, f"=A{r}*2"])
+    wb.save(src)
+
+    shared = tmp_path / "shared_formula.xlsx"
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(shared, "w") as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename == "xl/worksheets/sheet1.xml":
+                data = data.replace(
+                    b"<f>A1*2</f>", b'<f t="shared" ref="B1:B4" si="0">A1*2</f>'
+                )
+                for r in (2, 3, 4):
+                    data = data.replace(b"<f>A%d*2</f>" % r, b'<f t="shared" si="0"/>')
+            zout.writestr(info, data)
+    return str(shared)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_overwritten_shared_formula_master_detaches_dependents(
+    tmp_path, shared_formula_path, streaming
+):
+    # --- Arrange ---
+    updates = {1: {2: "manual"}, 3: {1: "30"}}
+
+    # --- Act ---
+    if streaming:
+        out_file, _ = patch_tgt_xlsx_streaming(
+            shared_formula_path, "Data", iter(sorted(updates.items())), tmp_path
+        )
+    else:
+        out_file = patch_tgt_xlsx(shared_formula_path, "Data", updates, tmp_path)
+
+    # --- Assert ---
+    with zipfile.ZipFile(out_file) as zf:
+        sheet_xml = zf.read("xl/worksheets/sheet1.xml")
+    assert b'si="0"' not in sheet_xml
+    ws = load_workbook(out_file)["Data"]
+    assert ws["B1"].value == "manual"
+    assert [ws[f"B{r}"].value for r in (2, 3, 4)] == ["=A2*2", "=A3*2", "=A4*2"]
+    assert ws["A3"].value == "30"
+
+
+def test_shared_formula_kept_when_master_untouched(tmp_path, shared_formula_path):
+    # --- Act ---
+    out_file = patch_tgt_xlsx(shared_formula_path, "Data", {3: {2: "x"}}, tmp_path)
+
+    # --- Assert ---
+    with zipfile.ZipFile(out_file) as zf:
+        sheet_xml = zf.read("xl/worksheets/sheet1.xml")
+    assert b'<f t="shared" ref="B1:B4" si="0">A1*2</f>' in sheet_xml
+    assert sheet_xml.count(b'<f t="shared" si="0"/>') == 2
+
+
+@pytest.mark.parametrize("raw_copy", [True, False])
+def test_patched_workbook_passes_testzip(tmp_path, monkeypatch, tgt_path, raw_copy):
+    # --- Arrange ---
+    if not raw_copy:
+        monkeypatch.setattr(
+            "app.data_io.xlsx_patch._raw_copy_supported", lambda zout: False
+        )
+
+    # --- Act ---
+    out_file = patch_tgt_xlsx(tgt_path, "Sheet1", {2: {2: "Name 1"}}, tmp_path)
+
+    # --- Assert ---
+    with zipfile.ZipFile(tgt_path) as zin, zipfile.ZipFile(out_file) as zout:
+        assert zout.testzip() is None
+        for name in zin.namelist():
+            if name != "xl/worksheets/sheet1.xml":
+                assert zin.read(name) == zout.read(name), name
+
+
+def test_bad_raw_copy_falls_back_to_recompressing(tmp_path, monkeypatch, tgt_path):
+    # --- Arrange ---
+    def broken_copy(zin, zout, info):
+        zout.writestr(info.filename, b"not the member")
+
+    monkeypatch.setattr("app.data_io.xlsx_patch._copy_member_raw", broken_copy)
+
+    # --- Act ---
+    out_file = patch_tgt_xlsx(tgt_path, "Sheet1", {2: {2: "Name 1"}}, tmp_path)
+
+    # --- Assert ---
+    with zipfile.ZipFile(tgt_path) as zin, zipfile.ZipFile(out_file) as zout:
+        assert zout.testzip() is None
+        assert zin.read("xl/styles.xml") == zout.read("xl/styles.xml")
+    assert load_workbook(out_file)["Sheet1"]["B2"].value == "Name 1"
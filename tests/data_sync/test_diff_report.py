@@ -1,6 +1,8 @@
 import re
 from pathlib import Path
 from app.data_sync.diff_report import generate_diff_report
+from app.data_sync.diff_report import generate_diff_report_from_change_set
+from app.data_sync.sync_engine import sync_sot_to_tgt
 
 
 def test_generate_diff_report(tmp_path, monkeypatch):
@@ -119,7 +121,7 @@ def test_diff_report_does_not_log_unchanged_records(tmp_path, monkeypatch):
 
     # Use TEST- prefix (required)
     monkeypatch.setattr(
-        "app.data_sync.diff_report.UNIQUE_ID_PREFIX",
+        "app.data_sync.row_filter.UNIQUE_ID_PREFIX",
         "TEST-",
     )
 
@@ -177,7 +179,7 @@ def test_diff_report_skips_ids_not_matching_prefix(tmp_path, monkeypatch):
 
     # Enforce TEST- prefix
     monkeypatch.setattr(
-        "app.data_sync.diff_report.UNIQUE_ID_PREFIX",
+        "app.data_sync.row_filter.UNIQUE_ID_PREFIX",
         "TEST-",
     )
 
@@ -239,3 +241,78 @@ def test_diff_report_skips_ids_not_matching_prefix(tmp_path, monkeypatch):
     # MUST NOT include any mention of invalid IDs at all
     assert "BAD-111" not in content
     assert "BAD-222" not in content
+
+
+def test_change_set_report_matches_snapshot_report(tmp_path, monkeypatch):
+    """
+    The report built from the engine's change set must be identical to the
+    old before/after comparison, without any snapshot of TGT.
+    """
+    monkeypatch.setattr(
+        "app.data_sync.diff_report.LOG_PATH",
+        str(tmp_path / "sync_diff_{timestamp}.log"),
+    )
+
+    # SOT lists REC-003 before REC-002: updated records are reported in TGT order
+    sot_rows = [
+        {"REC ID": "REC-001", "Name": "A", "Owner": "Alice"},
+        {"REC ID": "REC-003", "Name": "C2", "Owner": "Cy"},
+        {"REC ID": "REC-002", "Name": "B2", "Owner": "Bob "},
+        {"REC ID": "REC-004", "Name": "D", "Owner": "Dan"},
+        {"REC ID": "REC-005", "Name": "E", "Owner": "Eve"},
+    ]
+    tgt_rows = [
+        {"Record ID": "REC-001", "Record Name": "A", "Owner": "Alice", "Note": ""},
+        {"Record ID": "REC-002", "Record Name": "B", "Owner": "Robert", "Note": ""},
+        {"Record ID": "REC-003", "Record Name": "C", "Owner": "Cy", "Note": ""},
+        {
+            "Record ID": "REC-005",
+            "Record Name": "old",
+            "Owner": "Eve",
+            "Note": "Record Should Not be Touched",
+        },
+    ]
+    mapping = {"Name": "Record Name", "Owner": "Owner"}
+
+    # Old approach: snapshot, apply the changes, compare
+    new_rows = [dict(r) for r in tgt_rows]
+    change_set = sync_sot_to_tgt(sot_rows, tgt_rows, "REC ID", "Record ID", mapping)
+    for change in change_set.cell_changes:
+        new_rows[change.row - 2][
+            change_set.column_name(change.column)
+        ] = change.new_value
+    for appended in change_set.appended_rows:
+        new_rows.append(
+            {change_set.column_name(c): v for c, v in appended.values.items()}
+        )
+    expected = Path(
+        generate_diff_report("OLD", tgt_rows, new_rows, "Record ID", mapping, tmp_path)
+    ).read_text(encoding="utf-8")
+
+    content = Path(
+        generate_diff_report_from_change_set("NEW", change_set, mapping, tmp_path)
+    ).read_text(encoding="utf-8")
+
+    assert content == expected
+    assert "[UPDATED] REC-002" in content
+    assert content.index("[UPDATED] REC-002") < content.index("[UPDATED] REC-003")
+    assert "Owner: 'Robert' → 'Bob'" in content
+    assert "[ADDED] REC-004" in content
+    assert "REC-005" not in content  # sentinel record
+
+
+def test_change_set_report_no_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "app.data_sync.diff_report.LOG_PATH",
+        str(tmp_path / "sync_diff_{timestamp}.log"),
+    )
+    rows = [{"Record ID": "REC-001", "Owner": "Alice"}]
+    change_set = sync_sot_to_tgt(
+        rows, rows, "Record ID", "Record ID", {"Owner": "Owner"}
+    )
+
+    log_path = generate_diff_report_from_change_set(
+        "EMPTY", change_set, {"Owner": "Owner"}, tmp_path
+    )
+
+    assert Path(log_path).read_text(encoding="utf-8") == "No differences found."
@@ -0,0 +1,62 @@
+import pytest
+
+from app.data_sync.mapping_plan import compile_mapping
+
+
+def test_compile_mapping_resolves_positions_and_sheet_columns():
+    # --- Arrange ---
+    mapping = {"Name": "Title", "Owner": "Assignee"}
+    sot_headers = ["Owner", "REC ID", "Extra", "Name"]
+    tgt_headers = ["Record ID", None, "Assignee", "Status", "Title"]
+
+    # --- Act ---
+    plan = compile_mapping(mapping, "REC ID", "Record ID", sot_headers, tgt_headers)
+
+    # --- Assert ---
+    assert plan.sot_id_position == 1
+    assert plan.sot_positions == (3, 0)
+    # TGT data rows hold the named columns only: the blank header is skipped
+    assert plan.tgt_id_position == 0
+    assert plan.tgt_positions == (3, 1)
+    assert plan.tgt_id_column == 1
+    assert plan.tgt_columns == (5, 3)
+    assert plan.unmapped_sot_columns() == ["Extra"]
+
+
+def test_mapping_plan_compares_and_builds_rows_by_position():
+    # --- Arrange ---
+    plan = compile_mapping(
+        {"Name": "Title", "Owner": "Assignee"},
+        "REC ID",
+        "Record ID",
+        ["REC ID", "Name", "Owner"],
+        ["Record ID", "Assignee", "Title"],
+    )
+    sot_values = plan.sot_values(["REC-1", " New ", "Bob"])
+    tgt_values = plan.tgt_values(["REC-1", "Bob ", "Old"])
+
+    # --- Act ---
+    diffs = plan.compare(sot_values, tgt_values)
+    new_row = plan.new_row("REC-2", ("Name", ""))
+
+    # --- Assert ---
+    assert diffs == [(0, "Old", "New")]
+    assert new_row == {1: "REC-2", 3: "Name"}
+
+
+def test_compile_mapping_lists_every_missing_column():
+    # --- Act ---
+    with pytest.raises(ValueError) as exc:
+        compile_mapping(
+            {"Name": "Title", "Gone": "Title"},
+            "REC ID",
+            "Record ID",
+            ["ID", "Name"],
+            ["Record ID", "Heading"],
+        )
+
+    # --- Assert ---
+    message = str(exc.value)
+    assert "SOT column 'Gone' not found in SOT headers." in message
+    assert "TGT column 'Title' not found in TGT headers." in message
+    assert "SOT unique ID column 'REC ID' not found in SOT headers." in message
@@ -12,7 +12,7 @@ def test_find_orphaned_records_basic(monkeypatch):
     - Status does not block detection
     """
     # Force prefix for this test
-    monkeypatch.setattr("app.data_sync.orphan_detection.UNIQUE_ID_PREFIX", "TEST-")
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "TEST-")
 
     tgt_rows = [
         {"REC ID": "TEST-001", "Description": "desc A", "Status": "Active"},
@@ -30,11 +30,11 @@ def test_find_orphaned_records_basic(monkeypatch):
 
 def test_orphan_is_ignored_based_on_status(monkeypatch):
     # Force prefix for the test
-    monkeypatch.setattr("app.data_sync.orphan_detection.UNIQUE_ID_PREFIX", "TEST-")
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "TEST-")
 
     # Monkeypatch ignore-status list: includes an extra status ("Discarded")
     monkeypatch.setattr(
-        "app.data_sync.orphan_detection.ORPHANS_DETECTION_IGNORE_STATUS",
+        "app.data_sync.row_filter.ORPHANS_DETECTION_IGNORE_STATUS",
         ["Inactive", "Rejected", "Deprecated", "Closed", "Retired", "Discarded"],
     )
 
@@ -57,11 +57,11 @@ def test_orphan_is_ignored_based_on_status(monkeypatch):
 
 def test_orphan_with_empty_status_is_not_ignored(monkeypatch):
     # Ensure prefix is enforced
-    monkeypatch.setattr("app.data_sync.orphan_detection.UNIQUE_ID_PREFIX", "TEST-")
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "TEST-")
 
     # Monkeypatch ignore-status list (no empty value included)
     monkeypatch.setattr(
-        "app.data_sync.orphan_detection.ORPHANS_DETECTION_IGNORE_STATUS",
+        "app.data_sync.row_filter.ORPHANS_DETECTION_IGNORE_STATUS",
         ["Inactive", "Rejected", "Deprecated", "Closed", "Retired"],
     )
 
@@ -97,7 +97,7 @@ def test_find_orphaned_records_empty_sot_ids(monkeypatch):
     If SOT has no IDs, all valid TGT IDs are considered orphaned.
     This matches expected behavior: TGT rows are not in SOT.
     """
-    monkeypatch.setattr("app.data_sync.orphan_detection.UNIQUE_ID_PREFIX", "TEST-")
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "TEST-")
 
     tgt_rows = [
         {"REC ID": "TEST-001"},
@@ -214,7 +214,7 @@ def test_no_orphans_produces_no_output(tmp_path):
 
 def test_orphan_report_outputs_only_id(tmp_path, monkeypatch):
     # Ensure the orphan feature uses strict prefix detection
-    monkeypatch.setattr("app.data_sync.orphan_detection.UNIQUE_ID_PREFIX", "REC-")
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "REC-")
 
     # Redirect LOG_PATH to tmp_path
     monkeypatch.setattr(
@@ -256,7 +256,7 @@ def test_orphan_report_outputs_only_id(tmp_path, monkeypatch):
 
 def test_orphan_log_path_respects_timestamp(tmp_path, monkeypatch):
     # Enforce consistent prefix for test validity
-    monkeypatch.setattr("app.data_sync.orphan_detection.UNIQUE_ID_PREFIX", "TEST-")
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "TEST-")
 
     # Redirect LOG_PATH to tmp_path
     monkeypatch.setattr(
@@ -280,7 +280,7 @@ def test_orphan_log_path_respects_timestamp(tmp_path, monkeypatch):
 
 
 def test_case_sensitivity_in_ids(monkeypatch):
-    monkeypatch.setattr("app.data_sync.orphan_detection.UNIQUE_ID_PREFIX", "TEST-")
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "TEST-")
 
     tgt_rows = [{"REC ID": "TEST-001"}]
     sot_ids = {"test-001"}  # different case
@@ -0,0 +1,59 @@
+from app.data_sync.orphan_detection import should_ignore_orphan
+from app.data_sync.row_filter import compile_row_filter
+
+
+def test_compile_row_filter_reads_config(monkeypatch):
+    # --- Arrange ---
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "TEST-")
+    monkeypatch.setattr(
+        "app.data_sync.row_filter.ORPHANS_DETECTION_IGNORE_STATUS", [" Closed "]
+    )
+
+    # --- Act ---
+    row_filter = compile_row_filter()
+
+    # --- Assert ---
+    assert row_filter.id_prefix == "TEST-"
+    assert row_filter.ignore_statuses == frozenset({"Closed"})
+    assert row_filter.keeps_id(" TEST-1 ")
+    assert not row_filter.keeps_id("REC-1")
+    assert not row_filter.keeps_id(None)
+    column, predicate = row_filter.id_filter("REC ID")
+    assert column == "REC ID"
+    assert predicate(" TEST-1 ") and not predicate("REC-1")
+    assert predicate.cache_key == ("id_prefix", "TEST-")
+
+
+def test_orphan_check_agrees_with_row_dicts():
+    # --- Arrange ---
+    row_filter = compile_row_filter("REC-", ["Retired"])
+    columns = ["Status", "Name", "Record ID"]
+    rows = [
+        ("Active", "a", "REC-1"),
+        ("Retired ", "b", "REC-2"),
+        ("Active", "c", "OTHER-3"),
+        ("", "d", ""),
+    ]
+
+    # --- Act ---
+    ignores_orphan = row_filter.orphan_check(columns, "Record ID")
+    by_position = [ignores_orphan(values) for values in rows]
+    by_dict = [
+        should_ignore_orphan(dict(zip(columns, values)), "Record ID", row_filter)
+        for values in rows
+    ]
+
+    # --- Assert ---
+    assert by_position == by_dict == [False, True, True, True]
+
+
+def test_orphan_check_without_status_column_uses_prefix_only():
+    # --- Arrange ---
+    row_filter = compile_row_filter("REC-", ["Retired"])
+
+    # --- Act ---
+    ignores_orphan = row_filter.orphan_check(["Record ID", "Name"], "Record ID")
+
+    # --- Assert ---
+    assert ignores_orphan(("REC-1", "Retired")) is False
+    assert ignores_orphan(("OTHER-1", "a")) is True
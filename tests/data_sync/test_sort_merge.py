@@ -0,0 +1,94 @@
+import pytest
+from openpyxl import Workbook
+
+from app.data_sync.mapping_plan import compile_mapping
+from app.data_sync.sort_merge import ExternalSorter, merge_changes
+from app.xlsx_sync import run_sync
+
+
+def test_external_sorter_merges_runs_in_key_order_and_keeps_ties_stable():
+    # --- Arrange ---
+    keys = ["d", "b", "a", "c", "b", "a", "e", "b"]
+
+    # --- Act ---
+    with ExternalSorter(run_rows=3) as sorter:
+        for i, key in enumerate(keys):
+            sorter.add(key, i)
+        first = list(sorter)
+        second = list(sorter)
+
+    # --- Assert ---
+    assert first == sorted(((k, i) for i, k in enumerate(keys)), key=lambda p: p[0])
+    assert [i for k, i in first if k == "b"] == [1, 4, 7]
+    assert second == first
+    assert len(sorter) == len(keys)
+
+
+def test_external_sorter_removes_its_runs_on_close(tmp_path):
+    # --- Arrange ---
+    sorter = ExternalSorter(run_rows=2, directory=tmp_path)
+    for i in range(5):
+        sorter.add(i, i)
+
+    # --- Act ---
+    sorter.close()
+
+    # --- Assert ---
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_merge_changes_emits_updates_additions_and_orphans():
+    # --- Arrange ---
+    plan = compile_mapping(
+        {"Name": "Title"}, "ID", "ID", ["ID", "Name"], ["ID", "Title", "Status"]
+    )
+    sot = [("A-1", (0, 2, ("new",))), ("A-3", (1, 3, ("added",)))]
+    tgt = [
+        ("A-1", (2, ("old",), False, False)),
+        ("A-2", (3, ("kept",), False, False)),
+    ]
+    counters = {"cells_compared": 0, "cells_changed": 0, "rows_appended": 0}
+
+    # --- Act ---
+    changes = merge_changes(sot, tgt, plan, 3, counters, run_rows=1)
+
+    # --- Assert ---
+    assert list(changes.row_updates()) == [
+        (2, {2: "new"}),
+        (4, {1: "A-3", 2: "added"}),
+    ]
+    assert [rid for _, rid in changes.orphans] == ["A-2"]
+    assert counters == {"cells_compared": 1, "cells_changed": 1, "rows_appended": 1}
+    changes.close()
+
+
+def test_sort_merge_sync_rejects_duplicate_ids(tmp_path, monkeypatch):
+    # --- Arrange ---
+    monkeypatch.setattr("app.data_sync.sort_merge.SORT_MERGE_RUN_ROWS", 2)
+    sot_path, tgt_path = tmp_path / "sot.xlsx", tmp_path / "tgt.xlsx"
+    for path, rows in (
+        (sot_path, [["ID", "Name"], ["A-1", "x"], ["A-2", "y"], ["A-1", "z"]]),
+        (tgt_path, [["ID", "Title"], ["A-1", "x"]]),
+    ):
+        wb = Workbook()
+        for row in rows:
+            wb.active.append(row)
+        wb.active.title = "Data"
+        wb.save(path)
+
+    # --- Act / Assert ---
+    with pytest.raises(
+        ValueError, match=r"row 4: duplicate ID 'A-1' \(first seen at row 2\)"
+    ):
+        run_sync(
+            str(sot_path),
+            str(tgt_path),
+            "Data",
+            "Data",
+            "ID",
+            "ID",
+            {"Name": "Title"},
+            output_dir=str(tmp_path / "out"),
+            engine="sort_merge",
+        )
+    assert not (tmp_path / "out").exists()
@@ -1,8 +1,13 @@
+import random
+
 import pytest
 from loguru import logger
 
 from app.data_sync.sync_engine import sync_sot_to_tgt
 from app.data_sync.sync_engine import find_unmapped_sot_columns
+from app.data_sync.sync_engine import sync_sot_to_tgt_vectorized
+from app.data_sync.change_set import CellChange
+from app.data_io.table import Table
 
 
 @pytest.fixture
@@ -43,30 +48,38 @@ def test_sync_updates_and_adds(sample_data, caplog):
     sot_rows, tgt_rows, mapping = sample_data
     logger.add(caplog.handler)
 
-    updated = sync_sot_to_tgt(
+    change_set = sync_sot_to_tgt(
         sot_rows=sot_rows,
         tgt_rows=tgt_rows,
         unique_id_col_sot="REC ID",
         unique_id_col_tgt="REC ID",
         column_mapping=mapping,
     )
+    # headers default to the first TGT row: REC ID, Description, Owner, ...
+    assert change_set.headers[:3] == ["REC ID", "Description", "Owner"]
 
-    # IDs that should now exist
-    ids = {r["REC ID"] for r in updated}
-    assert {"REC-001", "REC-002", "REC-999"} == ids
+    # REC-001 updated: only its Description cell (row 2, column 2)
+    assert change_set.cell_changes == [
+        CellChange("REC-001", 2, 2, "Old desc", "Updated desc")
+    ]
 
-    # REC-001 updated
-    rec1 = next(r for r in updated if r["REC ID"] == "REC-001")
-    assert rec1["Description"] == "Updated desc"
+    # REC-002 added below the last TGT row; REC-999 untouched
+    assert len(change_set.appended_rows) == 1
+    added = change_set.appended_rows[0]
+    assert added.record_id == "REC-002"
+    assert added.row == 4
+    assert added.values == {1: "REC-002", 2: "New record", 3: "Bob"}
 
-    # REC-002 added
-    rec2 = next(r for r in updated if r["REC ID"] == "REC-002")
-    assert rec2["Owner"] == "Bob"
+    # TGT rows are never mutated; old values live in the change set
+    assert [r["Description"] for r in tgt_rows] == ["Old desc", "Existing record"]
+    assert len(tgt_rows) == 2
+    assert change_set.tgt_rows == {2: tgt_rows[0]}
 
-    # REC-999 unchanged
-    rec999 = next(r for r in updated if r["REC ID"] == "REC-999")
-    assert rec999["Owner"] == "Charlie"
-    assert rec999["Description"] == "Existing record"
+    # Writers receive only the changed cells
+    assert change_set.cell_updates() == {
+        2: {2: "Updated desc"},
+        4: {1: "REC-002", 2: "New record", 3: "Bob"},
+    }
 
     # Verify logs for both update and add
     log_text = " ".join(caplog.messages)
@@ -74,6 +87,135 @@ def test_sync_updates_and_adds(sample_data, caplog):
     assert "added" in log_text
 
 
+def test_sync_anchors_changes_to_sheet_rows():
+    """Blank/filtered rows in TGT must not shift the rows that get written."""
+    sot_rows = [
+        {"REC ID": "REC-002", "Owner": "Bob"},
+        {"REC ID": "REC-003", "Owner": "Cara"},
+    ]
+    tgt_rows = [
+        {"Notes": "", "REC ID": "REC-001", "Owner": "Alice"},
+        {"Notes": "", "REC ID": "REC-002", "Owner": "Old"},
+    ]
+
+    change_set = sync_sot_to_tgt(
+        sot_rows,
+        tgt_rows,
+        "REC ID",
+        "REC ID",
+        {"Owner": "Owner"},
+        tgt_headers=["Notes", "REC ID", "Owner"],
+        tgt_row_numbers=[2, 7],
+    )
+
+    assert change_set.cell_changes == [CellChange("REC-002", 7, 3, "Old", "Bob")]
+    assert change_set.appended_rows[0].row == 8
+    assert change_set.appended_rows[0].values == {2: "REC-003", 3: "Cara"}
+
+
+def test_sync_accepts_tables(sample_data):
+    """Tables from the readers give the same change set as row dicts."""
+    sot_rows, tgt_rows, mapping = sample_data
+
+    def to_table(rows):
+        headers = list(rows[0].keys())
+        return Table.from_rows(headers, [[r[h] for h in headers] for r in rows])
+
+    expected = sync_sot_to_tgt(sot_rows, tgt_rows, "REC ID", "REC ID", mapping)
+    result = sync_sot_to_tgt(
+        to_table(sot_rows), to_table(tgt_rows), "REC ID", "REC ID", mapping
+    )
+
+    assert result.cell_changes == expected.cell_changes
+    assert result.appended_rows == expected.appended_rows
+    assert dict(result.tgt_rows[2]) == tgt_rows[0]
+
+
+def test_sync_no_changes_gives_empty_change_set(sample_data):
+    _, tgt_rows, mapping = sample_data
+
+    change_set = sync_sot_to_tgt(tgt_rows, tgt_rows, "REC ID", "REC ID", mapping)
+
+    assert change_set.is_empty()
+    assert change_set.cell_updates() == {}
+
+
+@pytest.mark.parametrize(
+    "as_table, fingerprinted", [(False, False), (True, False), (True, True)]
+)
+def test_vectorized_engine_matches_per_cell_engine(as_table, fingerprinted):
+    pytest.importorskip("numpy", minversion="2.0")
+    rnd = random.Random(42)
+    pool = ["", "a", "a ", " a", "B", "b", "Active", "Closed", "  ", "x\ny"]
+    cols = [f"C{i}" for i in range(12)]
+    mapping = {c: f"T{c}" for c in cols}
+
+    sot_rows, tgt_rows = [], []
+    for i in range(400):
+        rec_id = "" if i % 97 == 0 else f"REC-{i:04d}"
+        sot_rows.append({"ID": rec_id, **{c: rnd.choice(pool) for c in cols}})
+        if i % 5:  # 1 in 5 SOT records is new
+            tgt_rows.append(
+                {"Record ID": rec_id, **{mapping[c]: rnd.choice(pool) for c in cols}}
+            )
+    tgt_rows.append({"Record ID": "REC-ORPHAN", **{mapping[c]: "z" for c in cols}})
+    rnd.shuffle(tgt_rows)
+    tgt_headers = list(tgt_rows[0].keys())
+    row_numbers = sorted(rnd.sample(range(2, 2000), len(tgt_rows)))
+    kwargs = dict(tgt_headers=tgt_headers, tgt_row_numbers=row_numbers)
+    expected = sync_sot_to_tgt(sot_rows, tgt_rows, "ID", "Record ID", mapping, **kwargs)
+
+    if as_table:
+        sot_fp = list(mapping.keys()) if fingerprinted else None
+        tgt_fp = list(mapping.values()) if fingerprinted else None
+        sot_rows = Table.from_rows(
+            ["ID", *cols],
+            [list(r.values()) for r in sot_rows],
+            fingerprint_columns=sot_fp,
+        )
+        tgt_rows = Table.from_rows(
+            tgt_headers,
+            [[r[h] for h in tgt_headers] for r in tgt_rows],
+            fingerprint_columns=tgt_fp,
+        )
+
+    args = (sot_rows, tgt_rows, "ID", "Record ID", mapping)
+    per_cell = sync_sot_to_tgt(*args, **kwargs)
+    result = sync_sot_to_tgt_vectorized(*args, **kwargs)
+
+    assert expected.cell_changes  # the data really has differences
+    assert per_cell.cell_changes == expected.cell_changes
+    assert per_cell.appended_rows == expected.appended_rows
+    assert result.cell_changes == expected.cell_changes
+    assert result.appended_rows == expected.appended_rows
+    assert result.tgt_rows.keys() == expected.tgt_rows.keys()
+
+
+@pytest.mark.parametrize("engine", [sync_sot_to_tgt, sync_sot_to_tgt_vectorized])
+def test_sync_skips_records_with_matching_fingerprints(engine):
+    # --- Arrange ---
+    mapping = {"Owner": "Owner"}
+    sot = Table.from_rows(
+        ["REC ID", "Owner"],
+        [["REC-001", "Alice"], ["REC-002", "Bob"]],
+        fingerprint_columns=["Owner"],
+    )
+    tgt = Table.from_rows(
+        ["REC ID", "Owner"],
+        [["REC-001", " Alice "], ["REC-002", "Old"]],
+        fingerprint_columns=["Owner"],
+    )
+    assert sot.fingerprints[0] == tgt.fingerprints[0]  # whitespace normalised
+
+    # --- Act ---
+    # pretend REC-002 is unchanged: its columns must not be compared at all
+    tgt.fingerprints[1] = sot.fingerprints[1]
+    change_set = engine(sot, tgt, "REC ID", "REC ID", mapping)
+
+    # --- Assert ---
+    assert change_set.is_empty()
+
+
 def test_sync_skips_missing_id(caplog):
     sot_rows = [{"Description": "No ID"}]
     tgt_rows = []
@@ -82,7 +224,7 @@ def test_sync_skips_missing_id(caplog):
     logger.add(caplog.handler)
 
     result = sync_sot_to_tgt(sot_rows, tgt_rows, "REC ID", "REC ID", mapping)
-    assert result == []
+    assert result.is_empty()
     assert any("missing unique ID" in m for m in caplog.messages)
 
 
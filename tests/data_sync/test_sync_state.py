@@ -0,0 +1,146 @@
+import os
+
+from app.data_io.fingerprint import row_fingerprint
+from app.data_io.table import Table
+from app.data_sync.change_set import AppendedRow, CellChange, ChangeSet
+from app.data_sync.sync_state import (
+    build_state_entry,
+    changed_sot_positions,
+    file_signature,
+    id_fingerprints,
+    load_sync_state,
+    mapping_key,
+    reusable_output,
+    save_sync_state,
+    written_fingerprints,
+)
+
+MAPPING = {"Description": "Description", "Owner": "Owner"}
+
+
+def _signature(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return file_signature(str(path))
+
+
+def test_file_signature_reuses_hash_only_for_same_stat(tmp_path):
+    sig = _signature(tmp_path, "a.xlsx", b"abc")
+
+    # same size and mtime: the known hash is trusted without reading the file
+    fake = {**sig, "sha256": "cached"}
+    assert file_signature(sig["path"], [None, fake])["sha256"] == "cached"
+
+    # touched file: re-hashed, same content gives the same hash
+    os.utime(sig["path"], ns=(0, sig["mtime_ns"] + 1_000_000_000))
+    assert file_signature(sig["path"], [fake])["sha256"] == sig["sha256"]
+
+
+def test_state_round_trip_and_mapping_invalidation(tmp_path):
+    # --- Arrange ---
+    state_path = tmp_path / "out" / ".sync_state.json"
+    key = mapping_key("SOT_Data", "Sheet1", "REC ID", "Record ID", MAPPING)
+    entry = {"mapping": key, "sot": {}, "tgt": {}}
+
+    # --- Act ---
+    save_sync_state(state_path, "pair-1", entry)
+    save_sync_state(state_path, "pair-2", {"mapping": "other"})
+
+    # --- Assert ---
+    assert load_sync_state(state_path, "pair-1", key) == entry
+    assert load_sync_state(state_path, "pair-3", key) is None
+
+    changed = mapping_key(
+        "SOT_Data", "Sheet1", "REC ID", "Record ID", {"Owner": "Owner"}
+    )
+    assert changed != key
+    assert load_sync_state(state_path, "pair-1", changed) is None
+
+    state_path.write_text("{not json")
+    assert load_sync_state(state_path, "pair-1", key) is None
+
+
+def test_reusable_output(tmp_path):
+    sot = _signature(tmp_path, "sot.xlsx", b"sot")
+    tgt = _signature(tmp_path, "tgt.xlsx", b"tgt")
+    out = _signature(tmp_path, "out.xlsx", b"out")
+    state = {"sot": sot, "tgt": tgt, "output": out}
+
+    assert reusable_output(None, sot, tgt) is None
+    assert reusable_output(state, sot, tgt) == out["path"]
+    assert reusable_output(state, sot, out) == out["path"]  # output fed back as TGT
+
+    edited_sot = _signature(tmp_path, "sot2.xlsx", b"sot edited")
+    assert reusable_output(state, edited_sot, tgt) is None
+
+    (tmp_path / "out.xlsx").write_bytes(b"overwritten since")
+    assert reusable_output(state, sot, tgt) is None
+
+
+def test_only_moved_records_are_resynced():
+    # --- Arrange ---
+    headers = ["REC ID", "Description", "Owner"]
+    sot = Table.from_rows(
+        headers,
+        [["REC-1", "A", "Al"], ["REC-2", "B", "Bo"], ["REC-3", "C", "Cy"]],
+        fingerprint_columns=list(MAPPING),
+    )
+    tgt = Table.from_rows(
+        headers,
+        [["REC-1", "A", "Al"], ["REC-2", "B", "Bo"], ["REC-3", "C", "Cy"]],
+        fingerprint_columns=list(MAPPING.values()),
+    )
+    sot_fp = id_fingerprints(sot, "REC ID", list(MAPPING))
+    tgt_fp = id_fingerprints(tgt, "REC ID", list(MAPPING.values()))
+    state = build_state_entry("key", {}, {}, {}, sot_fp, tgt_fp)
+
+    # --- Act ---
+    sot_fp_now = {**sot_fp, "REC-2": "moved", "REC-4": "new"}
+    tgt_fp_now = {**tgt_fp, "REC-3": "edited in TGT"}
+    positions = changed_sot_positions(
+        state, sot_fp_now, tgt_fp_now, ["REC-1", "REC-2", "REC-3", "REC-4", ""]
+    )
+
+    # --- Assert ---
+    assert positions == [1, 2, 3, 4]
+    assert changed_sot_positions(state, sot_fp, tgt_fp, ["REC-1", "REC-2"]) == []
+
+
+def test_written_fingerprints_follow_the_output_rows():
+    # --- Arrange ---
+    columns = ["Description", "Owner"]
+    tgt_row = {"Record ID": "REC-1", "Description": "old", "Owner": "Al"}
+    change_set = ChangeSet(headers=["Record ID", "Description", "Owner"])
+    change_set.tgt_rows[2] = tgt_row
+    change_set.cell_changes.append(CellChange("REC-1", 2, 2, "old", "new"))
+    change_set.appended_rows.append(
+        AppendedRow("REC-3", 4, {1: "REC-3", 2: "C", 3: "Cy"})
+    )
+    tgt_fp = {"REC-1": "before", "REC-2": "sentinel row, left alone"}
+
+    # --- Act ---
+    fingerprints = written_fingerprints(tgt_fp, change_set, columns)
+
+    # --- Assert ---
+    assert fingerprints == {
+        "REC-1": row_fingerprint(["new", "Al"]).hex(),
+        "REC-2": "sentinel row, left alone",
+        "REC-3": row_fingerprint(["C", "Cy"]).hex(),
+    }
+    assert tgt_row["Description"] == "old"
+
+
+def test_written_fingerprint_of_appended_blank_matches_read_time():
+    # --- Arrange ---
+    headers = ["REC ID", "Description", "Owner"]
+    change_set = ChangeSet(headers=headers)
+    change_set.appended_rows.append(AppendedRow("REC-1", 2, {1: "REC-1", 3: "Al"}))
+    read_back = Table.from_rows(
+        headers, [["REC-1", None, "Al"]], fingerprint_columns=list(MAPPING.values())
+    )
+
+    # --- Act ---
+    fingerprints = written_fingerprints({}, change_set, list(MAPPING.values()))
+
+    # --- Assert ---
+    assert fingerprints == id_fingerprints(read_back, "REC ID", list(MAPPING.values()))
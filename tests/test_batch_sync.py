@@ -0,0 +1,96 @@
+import json
+import shutil
+
+import pytest
+from openpyxl import load_workbook
+
+from app.batch_sync import TgtJob, run_sync_batch
+from app.xlsx_sync import run_sync
+from config import SOT_TO_TGT_COLUMN_MAPPING
+
+SOT_PATH = "tests/sample_input_files/SOT_sample.xlsx"
+TGT_PATH = "tests/sample_input_files/TGT_sample.xlsx"
+
+
+def _values(path):
+    ws = load_workbook(path, read_only=True)["Sheet1"]
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_matches_single_target_sync(tmp_path, monkeypatch, max_workers):
+    # --- Arrange ---
+    log_path = str(tmp_path / "single" / "sync_diff_{timestamp}.log")
+    monkeypatch.setattr("app.data_sync.diff_report.LOG_PATH", log_path)
+    monkeypatch.setattr("app.data_sync.orphan_detection.LOG_PATH", log_path)
+    second_tgt = tmp_path / "TGT_copy.xlsx"
+    shutil.copyfile(TGT_PATH, second_tgt)
+    jobs = [
+        TgtJob(TGT_PATH, "Sheet1", "Record ID", SOT_TO_TGT_COLUMN_MAPPING),
+        TgtJob(str(second_tgt), "Sheet1", "Record ID", SOT_TO_TGT_COLUMN_MAPPING),
+        TgtJob(TGT_PATH, "Missing sheet", "Record ID", SOT_TO_TGT_COLUMN_MAPPING),
+    ]
+    single = run_sync(
+        SOT_PATH,
+        TGT_PATH,
+        "SOT_Data",
+        "Sheet1",
+        "REC ID",
+        "Record ID",
+        SOT_TO_TGT_COLUMN_MAPPING,
+        output_dir=str(tmp_path / "single"),
+        incremental=False,
+        parse_cache=False,
+    )
+
+    # --- Act ---
+    result = run_sync_batch(
+        SOT_PATH,
+        "SOT_Data",
+        "REC ID",
+        jobs,
+        output_dir=str(tmp_path / "batch"),
+        parse_cache=False,
+        max_workers=max_workers,
+    )
+
+    # --- Assert ---
+    first, second, failed = result.targets
+    expected = _values(single.output_file)
+    for target in (first, second):
+        assert target.error is None
+        assert _values(target.output_file) == expected
+        assert target.metrics.counters == single.metrics.counters | {
+            "bytes_written": target.metrics.counters["bytes_written"]
+        }
+        with open(target.report_file, encoding="utf-8") as f:
+            assert "[ORPHANED]" in f.read()
+    assert first.output_dir != failed.output_dir
+    assert failed.error and failed.output_file is None
+
+    summary = json.loads(open(result.summary_file, encoding="utf-8").read())
+    assert summary["succeeded"] == 2 and summary["failed"] == 1
+    assert summary["totals"]["cells_changed"] == (
+        2 * single.metrics.counters["cells_changed"]
+    )
+    assert [s.name for s in result.metrics.stages] == ["read_sot", "targets"]
+
+
+def test_batch_validates_sot_against_every_mapping(tmp_path):
+    # --- Arrange ---
+    jobs = [
+        TgtJob(TGT_PATH, "Sheet1", "Record ID", SOT_TO_TGT_COLUMN_MAPPING),
+        TgtJob(TGT_PATH, "Sheet1", "Record ID", {"Not in SOT": "Status"}),
+    ]
+
+    # --- Act / Assert ---
+    with pytest.raises(ValueError, match="SOT validation failed"):
+        run_sync_batch(
+            SOT_PATH,
+            "SOT_Data",
+            "REC ID",
+            jobs,
+            output_dir=str(tmp_path),
+            parse_cache=False,
+            max_workers=1,
+        )
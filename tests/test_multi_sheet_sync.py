@@ -0,0 +1,124 @@
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from app.multi_sheet_sync import SheetPair, run_sync_sheets
+from app.xlsx_sync import run_sync
+from config import SOT_TO_TGT_COLUMN_MAPPING
+
+SOT_PATH = "tests/sample_input_files/SOT_sample.xlsx"
+TGT_PATH = "tests/sample_input_files/TGT_sample.xlsx"
+
+
+def _values(path, sheet_name="Sheet1"):
+    ws = load_workbook(path, read_only=True)[sheet_name]
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+@pytest.fixture
+def multi_sheet_files(tmp_path):
+    """SOT with sheets SOT_Data and Risks, TGT with Sheet1, Risks and Notes."""
+    sot = load_workbook(SOT_PATH)
+    sot.copy_worksheet(sot["SOT_Data"]).title = "Risks"
+    sot_path = tmp_path / "SOT_multi.xlsx"
+    sot.save(sot_path)
+
+    tgt = load_workbook(TGT_PATH)
+    tgt.copy_worksheet(tgt["Sheet1"]).title = "Risks"
+    tgt.create_sheet("Notes").append(["left as is"])
+    tgt_path = tmp_path / "TGT_multi.xlsx"
+    tgt.save(tgt_path)
+    return str(sot_path), str(tgt_path)
+
+
+@pytest.mark.parametrize("max_workers, write_mode", [(1, "openpyxl"), (2, "patch")])
+def test_sheet_pairs_match_single_sheet_syncs(
+    tmp_path, monkeypatch, multi_sheet_files, max_workers, write_mode
+):
+    # --- Arrange ---
+    log_path = str(tmp_path / "single" / "sync_diff_{timestamp}.log")
+    monkeypatch.setattr("app.data_sync.diff_report.LOG_PATH", log_path)
+    monkeypatch.setattr("app.data_sync.orphan_detection.LOG_PATH", log_path)
+    sot_path, tgt_path = multi_sheet_files
+    pairs = [
+        SheetPair(
+            "SOT_Data", "Sheet1", "REC ID", "Record ID", SOT_TO_TGT_COLUMN_MAPPING
+        ),
+        SheetPair("Risks", "Risks", "REC ID", "Record ID", SOT_TO_TGT_COLUMN_MAPPING),
+        SheetPair("Missing", "Notes", "REC ID", "Record ID", SOT_TO_TGT_COLUMN_MAPPING),
+    ]
+    single = run_sync(
+        SOT_PATH,
+        TGT_PATH,
+        "SOT_Data",
+        "Sheet1",
+        "REC ID",
+        "Record ID",
+        SOT_TO_TGT_COLUMN_MAPPING,
+        output_dir=str(tmp_path / "single"),
+        incremental=False,
+        parse_cache=False,
+    )
+
+    # --- Act ---
+    result = run_sync_sheets(
+        sot_path,
+        tgt_path,
+        pairs,
+        output_dir=str(tmp_path / "sheets"),
+        write_mode=write_mode,
+        max_workers=max_workers,
+    )
+
+    # --- Assert ---
+    first, second, failed = result.pairs
+    expected = _values(single.output_file)
+    assert _values(result.output_file, "Sheet1") == expected
+    assert _values(result.output_file, "Risks") == expected
+    assert _values(result.output_file, "Notes") == [["left as is"]]
+    for pair_result in (first, second):
+        assert pair_result.error is None
+        assert pair_result.metrics.counters["cells_changed"] == (
+            single.metrics.counters["cells_changed"]
+        )
+        with open(pair_result.report_file, encoding="utf-8") as f:
+            assert "[ORPHANED]" in f.read()
+    assert first.report_file != second.report_file
+    assert failed.error.startswith("Preflight failed")
+    assert "SOT sheet 'Missing' not found" in failed.error
+    assert failed.report_file is None
+
+    summary = json.loads(open(result.summary_file, encoding="utf-8").read())
+    assert summary["succeeded"] == 2 and summary["failed"] == 1
+    assert summary["totals"]["cells_changed"] == (
+        2 * single.metrics.counters["cells_changed"]
+    )
+    assert [s.name for s in result.metrics.stages] == ["preflight", "pairs", "write"]
+
+
+def test_sheet_pairs_must_target_distinct_sheets(tmp_path):
+    # --- Arrange ---
+    pairs = [
+        SheetPair(
+            "SOT_Data", "Sheet1", "REC ID", "Record ID", SOT_TO_TGT_COLUMN_MAPPING
+        ),
+        SheetPair("SOT_Data", "Sheet1", "REC ID", "Record ID", {"Status": "Status"}),
+    ]
+
+    # --- Act / Assert ---
+    with pytest.raises(ValueError, match="more than one pair"):
+        run_sync_sheets(SOT_PATH, TGT_PATH, pairs, output_dir=str(tmp_path))
+
+
+def test_single_sheet_engines_are_rejected(tmp_path):
+    pairs = [
+        SheetPair(
+            "SOT_Data", "Sheet1", "REC ID", "Record ID", SOT_TO_TGT_COLUMN_MAPPING
+        )
+    ]
+
+    with pytest.raises(ValueError, match="use 'python' or 'vectorized'"):
+        run_sync_sheets(
+            SOT_PATH, TGT_PATH, pairs, output_dir=str(tmp_path), engine="sort_merge"
+        )
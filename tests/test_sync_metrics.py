@@ -0,0 +1,75 @@
+import json
+import pstats
+
+import pytest
+
+from app.sync_metrics import SyncMetrics
+
+
+def test_stages_and_counters_are_recorded():
+    metrics = SyncMetrics()
+
+    with metrics.capture():
+        with metrics.stage("read_sot"):
+            data = [0] * 100_000
+        with metrics.stage("sync"):
+            del data
+    metrics.counters["cells_compared"] = 12
+
+    assert [s.name for s in metrics.stages] == ["read_sot", "sync"]
+    assert all(s.wall_s >= 0 for s in metrics.stages)
+    assert all(s.peak_alloc_bytes is None for s in metrics.stages)
+    assert metrics.total_wall_s >= sum(s.wall_s for s in metrics.stages)
+
+    data = metrics.to_dict()
+    assert data["counters"]["cells_compared"] == 12
+    assert data["stages"][0]["name"] == "read_sot"
+
+
+def test_sidecars(tmp_path):
+    metrics = SyncMetrics()
+    with metrics.stage("write"):
+        pass
+    metrics.counters["bytes_written"] = 2048
+    output_file = tmp_path / "TGT_updated_20250101_1200.xlsx"
+
+    json_path = metrics.write_sidecar(str(output_file), "json")
+    prom_path = metrics.write_sidecar(str(output_file), "prometheus")
+
+    assert json_path == str(tmp_path / "TGT_updated_20250101_1200.metrics.json")
+    assert json.loads(open(json_path).read())["counters"]["bytes_written"] == 2048
+    prom = open(prom_path).read()
+    assert 'xlsx_sync_stage_seconds{stage="write"}' in prom
+    assert "xlsx_sync_bytes_written 2048" in prom
+
+    with pytest.raises(ValueError):
+        metrics.write_sidecar(str(output_file), "xml")
+
+
+def test_cprofile_capture(tmp_path):
+    metrics = SyncMetrics(profile="cprofile")
+    with metrics.capture():
+        sorted(range(1000), reverse=True)
+
+    path = metrics.save_profile(str(tmp_path / "out.xlsx"))
+
+    assert path == str(tmp_path / "out.prof")
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_tracemalloc_capture(tmp_path):
+    metrics = SyncMetrics(profile="tracemalloc")
+    with metrics.capture():
+        with metrics.stage("read_tgt"):
+            data = [str(i) for i in range(50_000)]
+
+    assert metrics.stages[0].peak_alloc_bytes > 1_000_000
+    assert metrics.save_profile(str(tmp_path / "out.xlsx")).endswith(
+        "out.tracemalloc.txt"
+    )
+    del data
+
+
+def test_unknown_profile_mode():
+    with pytest.raises(ValueError):
+        SyncMetrics(profile="perf")
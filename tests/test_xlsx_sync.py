@@ -0,0 +1,214 @@
+import pytest
+from openpyxl import load_workbook
+
+from app.xlsx_sync import run_sync
+from config import SOT_TO_TGT_COLUMN_MAPPING
+
+
+@pytest.mark.parametrize(
+    "parallel_read, read_stages",
+    [(False, ["read_sot", "read_tgt"]), (True, ["read"])],
+)
+def test_run_sync_returns_metrics(tmp_path, monkeypatch, parallel_read, read_stages):
+    # --- Arrange ---
+    log_path = str(tmp_path / "sync_diff_{timestamp}.log")
+    monkeypatch.setattr("app.data_sync.diff_report.LOG_PATH", log_path)
+    monkeypatch.setattr("app.data_sync.orphan_detection.LOG_PATH", log_path)
+
+    # --- Act ---
+    result = run_sync(
+        "tests/sample_input_files/SOT_sample.xlsx",
+        "tests/sample_input_files/TGT_sample.xlsx",
+        "SOT_Data",
+        "Sheet1",
+        "REC ID",
+        "Record ID",
+        SOT_TO_TGT_COLUMN_MAPPING,
+        output_dir=str(tmp_path),
+        write_mode="patch",
+        parallel_read=parallel_read,
+        metrics_sidecar="json",
+        incremental=True,
+    )
+
+    # --- Assert ---
+    metrics = result.metrics
+    assert load_workbook(result.output_file)["Sheet1"].max_row > 1
+    assert [s.name for s in metrics.stages] == [
+        "preflight",
+        "state_check",
+        *read_stages,
+        "sync",
+        "write",
+        "diff",
+        "orphans",
+        "save_state",
+    ]
+    counters = metrics.counters
+    assert counters["cells_changed"] > 0
+    assert counters["cells_compared"] >= counters["cells_changed"]
+    assert counters["rows_appended"] > 0
+    assert counters["orphans_found"] > 0
+    assert counters["bytes_written"] > 0
+    assert result.metrics_file.endswith(".metrics.json")
+
+
+def _sheet_values(path):
+    return [list(r) for r in load_workbook(path)["Sheet1"].iter_rows(values_only=True)]
+
+
+def _report_blocks(path):
+    """Report entries (record blocks) as a set, plus the orphan section."""
+    text = open(path, encoding="utf-8").read()
+    diff, _, orphans = text.partition("=== ORPHANED RECORDS")
+    return set(diff.strip().split("\n\n")), orphans
+
+
+@pytest.mark.parametrize("write_mode", ["openpyxl", "patch"])
+def test_streaming_sync_matches_table_sync(tmp_path, monkeypatch, write_mode):
+    # --- Arrange ---
+    log_path = str(tmp_path / "{mode}" / "sync_diff.log")
+    results = {}
+
+    # --- Act ---
+    for streaming in (False, True):
+        out = tmp_path / ("streaming" if streaming else "table")
+        log = log_path.format(mode=out.name)
+        monkeypatch.setattr("app.data_sync.diff_report.LOG_PATH", log)
+        monkeypatch.setattr("app.data_sync.orphan_detection.LOG_PATH", log)
+        results[streaming] = run_sync(
+            "tests/sample_input_files/SOT_sample.xlsx",
+            "tests/sample_input_files/TGT_sample.xlsx",
+            "SOT_Data",
+            "Sheet1",
+            "REC ID",
+            "Record ID",
+            SOT_TO_TGT_COLUMN_MAPPING,
+            output_dir=str(out),
+            write_mode=write_mode,
+            incremental=False,
+            parse_cache=False,
+            streaming=streaming,
+        )
+
+    # --- Assert ---
+    table, streamed = results[False], results[True]
+    assert _sheet_values(streamed.output_file) == _sheet_values(table.output_file)
+    assert _report_blocks(log_path.format(mode="streaming")) == _report_blocks(
+        log_path.format(mode="table")
+    )
+    assert [s.name for s in streamed.metrics.stages] == [
+        "preflight",
+        "index_sot",
+        "sync_write",
+    ]
+    for counter in ("cells_changed", "rows_appended", "orphans_found"):
+        assert streamed.metrics.counters[counter] == table.metrics.counters[counter]
+
+
+def _reversed_sot(tmp_path):
+    """SOT sample with its records in reverse order, so SOT and TGT order differ."""
+    wb = load_workbook("tests/sample_input_files/SOT_sample.xlsx")
+    ws = wb["SOT_Data"]
+    header, *records = [list(r) for r in ws.iter_rows(values_only=True)]
+    ws.delete_rows(2, ws.max_row)
+    for record in reversed(records):
+        ws.append(record)
+    path = tmp_path / "SOT_reversed.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("reverse_sot", [False, True])
+@pytest.mark.parametrize("write_mode", ["openpyxl", "patch"])
+def test_sort_merge_sync_matches_hash_join_sync(
+    tmp_path, monkeypatch, write_mode, reverse_sot
+):
+    # --- Arrange ---
+    monkeypatch.setattr("app.data_sync.sort_merge.SORT_MERGE_RUN_ROWS", 3)
+    sot_path = (
+        _reversed_sot(tmp_path)
+        if reverse_sot
+        else "tests/sample_input_files/SOT_sample.xlsx"
+    )
+    log_path = str(tmp_path / "{engine}" / "sync_diff.log")
+    results = {}
+
+    # --- Act ---
+    for engine in ("python", "sort_merge"):
+        log = log_path.format(engine=engine)
+        monkeypatch.setattr("app.data_sync.diff_report.LOG_PATH", log)
+        monkeypatch.setattr("app.data_sync.orphan_detection.LOG_PATH", log)
+        results[engine] = run_sync(
+            sot_path,
+            "tests/sample_input_files/TGT_sample.xlsx",
+            "SOT_Data",
+            "Sheet1",
+            "REC ID",
+            "Record ID",
+            SOT_TO_TGT_COLUMN_MAPPING,
+            output_dir=str(tmp_path / engine),
+            write_mode=write_mode,
+            engine=engine,
+            incremental=False,
+            parse_cache=False,
+        )
+
+    # --- Assert ---
+    hash_join, sort_merge = results["python"], results["sort_merge"]
+    assert _sheet_values(sort_merge.output_file) == _sheet_values(hash_join.output_file)
+    with open(log_path.format(engine="python"), encoding="utf-8") as f:
+        expected_report = f.read()
+    with open(log_path.format(engine="sort_merge"), encoding="utf-8") as f:
+        assert f.read() == expected_report
+    assert [s.name for s in sort_merge.metrics.stages] == [
+        "preflight",
+        "spill_sot",
+        "spill_tgt",
+        "merge_join",
+        "write",
+        "diff",
+    ]
+    for counter in ("cells_changed", "rows_appended", "orphans_found"):
+        assert (
+            sort_merge.metrics.counters[counter] == hash_join.metrics.counters[counter]
+        )
+
+
+@pytest.mark.parametrize(
+    "engine, streaming",
+    [("python", False), ("vectorized", False), ("python", True), ("sort_merge", False)],
+)
+def test_prefixed_ids_only_skips_other_sot_records(
+    tmp_path, monkeypatch, engine, streaming
+):
+    # --- Arrange ---
+    # REC-0130..REC-0132 lack the prefix; REC-0132 is the one missing from TGT
+    monkeypatch.setattr("app.data_sync.row_filter.UNIQUE_ID_PREFIX", "REC-012")
+    log_path = str(tmp_path / "sync_diff.log")
+    monkeypatch.setattr("app.data_sync.diff_report.LOG_PATH", log_path)
+    monkeypatch.setattr("app.data_sync.orphan_detection.LOG_PATH", log_path)
+
+    # --- Act ---
+    result = run_sync(
+        "tests/sample_input_files/SOT_sample.xlsx",
+        "tests/sample_input_files/TGT_sample.xlsx",
+        "SOT_Data",
+        "Sheet1",
+        "REC ID",
+        "Record ID",
+        SOT_TO_TGT_COLUMN_MAPPING,
+        output_dir=str(tmp_path),
+        engine=engine,
+        incremental=False,
+        parse_cache=False,
+        parallel_read=False,
+        streaming=streaming,
+        prefixed_ids_only=True,
+    )
+
+    # --- Assert ---
+    ids = [row[0] for row in _sheet_values(result.output_file)]
+    assert "REC-0127" in ids and "REC-0128" in ids
+    assert "REC-0132" not in ids
+    assert result.metrics.counters["rows_appended"] == 2
@@ -0,0 +1,94 @@
+import pytest
+from openpyxl import Workbook
+
+from app.data_io.table import Table
+from app.data_io.xlsx_io import read_tgt_values
+from app.validation.dataset_validation import DatasetValidator
+
+
+def _write_sheet(path, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    for row_num, row in rows:
+        for col, value in enumerate(row, start=1):
+            ws.cell(row=row_num, column=col, value=value)
+    wb.save(path)
+    return str(path)
+
+
+def test_duplicates_reported_with_sheet_rows_while_reading(tmp_path):
+    # --- Arrange ---
+    path = _write_sheet(
+        tmp_path / "tgt.xlsx",
+        [
+            (1, ["ID", "Owner"]),
+            (2, ["R-1", "Alice"]),
+            (5, ["R-2", "Bob"]),  # rows 3-4 blank
+            (6, ["R-1", "Cara"]),
+            (7, [None, "Dan"]),
+            (9, ["R-2", "Eve"]),
+        ],
+    )
+    validator = DatasetValidator("TGT", "ID", ["Owner"])
+
+    # --- Act ---
+    with pytest.raises(ValueError) as exc:
+        read_tgt_values(path, "Data", validator=validator)
+
+    # --- Assert ---
+    message = str(exc.value)
+    assert "TGT validation failed" in message
+    assert "row 6: duplicate ID 'R-1' (first seen at row 2)" in message
+    assert "row 9: duplicate ID 'R-2' (first seen at row 5)" in message
+    assert validator.warnings == ["row 7: missing unique ID 'ID'"]
+
+
+def test_header_problems_fail_before_rows_are_read():
+    validator = DatasetValidator("SOT", "REC ID", ["Description", "Owner"])
+
+    with pytest.raises(ValueError) as exc:
+        validator.start(["ID", "Owner"])
+
+    assert "SOT column 'Description' not found in SOT headers." in str(exc.value)
+    assert "SOT unique ID column 'REC ID' not found" in str(exc.value)
+    assert validator.row_count == 0
+
+
+def test_missing_sot_ids_are_fatal():
+    table = Table.from_rows(["REC ID", "Owner"], [["REC-1", "A"], ["", "B"], ["", "C"]])
+
+    with pytest.raises(ValueError) as exc:
+        DatasetValidator("SOT", "REC ID", ["Owner"]).validate(table)
+
+    assert "row 3: missing unique ID 'REC ID'" in str(exc.value)
+    assert "row 4: missing unique ID 'REC ID'" in str(exc.value)
+
+
+def test_missing_tgt_ids_are_warnings():
+    table = Table.from_rows(["Record ID", "Owner"], [["REC-1", "A"], ["", "B"]])
+
+    validator = DatasetValidator("TGT", "Record ID", ["Owner"])
+    validator.validate(table)
+
+    assert validator.errors == []
+    assert validator.warnings == ["row 3: missing unique ID 'Record ID'"]
+
+
+def test_validate_row_dicts():
+    rows = [
+        {"REC ID": "REC-1", "Owner": "A"},
+        {"REC ID": "REC-2", "Owner": "B", "Extra": "X"},
+        {"REC ID": "REC-1", "Owner": "C"},
+    ]
+
+    with pytest.raises(ValueError) as exc:
+        DatasetValidator("SOT", "REC ID", ["Owner"]).validate(rows)
+
+    assert "row 3: inconsistent columns" in str(exc.value)
+    assert "row 4: duplicate ID 'REC-1' (first seen at row 2)" in str(exc.value)
+
+
+def test_validate_empty_dataset():
+    with pytest.raises(ValueError, match="TGT is empty"):
+        DatasetValidator("TGT", "ID", ["Owner"]).validate([])
@@ -0,0 +1,96 @@
+import pytest
+
+from app.validation.preflight import preflight
+from app.xlsx_sync import run_sync
+from config import SOT_TO_TGT_COLUMN_MAPPING
+
+SOT_PATH = "tests/sample_input_files/SOT_sample.xlsx"
+TGT_PATH = "tests/sample_input_files/TGT_sample.xlsx"
+
+
+@pytest.mark.parametrize("backend", ["native", "openpyxl"])
+def test_preflight_passes_on_matching_config(backend):
+    # --- Act ---
+    result = preflight(
+        SOT_PATH,
+        TGT_PATH,
+        "SOT_Data",
+        "Sheet1",
+        "REC ID",
+        "Record ID",
+        SOT_TO_TGT_COLUMN_MAPPING,
+        backend=backend,
+    )
+
+    # --- Assert ---
+    assert result.ok
+    assert result.sot.headers[0] == "REC ID"
+    assert result.tgt.header_row[0] == "Record ID"
+    assert result.sot.max_row == 11
+
+
+def test_preflight_reports_every_problem_at_once():
+    # --- Act ---
+    result = preflight(
+        SOT_PATH,
+        TGT_PATH,
+        "SOT_Data",
+        "Sheet 1",
+        "REC-ID",
+        "Record ID",
+        {"Ownr": "Owner", "Status": "Stat"},
+    )
+
+    # --- Assert ---
+    assert result.tgt is None
+    assert result.errors[0].startswith("TGT cannot be read:")
+    assert "sheet 'Sheet 1' not found (sheets: Sheet1)" in result.errors[0]
+    # the unreadable TGT adds no column errors of its own
+    assert result.errors[1:] == [
+        "SOT column 'Ownr' not found in SOT headers.",
+        "SOT unique ID column 'REC-ID' not found in SOT headers.",
+    ]
+
+
+def test_preflight_reports_missing_file(tmp_path):
+    # --- Act ---
+    result = preflight(
+        str(tmp_path / "missing.xlsx"),
+        TGT_PATH,
+        "SOT_Data",
+        "Sheet1",
+        "REC ID",
+        "Record ID",
+        SOT_TO_TGT_COLUMN_MAPPING,
+    )
+
+    # --- Assert ---
+    assert not result.ok
+    assert result.errors[0].startswith("SOT cannot be read:")
+
+
+def test_run_sync_fails_preflight_before_loading(tmp_path, monkeypatch):
+    # --- Arrange ---
+    def fail(*args, **kwargs):
+        raise AssertionError("workbook loaded")
+
+    for reader in ("read_sot_xlsx", "read_tgt_values", "stream_sot_rows"):
+        monkeypatch.setattr(f"app.xlsx_sync.{reader}", fail)
+
+    # --- Act ---
+    with pytest.raises(ValueError) as exc:
+        run_sync(
+            SOT_PATH,
+            TGT_PATH,
+            "SOT_Data",
+            "Sheet1",
+            "REC ID",
+            "Record ID",
+            {**SOT_TO_TGT_COLUMN_MAPPING, "Typo": "Owner"},
+            output_dir=str(tmp_path),
+            parallel_read=False,
+        )
+
+    # --- Assert ---
+    assert "Preflight failed" in str(exc.value)
+    assert "SOT column 'Typo' not found in SOT headers." in str(exc.value)